@@ -7,7 +7,10 @@ from project.game.strategies import (
     AggressiveStrategy,
     BalancedStrategy,
 )
+from project.game.optimal import OptimalStrategy
 from project.game.game import Game
+from project.game.simulation import SimulationResult, simulate
+from project.game.tournament import Tournament, TournamentResult
 
 __all__ = [
     "Dice",
@@ -17,5 +20,10 @@ __all__ = [
     "ConservativeStrategy",
     "AggressiveStrategy",
     "BalancedStrategy",
+    "OptimalStrategy",
     "Game",
+    "SimulationResult",
+    "simulate",
+    "Tournament",
+    "TournamentResult",
 ]
@@ -1,5 +1,5 @@
 import random
-from typing import List
+from typing import List, Optional
 
 
 class Dice:
@@ -59,15 +59,18 @@ class Dice:
         return f"Dice({self.value})"
 
 
-def roll_multiple_dice(num_dice: int) -> List[int]:
+def roll_multiple_dice(num_dice: int, rng: Optional[random.Random] = None) -> List[int]:
     """
     Rolls multiple dice and returns their values.
 
     Args:
         num_dice (int): The number of dice to roll.
+        rng (random.Random | None): Source of the rolls, the random module by default.
 
     Returns:
         list[int]: A list of rolled values.
     """
+    if rng is not None:
+        return [rng.randint(1, 6) for _ in range(num_dice)]
     dice_list = [Dice() for _ in range(num_dice)]
     return [dice.roll() for dice in dice_list]
@@ -1,9 +1,14 @@
-from typing import List, Optional, Tuple, Dict, Any
+import random
+from typing import Callable, List, Optional, Tuple, Dict, Any
 from project.game.player import Player
 from project.game.strategies import Strategy
 from project.game.dice import roll_multiple_dice
 from project.game.score_calculator import ScoreCalculator
 
+# (player index, dice, score, number of kept dice); a score of 0 is a zonk
+RollEvent = Tuple[int, Tuple[int, ...], int, int]
+EventSink = Callable[[RollEvent], None]
+
 
 class Game:
     """
@@ -24,9 +29,11 @@ class Game:
             Whether the game has ended.
         winner : Player | None
             The winner of the game.
+        rng : random.Random | None
+            Source of the dice rolls, None for the random module.
 
     Methods:
-        __init__(players: list[Player], strategies: list[Strategy], target_score: int)
+        __init__(players: list[Player], strategies: list[Strategy], target_score: int, rng: random.Random | None)
             Initializes a Game object.
 
         play_round() -> dict
@@ -35,7 +42,10 @@ class Game:
         play_turn() -> dict
             Plays a complete turn for the current player.
 
-        play_game(max_rounds: int | None) -> Player
+        play_turn_fast(sink: EventSink | None) -> int
+            Plays a complete turn without building the turn information.
+
+        play_game(max_rounds: int | None, sink: EventSink | None) -> Player
             Plays the entire game until someone wins.
 
         get_game_state() -> dict
@@ -56,6 +66,7 @@ class Game:
         players: List[Player],
         strategies: List[Strategy],
         target_score: int = 10000,
+        rng: Optional[random.Random] = None,
     ):
         """
         Initializes a Game object.
@@ -64,6 +75,9 @@ class Game:
             players (list[Player]): List of players.
             strategies (list[Strategy]): List of strategies for each player.
             target_score (int): The score needed to win (default 10000).
+            rng (random.Random | None): Source of the dice rolls. By default the
+                global random module is used; games running side by side in
+                threads need their own generators to be reproducible.
 
         Raises:
             ValueError: If number of players and strategies don't match.
@@ -78,6 +92,7 @@ class Game:
         self.round_number: int = 1
         self.game_over: bool = False
         self.winner: Optional[Player] = None
+        self.rng: Optional[random.Random] = rng
 
     def play_turn(self) -> Dict[str, Any]:
         """
@@ -89,6 +104,7 @@ class Game:
         player = self.players[self.current_player_index]
         strategy = self.strategies[self.current_player_index]
         player.reset_round_score()
+        strategy.start_turn()
 
         num_dice = 6
         turn_info: Dict[str, Any] = {
@@ -100,17 +116,19 @@ class Game:
         }
 
         while True:
-            dice = roll_multiple_dice(num_dice)
+            dice = roll_multiple_dice(num_dice, self.rng)
             roll_info: Dict[str, Any] = {"dice": dice, "num_dice": num_dice}
 
-            if ScoreCalculator.is_zonk(dice):
+            # One table lookup gives both the zonk flag and the best score
+            score, scoring_dice = ScoreCalculator.find_best_scoring_combination(dice)
+
+            if score == 0:
                 roll_info["zonk"] = True
                 turn_info["rolls"].append(roll_info)
                 turn_info["zonk"] = True
                 player.reset_round_score()
                 break
 
-            score, scoring_dice = ScoreCalculator.find_best_scoring_combination(dice)
             roll_info["score"] = score
             roll_info["scoring_dice"] = scoring_dice
 
@@ -139,6 +157,68 @@ class Game:
                 self.current_player_index
             ].get_total_score()
 
+        self._end_turn()
+        return turn_info
+
+    def play_turn_fast(self, sink: Optional[EventSink] = None) -> int:
+        """
+        Plays a complete turn without building the turn information.
+
+        Follows the same rules and draws the same random numbers as
+        play_turn, so a seeded game goes the same way in both modes, but
+        allocates no per-roll dicts or lists. If a sink is given, it is
+        called with a compact (player index, dice, score, kept count) tuple
+        after every roll; a score of 0 is a zonk.
+
+        Args:
+            sink (EventSink | None): Receives an event for every roll.
+
+        Returns:
+            int: Points banked in the turn, 0 after a zonk.
+        """
+        index = self.current_player_index
+        player = self.players[index]
+        strategy = self.strategies[index]
+        player.reset_round_score()
+        strategy.start_turn()
+
+        best_combination = ScoreCalculator.find_best_scoring_combination
+        randint = random.randint if self.rng is None else self.rng.randint
+        total_score = player.get_total_score()
+        round_score = 0
+        num_dice = 6
+
+        while True:
+            dice = [randint(1, 6) for _ in range(num_dice)]
+            score, scoring_dice = best_combination(dice)
+
+            if score == 0:
+                if sink is not None:
+                    sink((index, tuple(dice), 0, 0))
+                round_score = 0
+                break
+
+            kept = len(strategy.choose_dice_to_keep(dice, scoring_dice))
+            round_score += score
+            if sink is not None:
+                sink((index, tuple(dice), score, kept))
+
+            num_dice -= kept
+            if num_dice == 0:
+                num_dice = 6
+
+            if not strategy.should_continue(round_score, num_dice, total_score):
+                break
+
+        player.add_round_score(round_score)
+        player.bank_round_score()
+        self._end_turn()
+        return round_score
+
+    def _end_turn(self) -> None:
+        """
+        Checks for a winner and passes the turn to the next player.
+        """
         if (
             self.players[self.current_player_index].get_total_score()
             >= self.target_score
@@ -150,20 +230,24 @@ class Game:
         if self.current_player_index == 0:
             self.round_number += 1
 
-        return turn_info
-
-    def play_game(self, max_rounds: Optional[int] = None) -> Optional[Player]:
+    def play_game(
+        self, max_rounds: Optional[int] = None, sink: Optional[EventSink] = None
+    ) -> Optional[Player]:
         """
         Plays the entire game until someone wins or max rounds reached.
 
+        The turns are played with play_turn_fast, as the turn information
+        would be thrown away.
+
         Args:
             max_rounds (int | None): Maximum number of rounds to play.
+            sink (EventSink | None): Receives an event for every roll.
 
         Returns:
             Player | None: The winner, or None if max rounds reached.
         """
         while not self.game_over:
-            self.play_turn()
+            self.play_turn_fast(sink)
 
             if max_rounds and self.round_number > max_rounds:
                 max_score = max(p.get_total_score() for p in self.players)
@@ -0,0 +1,334 @@
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import factorial
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from project.game.score_calculator import ScoreCalculator
+from project.game.strategies import Strategy
+
+NUM_DICE = 6
+SCORE_STEP = 50
+
+Outcome = Tuple[int, int, float]
+
+
+def roll_outcomes(num_dice: int) -> List[Outcome]:
+    """
+    Returns the exact distribution of the scoring rolls of some dice.
+
+    Rolls with the same best score and the same number of scoring dice
+    lead to the same choices, so they are merged. The probabilities sum
+    to one minus the probability of a zonk.
+
+    Args:
+        num_dice (int): Number of dice rolled (1-6).
+
+    Returns:
+        list[tuple[int, int, float]]: (score, scoring dice, probability) of every outcome.
+    """
+    outcomes: Counter = Counter()
+    for roll in combinations_with_replacement(range(1, 7), num_dice):
+        score, scoring_dice = ScoreCalculator.find_best_scoring_combination(list(roll))
+        if score == 0:
+            continue
+        orderings = factorial(num_dice)
+        for count in Counter(roll).values():
+            orderings //= factorial(count)
+        outcomes[score, len(scoring_dice)] += orderings / 6**num_dice
+    return [(score, used, p) for (score, used), p in sorted(outcomes.items())]
+
+
+class Policy:
+    """
+    Decision tables of the policy that maximizes the expected score of a turn.
+
+    Round scores are stored in steps of 50 points up to max_round_score;
+    above it banking is assumed to be optimal, which the solver checks.
+
+    Attributes:
+        max_round_score : int
+            Largest round score in the tables.
+        continue_values : np.ndarray
+            Expected banked score of rolling again, by [round_score // 50, num_dice].
+        keep_table : np.ndarray
+            Best number of dice to keep, by [round_score // 50, dice rolled, scoring dice],
+            where round_score already includes the roll.
+        expected_turn_score : float
+            Expected score of a whole turn played with the policy.
+
+    Methods:
+        should_continue(round_score: int, num_dice: int) -> bool
+            Returns True if rolling again has the higher expected score.
+
+        keep_count(round_score: int, num_dice: int, num_scoring: int) -> int
+            Returns the number of scoring dice to keep.
+    """
+
+    def __init__(
+        self, max_round_score: int, continue_values: np.ndarray, keep_table: np.ndarray
+    ):
+        """
+        Initializes a Policy object.
+
+        Args:
+            max_round_score (int): Largest round score in the tables.
+            continue_values (np.ndarray): Expected score of rolling again.
+            keep_table (np.ndarray): Best number of dice to keep.
+        """
+        self.max_round_score: int = max_round_score
+        self.continue_values: np.ndarray = continue_values
+        self.keep_table: np.ndarray = keep_table
+        self.expected_turn_score: float = float(continue_values[0, NUM_DICE])
+
+    def should_continue(self, round_score: int, num_dice: int) -> bool:
+        """
+        Returns True if rolling again has the higher expected score.
+
+        Args:
+            round_score (int): Current round score.
+            num_dice (int): Number of dice available for rolling.
+
+        Returns:
+            bool: True to continue rolling, False to bank.
+        """
+        if round_score > self.max_round_score:
+            return False
+        return bool(
+            self.continue_values[round_score // SCORE_STEP, num_dice] > round_score
+        )
+
+    def keep_count(self, round_score: int, num_dice: int, num_scoring: int) -> int:
+        """
+        Returns the number of scoring dice to keep.
+
+        Args:
+            round_score (int): Round score including the roll.
+            num_dice (int): Number of dice rolled.
+            num_scoring (int): Number of scoring dice.
+
+        Returns:
+            int: Number of dice to keep, between 1 and num_scoring.
+        """
+        if round_score > self.max_round_score:
+            return num_scoring
+        return int(self.keep_table[round_score // SCORE_STEP, num_dice, num_scoring])
+
+
+@lru_cache(maxsize=None)
+def solve(max_round_score: int = 30000) -> Policy:
+    """
+    Computes the policy that maximizes the expected score of a turn.
+
+    The state after a scoring roll is (round_score, dice_remaining). Every
+    roll adds at least 50 points, so the round score only grows and the
+    values are computed exactly by backward induction from max_round_score
+    down to 0, using the exact probabilities of roll_outcomes. As in Game,
+    the full best score of a roll is added whatever dice are kept, so
+    keeping dice only decides how many dice are left; at least one scoring
+    die is always kept, and keeping all the rolled dice gives six new ones.
+
+    Args:
+        max_round_score (int): Largest round score to solve for (default 30000).
+
+    Raises:
+        ValueError: If max_round_score is too low for banking to be optimal above it.
+
+    Returns:
+        Policy: Decision tables with O(1) lookups.
+    """
+    top = max_round_score // SCORE_STEP
+    outcomes: List[List[Outcome]] = [[]]
+    outcomes += [roll_outcomes(n) for n in range(1, NUM_DICE + 1)]
+    continue_values = np.zeros((top + 1, NUM_DICE + 1))
+    keep_table = np.zeros((top + 1, NUM_DICE + 1, NUM_DICE + 1), dtype=np.int64)
+    # best[j][n][u]: value of a roll of n dice with u scoring dice that
+    # brought the round score to j * 50, after the best keep choice
+    best: List[List[List[float]]] = [[] for _ in range(top + 1)]
+
+    for index in range(top, -1, -1):
+        for num_dice in range(1, NUM_DICE + 1):
+            expected = 0.0
+            for score, used, p in outcomes[num_dice]:
+                after = index + score // SCORE_STEP
+                if after > top:
+                    expected += p * after * SCORE_STEP
+                else:
+                    expected += p * best[after][num_dice][used]
+            continue_values[index, num_dice] = expected
+
+        round_score = index * SCORE_STEP
+        values = [round_score] + [
+            max(round_score, continue_values[index, n]) for n in range(1, NUM_DICE + 1)
+        ]
+        best[index] = [[0.0] * (NUM_DICE + 1) for _ in range(NUM_DICE + 1)]
+        for num_dice in range(1, NUM_DICE + 1):
+            for used in range(1, num_dice + 1):
+                choices = [
+                    values[num_dice - kept or NUM_DICE] for kept in range(1, used + 1)
+                ]
+                kept = int(np.argmax(choices)) + 1
+                keep_table[index, num_dice, used] = kept
+                best[index][num_dice][used] = choices[kept - 1]
+
+    if (continue_values[top, 1:] > top * SCORE_STEP).any():
+        raise ValueError(
+            f"Banking is not optimal at {max_round_score} points, use a larger limit"
+        )
+    return Policy(max_round_score, continue_values, keep_table)
+
+
+class OptimalStrategy(Strategy):
+    """
+    Strategy that maximizes the expected score of every turn.
+
+    This strategy:
+    - Looks its decisions up in the tables computed by solve
+    - Banks as soon as the round score reaches the target score
+    - Keeps the number of scoring dice with the best expected outcome
+
+    choose_dice_to_keep is not given the round score, so the strategy
+    follows the turn itself and relies on the order in which Game calls
+    it: start_turn before the first roll, then choose_dice_to_keep and
+    should_continue once each after every scoring roll. Used outside of
+    Game, the same order must be kept; choose_dice_to_keep raises
+    RuntimeError when start_turn was not called for the turn. The
+    vectorized keep_counts gets the round scores and has no such state.
+
+    Attributes:
+        target_score : int | None
+            Score that wins the game, None to ignore it.
+        policy : Policy
+            Decision tables.
+    """
+
+    def __init__(
+        self, target_score: Optional[int] = 10000, max_round_score: int = 30000
+    ):
+        """
+        Initializes an OptimalStrategy object.
+
+        Args:
+            target_score (int | None): Score that wins the game (default 10000).
+            max_round_score (int): Largest round score of the tables (default 30000).
+        """
+        self.target_score: Optional[int] = target_score
+        self.policy: Policy = solve(max_round_score)
+        # Round score of the current turn, None between turns
+        self._round_score: Optional[int] = None
+
+    def start_turn(self) -> None:
+        """
+        Starts following the round score of a new turn.
+        """
+        self._round_score = 0
+
+    def should_continue(
+        self, round_score: int, num_dice: int, total_score: int
+    ) -> bool:
+        """
+        Decides whether to continue rolling.
+
+        Args:
+            round_score (int): Current round score.
+            num_dice (int): Number of dice available for rolling.
+            total_score (int): Total score of the player.
+
+        Returns:
+            bool: True to continue rolling, False to bank.
+        """
+        if self.target_score is not None and total_score + round_score >= (
+            self.target_score
+        ):
+            going_on = False
+        else:
+            going_on = self.policy.should_continue(round_score, num_dice)
+        # Banking ends the turn; the next one has to call start_turn again
+        self._round_score = round_score if going_on else None
+        return going_on
+
+    def choose_dice_to_keep(
+        self, dice: List[int], scoring_dice: List[int]
+    ) -> List[int]:
+        """
+        Keeps the number of scoring dice with the best expected outcome.
+
+        The round score is the one passed to the last should_continue of
+        the turn plus the score of this roll.
+
+        Args:
+            dice (list[int]): All dice rolled.
+            scoring_dice (list[int]): Dice that can score points.
+
+        Raises:
+            RuntimeError: If start_turn was not called for the current turn.
+
+        Returns:
+            list[int]: Selected scoring dice.
+        """
+        if self._round_score is None:
+            raise RuntimeError("start_turn must be called before the first roll")
+        score, _ = ScoreCalculator.find_best_scoring_combination(dice)
+        round_score = self._round_score + score
+        kept = self.policy.keep_count(round_score, len(dice), len(scoring_dice))
+        return scoring_dice[:kept]
+
+    def continue_mask(
+        self, round_scores: np.ndarray, num_dice: np.ndarray, total_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decides whether to continue rolling in many games at once.
+
+        Looks up the policy table like should_continue; a game stops at the
+        target score and above the largest round score of the tables.
+
+        Args:
+            round_scores (np.ndarray): Current round score of every game.
+            num_dice (np.ndarray): Number of dice available in every game.
+            total_scores (np.ndarray): Total score of the player in every game.
+
+        Returns:
+            np.ndarray: Boolean array, True to continue rolling.
+        """
+        policy = self.policy
+        rows = np.minimum(round_scores, policy.max_round_score) // SCORE_STEP
+        going_on = (policy.continue_values[rows, num_dice] > round_scores) & (
+            round_scores <= policy.max_round_score
+        )
+        if self.target_score is not None:
+            going_on &= total_scores + round_scores < self.target_score
+        return going_on
+
+    def keep_counts(
+        self,
+        dice: np.ndarray,
+        num_dice: np.ndarray,
+        num_scoring: np.ndarray,
+        round_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns how many dice are kept in many games at once.
+
+        Looks up the policy table like choose_dice_to_keep; all scoring dice
+        are kept above the largest round score of the tables.
+
+        Args:
+            dice (np.ndarray): Rolled dice, one row per game, in the first num_dice columns.
+            num_dice (np.ndarray): Number of dice rolled in every game.
+            num_scoring (np.ndarray): Number of scoring dice in every game.
+            round_scores (np.ndarray | None): Round score of every game, including this roll.
+
+        Raises:
+            ValueError: If round_scores is not given.
+
+        Returns:
+            np.ndarray: Number of kept dice in every game.
+        """
+        if round_scores is None:
+            raise ValueError("OptimalStrategy.keep_counts needs the round scores")
+        policy = self.policy
+        rows = np.minimum(round_scores, policy.max_round_score) // SCORE_STEP
+        kept = policy.keep_table[rows, num_dice, num_scoring]
+        return np.where(round_scores > policy.max_round_score, num_scoring, kept)
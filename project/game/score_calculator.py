@@ -1,5 +1,15 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 from collections import Counter
+from itertools import combinations_with_replacement
+
+ScoringOption = Tuple[int, List[int]]
+TableEntry = Tuple[int, Tuple[int, ...], Tuple[Tuple[int, Tuple[int, ...]], ...]]
+
+MAX_DICE = 6
+
+# Face f adds 7 ** (f - 1) to the key, so the key of a roll is its face
+# counts written in base 7; with at most six dice no count reaches 7.
+_FACE_WEIGHTS: Dict[int, int] = {face: 7 ** (face - 1) for face in range(1, 7)}
 
 
 class ScoreCalculator:
@@ -18,8 +28,24 @@ class ScoreCalculator:
 
         find_best_scoring_combination(dice: list[int]) -> tuple[int, list[int]]
             Finds the best scoring combination and returns score and used dice.
+
+        get_possible_scoring_options(dice: list[int]) -> list[tuple[int, list[int]]]
+            Returns all possible scoring options for the given dice.
+
+        encode(dice: list[int]) -> int | None
+            Returns the base-7 face count key of a roll.
+
+        lookup_table() -> dict[int, tuple]
+            Returns the precomputed results of every roll of up to six dice.
+
+    The results of all 924 multisets of zero to six dice are computed once,
+    on first use, and stored by the base-7 encoding of their face counts,
+    so scoring a roll costs one dictionary lookup. Rolls that are not in
+    the table (values outside 1-6, more than six dice) are scored directly.
     """
 
+    _table: Optional[Dict[int, TableEntry]] = None
+
     @staticmethod
     def calculate_score(dice: List[int]) -> int:
         """
@@ -31,15 +57,11 @@ class ScoreCalculator:
         Returns:
             int: The total score.
         """
-        if not dice:
-            return 0
-
-        dice_sorted = sorted(dice)
+        entry = ScoreCalculator._lookup(dice)
+        if entry is not None:
+            return entry[0]
 
-        if ScoreCalculator._is_straight(dice_sorted):
-            return 1500
-
-        score, _ = ScoreCalculator.find_best_scoring_combination(dice)
+        score, _ = ScoreCalculator._compute_best_scoring_combination(dice)
         return score
 
     @staticmethod
@@ -73,11 +95,93 @@ class ScoreCalculator:
         pairs = [count for count in counts.values() if count == 2]
         return len(pairs) == 3
 
+    @staticmethod
+    def encode(dice: List[int]) -> Optional[int]:
+        """
+        Returns the base-7 face count key of a roll.
+
+        Args:
+            dice (list[int]): List of dice values.
+
+        Returns:
+            int | None: The key, or None if the roll is not in the table.
+        """
+        if len(dice) > MAX_DICE:
+            return None
+        key = 0
+        for value in dice:
+            weight = _FACE_WEIGHTS.get(value)
+            if weight is None:
+                return None
+            key += weight
+        return key
+
+    @staticmethod
+    def lookup_table() -> Dict[int, TableEntry]:
+        """
+        Returns the precomputed results of every roll of up to six dice.
+
+        The table is built on the first call.
+
+        Returns:
+            dict[int, tuple]: (score, scoring dice, scoring options) by encode key.
+        """
+        if ScoreCalculator._table is None:
+            table: Dict[int, TableEntry] = {}
+            for num_dice in range(MAX_DICE + 1):
+                for roll in combinations_with_replacement(range(1, 7), num_dice):
+                    dice = list(roll)
+                    score, used = ScoreCalculator._compute_best_scoring_combination(
+                        dice
+                    )
+                    options = ScoreCalculator._compute_scoring_options(dice)
+                    key = ScoreCalculator.encode(dice)
+                    assert key is not None
+                    table[key] = (
+                        score,
+                        tuple(used),
+                        tuple((points, tuple(kept)) for points, kept in options),
+                    )
+            ScoreCalculator._table = table
+        return ScoreCalculator._table
+
+    @staticmethod
+    def _lookup(dice: List[int]) -> Optional[TableEntry]:
+        """
+        Finds a roll in the lookup table.
+
+        Args:
+            dice (list[int]): List of dice values.
+
+        Returns:
+            tuple | None: The table entry, or None if the roll is not in the table.
+        """
+        key = ScoreCalculator.encode(dice)
+        if key is None:
+            return None
+        return ScoreCalculator.lookup_table()[key]
+
     @staticmethod
     def find_best_scoring_combination(dice: List[int]) -> Tuple[int, List[int]]:
         """
         Finds the best scoring combination for the given dice.
 
+        Args:
+            dice (list[int]): List of dice values.
+
+        Returns:
+            tuple[int, list[int]]: Total score and list of dice used for scoring.
+        """
+        entry = ScoreCalculator._lookup(dice)
+        if entry is None:
+            return ScoreCalculator._compute_best_scoring_combination(dice)
+        return entry[0], list(entry[1])
+
+    @staticmethod
+    def _compute_best_scoring_combination(dice: List[int]) -> Tuple[int, List[int]]:
+        """
+        Computes the best scoring combination for the given dice without the table.
+
         Args:
             dice (list[int]): List of dice values.
 
@@ -151,14 +255,29 @@ class ScoreCalculator:
         Returns:
             bool: True if the roll is a zonk, False otherwise.
         """
-        score, _ = ScoreCalculator.find_best_scoring_combination(dice)
-        return score == 0
+        return ScoreCalculator.calculate_score(dice) == 0
 
     @staticmethod
     def get_possible_scoring_options(dice: List[int]) -> List[Tuple[int, List[int]]]:
         """
         Returns all possible scoring options for the given dice.
 
+        Args:
+            dice (list[int]): List of dice values.
+
+        Returns:
+            list[tuple[int, list[int]]]: List of (score, dice_used) tuples.
+        """
+        entry = ScoreCalculator._lookup(dice)
+        if entry is None:
+            return ScoreCalculator._compute_scoring_options(dice)
+        return [(score, list(used)) for score, used in entry[2]]
+
+    @staticmethod
+    def _compute_scoring_options(dice: List[int]) -> List[ScoringOption]:
+        """
+        Computes all possible scoring options for the given dice without the table.
+
         Args:
             dice (list[int]): List of dice values.
 
@@ -178,7 +297,7 @@ class ScoreCalculator:
         if ScoreCalculator._is_three_pairs(dice_sorted):
             options.append((750, dice_sorted))
 
-        best_score, best_dice = ScoreCalculator.find_best_scoring_combination(dice)
+        best_score, best_dice = ScoreCalculator._compute_best_scoring_combination(dice)
         if best_score > 0:
             options.append((best_score, best_dice))
 
@@ -0,0 +1,293 @@
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from project.game.game import Game
+from project.game.player import Player
+from project.game.score_calculator import ScoreCalculator
+from project.game.strategies import Strategy
+
+NUM_DICE = 6
+
+
+def _key_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Copies the ScoreCalculator lookup table into arrays indexed by roll key.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Best score and number of scoring dice by encode key.
+    """
+    scores = np.zeros(7**NUM_DICE, dtype=np.int64)
+    used = np.zeros(7**NUM_DICE, dtype=np.int64)
+    for key, (score, dice, _) in ScoreCalculator.lookup_table().items():
+        scores[key] = score
+        used[key] = len(dice)
+    return scores, used
+
+
+_KEY_SCORES, _KEY_USED = _key_tables()
+_KEY_WEIGHTS = 7 ** np.arange(6)
+
+
+def count_faces(dice: np.ndarray) -> np.ndarray:
+    """
+    Counts the faces of many rolls.
+
+    Args:
+        dice (np.ndarray): Rolls, one per row, values 1-6 and 0 for unused slots.
+
+    Returns:
+        np.ndarray: Number of dice showing each face, shape (rolls, 6).
+    """
+    rows = dice.shape[0]
+    offsets = (np.arange(rows) * 7)[:, None]
+    counts = np.bincount((dice + offsets).ravel(), minlength=rows * 7)
+    return counts.reshape(rows, 7)[:, 1:]
+
+
+def score_counts(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores many rolls given by their face counts.
+
+    The counts are turned into ScoreCalculator.encode keys, so every roll
+    is scored with one lookup.
+
+    Args:
+        counts (np.ndarray): Face counts, shape (rolls, 6).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Best score and number of scoring dice of every roll.
+    """
+    keys = counts @ _KEY_WEIGHTS
+    return _KEY_SCORES[keys], _KEY_USED[keys]
+
+
+class SimulationResult:
+    """
+    Outcome of many simulated games.
+
+    Attributes:
+        n_games : int
+            Number of games played.
+        winners : np.ndarray
+            Index of the winning player of every game.
+        final_scores : np.ndarray
+            Total score of every player at the end of every game, shape (games, players).
+        rounds : np.ndarray
+            Round in which every game ended.
+
+    Methods:
+        wins() -> np.ndarray
+            Returns the number of games won by every player.
+
+        win_rates() -> np.ndarray
+            Returns the fraction of games won by every player.
+
+        score_distribution(player: int) -> dict[int, int]
+            Returns how many games ended with each final score of a player.
+    """
+
+    def __init__(
+        self, winners: np.ndarray, final_scores: np.ndarray, rounds: np.ndarray
+    ):
+        """
+        Initializes a SimulationResult object.
+
+        Args:
+            winners (np.ndarray): Index of the winner of every game.
+            final_scores (np.ndarray): Final totals, shape (games, players).
+            rounds (np.ndarray): Round in which every game ended.
+        """
+        self.n_games: int = len(winners)
+        self.winners: np.ndarray = winners
+        self.final_scores: np.ndarray = final_scores
+        self.rounds: np.ndarray = rounds
+
+    def wins(self) -> np.ndarray:
+        """
+        Returns the number of games won by every player.
+
+        Returns:
+            np.ndarray: Win counts, one per player.
+        """
+        return np.bincount(self.winners, minlength=self.final_scores.shape[1])
+
+    def win_rates(self) -> np.ndarray:
+        """
+        Returns the fraction of games won by every player.
+
+        Returns:
+            np.ndarray: Win rates, one per player.
+        """
+        return self.wins() / max(self.n_games, 1)
+
+    def score_distribution(self, player: int) -> Dict[int, int]:
+        """
+        Returns how many games ended with each final score of a player.
+
+        Args:
+            player (int): Index of the player.
+
+        Returns:
+            dict[int, int]: Number of games by final score, in ascending score order.
+        """
+        values, counts = np.unique(self.final_scores[:, player], return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the result.
+
+        Returns:
+            str: A string representation of the result.
+        """
+        rates = ", ".join(f"{rate:.3f}" for rate in self.win_rates())
+        return f"SimulationResult(n_games={self.n_games}, win_rates=[{rates}])"
+
+
+def _play_turns(
+    strategy: Strategy,
+    totals: np.ndarray,
+    games: np.ndarray,
+    rng: np.random.Generator,
+) -> None:
+    """
+    Plays one turn of a player in many games and banks the results.
+
+    Follows Game.play_turn: the full best score of every roll is added to
+    the round score, the kept dice are set aside, all six dice are rolled
+    again once every die is kept, and a zonk loses the round score.
+
+    Args:
+        strategy (Strategy): Strategy of the player.
+        totals (np.ndarray): Total scores of the player, updated in place.
+        games (np.ndarray): Indices of the games in which the player moves.
+        rng (np.random.Generator): Source of the dice rolls.
+    """
+    round_scores = np.zeros(len(games), dtype=np.int64)
+    num_dice = np.full(len(games), NUM_DICE, dtype=np.int64)
+    rolling = np.arange(len(games))
+
+    while len(rolling):
+        dice = rng.integers(1, 7, size=(len(rolling), NUM_DICE))
+        dice[np.arange(NUM_DICE) >= num_dice[rolling][:, None]] = 0
+        scores, used = score_counts(count_faces(dice))
+
+        scored = scores > 0
+        rolling, dice, scores, used = (
+            rolling[scored],
+            dice[scored],
+            scores[scored],
+            used[scored],
+        )
+        rolled = num_dice[rolling]
+
+        round_scores[rolling] += scores
+        kept = strategy.keep_counts(dice, rolled, used, round_scores[rolling])
+        left = rolled - kept
+        left[left == 0] = NUM_DICE
+        num_dice[rolling] = left
+
+        going_on = strategy.continue_mask(
+            round_scores[rolling], left, totals[games[rolling]]
+        )
+        banked = rolling[~going_on]
+        totals[games[banked]] += round_scores[banked]
+        rolling = rolling[going_on]
+
+
+def simulate(
+    strategies: Sequence[Strategy],
+    n_games: int,
+    seed: Optional[int] = None,
+    target_score: int = 10000,
+    max_rounds: Optional[int] = None,
+) -> SimulationResult:
+    """
+    Plays many games between strategies in lockstep with NumPy arrays.
+
+    Every game makes the same turn at the same time, so a turn of a player
+    is played in all the unfinished games at once: the dice of all the
+    games are one array, rolls are scored through the lookup table, and
+    the decisions use the vectorized methods of the strategies. The rules
+    and the end conditions are those of Game.play_game, so the results are
+    statistically the same as playing the games one by one.
+
+    Args:
+        strategies (Sequence[Strategy]): Strategy of every player, in turn order.
+        n_games (int): Number of games to play.
+        seed (int | None): Seed of the dice, None for a random one.
+        target_score (int): The score needed to win (default 10000).
+        max_rounds (int | None): Maximum number of rounds of a game.
+
+    Raises:
+        ValueError: If there are no strategies or n_games is negative.
+
+    Returns:
+        SimulationResult: Winners, final scores and lengths of the games.
+    """
+    if not strategies:
+        raise ValueError("At least one strategy is required")
+    if n_games < 0:
+        raise ValueError("Number of games must not be negative")
+
+    rng = np.random.default_rng(seed)
+    players = len(strategies)
+    totals = np.zeros((players, n_games), dtype=np.int64)
+    winners = np.full(n_games, -1, dtype=np.int64)
+    rounds = np.ones(n_games, dtype=np.int64)
+    active = np.arange(n_games)
+    round_number = 1
+
+    while len(active):
+        for player, strategy in enumerate(strategies):
+            _play_turns(strategy, totals[player], active, rng)
+            won = totals[player, active] >= target_score
+            winners[active[won]] = player
+            active = active[~won]
+            if not len(active):
+                break
+        else:
+            round_number += 1
+            if max_rounds and round_number > max_rounds:
+                winners[active] = totals[:, active].argmax(axis=0)
+                active = active[:0]
+            rounds[active] = round_number
+
+    return SimulationResult(winners, totals.T.copy(), rounds)
+
+
+def play_games(
+    strategies: List[Strategy],
+    n_games: int,
+    target_score: int = 10000,
+    max_rounds: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> SimulationResult:
+    """
+    Plays games one at a time with Game, for comparison with simulate.
+
+    Args:
+        strategies (list[Strategy]): Strategy of every player, in turn order.
+        n_games (int): Number of games to play.
+        target_score (int): The score needed to win (default 10000).
+        max_rounds (int | None): Maximum number of rounds of a game.
+        rng (random.Random | None): Source of the dice rolls, the random module by default.
+
+    Returns:
+        SimulationResult: Winners, final scores and lengths of the games.
+    """
+    winners = np.zeros(n_games, dtype=np.int64)
+    final_scores = np.zeros((n_games, len(strategies)), dtype=np.int64)
+    rounds = np.zeros(n_games, dtype=np.int64)
+    for index in range(n_games):
+        players = [Player(f"Bot{i + 1}") for i in range(len(strategies))]
+        game = Game(players, list(strategies), target_score, rng)
+        winner = game.play_game(max_rounds)
+        assert winner is not None
+        winners[index] = players.index(winner)
+        final_scores[index] = [p.get_total_score() for p in players]
+        # round_number has already moved on if the last player ended the game
+        rounds[index] = game.round_number - (game.current_player_index == 0)
+    return SimulationResult(winners, final_scores, rounds)
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import random
 
+import numpy as np
+
+from project.game.score_calculator import ScoreCalculator
+
 
 class Strategy(ABC):
     """
@@ -13,6 +17,15 @@ class Strategy(ABC):
 
         choose_dice_to_keep(dice: list[int], scoring_dice: list[int]) -> list[int]
             Chooses which scoring dice to keep.
+
+        start_turn()
+            Called by the game before the first roll of every turn.
+
+        continue_mask(round_scores, num_dice, total_scores) -> np.ndarray
+            Makes should_continue decisions for many games at once.
+
+        keep_counts(dice, num_dice, num_scoring, round_scores=None) -> np.ndarray
+            Returns how many dice choose_dice_to_keep keeps in many games at once.
     """
 
     @abstractmethod
@@ -48,6 +61,71 @@ class Strategy(ABC):
         """
         pass
 
+    def start_turn(self) -> None:
+        """
+        Called by the game before the first roll of every turn.
+
+        Strategies that follow the course of a turn reset their state here;
+        the default does nothing.
+        """
+        pass
+
+    def continue_mask(
+        self, round_scores: np.ndarray, num_dice: np.ndarray, total_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Makes should_continue decisions for many games at once.
+
+        Used by the vectorized simulation. The default calls should_continue
+        for every game; strategies override it with array expressions.
+
+        Args:
+            round_scores (np.ndarray): Current round score of every game.
+            num_dice (np.ndarray): Number of dice available in every game.
+            total_scores (np.ndarray): Total score of the player in every game.
+
+        Returns:
+            np.ndarray: Boolean array, True to continue rolling.
+        """
+        return np.array(
+            [
+                self.should_continue(int(r), int(n), int(t))
+                for r, n, t in zip(round_scores, num_dice, total_scores)
+            ],
+            dtype=bool,
+        )
+
+    def keep_counts(
+        self,
+        dice: np.ndarray,
+        num_dice: np.ndarray,
+        num_scoring: np.ndarray,
+        round_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns how many dice choose_dice_to_keep keeps in many games at once.
+
+        Used by the vectorized simulation. The default rebuilds the dice lists
+        and calls choose_dice_to_keep for every game; strategies override it
+        with array expressions.
+
+        Args:
+            dice (np.ndarray): Rolled dice, one row per game, in the first num_dice columns.
+            num_dice (np.ndarray): Number of dice rolled in every game.
+            num_scoring (np.ndarray): Number of scoring dice in every game.
+            round_scores (np.ndarray | None): Round score of every game, including this roll.
+                Strategies that do not need it accept None.
+
+        Returns:
+            np.ndarray: Number of kept dice in every game.
+        """
+        counts = []
+        for row, n in zip(dice, num_dice):
+            values = row[:n].tolist()
+            scoring_dice = ScoreCalculator.get_scoring_dice(values)
+            counts.append(len(self.choose_dice_to_keep(values, scoring_dice)))
+        return np.array(counts, dtype=np.int64)
+
 
 class ConservativeStrategy(Strategy):
     """
@@ -94,6 +172,47 @@ class ConservativeStrategy(Strategy):
         """
         return scoring_dice
 
+    def continue_mask(
+        self, round_scores: np.ndarray, num_dice: np.ndarray, total_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decides whether to continue rolling in many games at once.
+
+        Continues below 350 points while more than two dice are left.
+
+        Args:
+            round_scores (np.ndarray): Current round score of every game.
+            num_dice (np.ndarray): Number of dice available in every game.
+            total_scores (np.ndarray): Total score of the player in every game.
+
+        Returns:
+            np.ndarray: Boolean array, True to continue rolling.
+        """
+        return (round_scores < 350) & (num_dice > 2)
+
+    def keep_counts(
+        self,
+        dice: np.ndarray,
+        num_dice: np.ndarray,
+        num_scoring: np.ndarray,
+        round_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns how many dice are kept in many games at once.
+
+        All scoring dice are kept, as in choose_dice_to_keep.
+
+        Args:
+            dice (np.ndarray): Rolled dice, one row per game, in the first num_dice columns.
+            num_dice (np.ndarray): Number of dice rolled in every game.
+            num_scoring (np.ndarray): Number of scoring dice in every game.
+            round_scores (np.ndarray | None): Round score of every game, not used.
+
+        Returns:
+            np.ndarray: Number of kept dice in every game.
+        """
+        return num_scoring
+
 
 class AggressiveStrategy(Strategy):
     """
@@ -140,6 +259,47 @@ class AggressiveStrategy(Strategy):
             return scoring_dice[: min(3, len(scoring_dice))]
         return scoring_dice
 
+    def continue_mask(
+        self, round_scores: np.ndarray, num_dice: np.ndarray, total_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decides whether to continue rolling in many games at once.
+
+        Continues below 600 points, however few dice are left.
+
+        Args:
+            round_scores (np.ndarray): Current round score of every game.
+            num_dice (np.ndarray): Number of dice available in every game.
+            total_scores (np.ndarray): Total score of the player in every game.
+
+        Returns:
+            np.ndarray: Boolean array, True to continue rolling.
+        """
+        return round_scores < 600
+
+    def keep_counts(
+        self,
+        dice: np.ndarray,
+        num_dice: np.ndarray,
+        num_scoring: np.ndarray,
+        round_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns how many dice are kept in many games at once.
+
+        At most three scoring dice are kept, as in choose_dice_to_keep.
+
+        Args:
+            dice (np.ndarray): Rolled dice, one row per game, in the first num_dice columns.
+            num_dice (np.ndarray): Number of dice rolled in every game.
+            num_scoring (np.ndarray): Number of scoring dice in every game.
+            round_scores (np.ndarray | None): Round score of every game, not used.
+
+        Returns:
+            np.ndarray: Number of kept dice in every game.
+        """
+        return np.minimum(num_scoring, 3)
+
 
 class BalancedStrategy(Strategy):
     """
@@ -197,3 +357,49 @@ class BalancedStrategy(Strategy):
 
         keep_count = max(2, len(scoring_dice) // 2)
         return scoring_dice[:keep_count]
+
+    def continue_mask(
+        self, round_scores: np.ndarray, num_dice: np.ndarray, total_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        Decides whether to continue rolling in many games at once.
+
+        Continues below 450 points, but only below 300 points when one die
+        is left or the total score is 8000 or more.
+
+        Args:
+            round_scores (np.ndarray): Current round score of every game.
+            num_dice (np.ndarray): Number of dice available in every game.
+            total_scores (np.ndarray): Total score of the player in every game.
+
+        Returns:
+            np.ndarray: Boolean array, True to continue rolling.
+        """
+        cautious = (num_dice == 1) | (total_scores >= 8000)
+        return (round_scores < 450) & (~cautious | (round_scores < 300))
+
+    def keep_counts(
+        self,
+        dice: np.ndarray,
+        num_dice: np.ndarray,
+        num_scoring: np.ndarray,
+        round_scores: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Returns how many dice are kept in many games at once.
+
+        Keeps all scoring dice when there are at most two of them or at
+        most one die would be left; otherwise keeps half of them, but at
+        least two, as in choose_dice_to_keep.
+
+        Args:
+            dice (np.ndarray): Rolled dice, one row per game, in the first num_dice columns.
+            num_dice (np.ndarray): Number of dice rolled in every game.
+            num_scoring (np.ndarray): Number of scoring dice in every game.
+            round_scores (np.ndarray | None): Round score of every game, not used.
+
+        Returns:
+            np.ndarray: Number of kept dice in every game.
+        """
+        keep_all = (num_scoring <= 2) | (num_dice - num_scoring <= 1)
+        return np.where(keep_all, num_scoring, np.maximum(2, num_scoring // 2))
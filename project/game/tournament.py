@@ -0,0 +1,505 @@
+import copy
+import csv
+import io
+import json
+import math
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from project.game.simulation import play_games, simulate
+from project.game.strategies import Strategy
+
+ENGINES = ("simulate", "game")
+
+Task = Tuple[Tuple[int, ...], int, int]
+
+
+def wilson_interval(wins: float, games: float, z: float = 1.96) -> Tuple[float, float]:
+    """
+    Returns the Wilson score confidence interval of a win rate.
+
+    Args:
+        wins (float): Number of wins.
+        games (float): Number of games.
+        z (float): Normal quantile of the confidence level (default 1.96 for 95%).
+
+    Returns:
+        tuple[float, float]: Lower and upper bound, (0.0, 1.0) without games.
+    """
+    if games <= 0:
+        return 0.0, 1.0
+    rate = wins / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = (
+        z
+        / (1 + z * z / games)
+        * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+    )
+    return max(float(center - spread), 0.0), min(float(center + spread), 1.0)
+
+
+def bradley_terry(wins: np.ndarray, iterations: int = 1000) -> np.ndarray:
+    """
+    Fits Bradley-Terry strengths to a matrix of pairwise wins.
+
+    Uses the minorization-maximization updates; every pair that played
+    gets half a virtual win each way, so unbeaten strategies still have a
+    finite strength.
+
+    Args:
+        wins (np.ndarray): wins[i, j] is the number of times i beat j.
+        iterations (int): Maximum number of updates (default 1000).
+
+    Returns:
+        np.ndarray: Strengths with a geometric mean of one.
+    """
+    decisive = wins + wins.T
+    wins = wins + 0.5 * (decisive > 0)
+    decisive = wins + wins.T
+    totals = wins.sum(axis=1)
+    strengths = np.ones(len(wins))
+    for _ in range(iterations):
+        pairs = decisive / (strengths[:, None] + strengths[None, :])
+        updated = totals / np.maximum(pairs.sum(axis=1), 1e-300)
+        updated = np.where(totals > 0, updated, strengths)
+        updated /= np.exp(np.log(updated).mean())
+        if np.allclose(updated, strengths, rtol=1e-10, atol=0):
+            return updated
+        strengths = updated
+    return strengths
+
+
+def _play_task(
+    strategies: List[Strategy],
+    n_games: int,
+    seed: int,
+    target_score: int,
+    max_rounds: Optional[int],
+    engine: str,
+) -> np.ndarray:
+    """
+    Plays the games of one task in a worker.
+
+    The task owns its random stream and its copies of the strategies, so
+    tasks running side by side in threads do not share the global random
+    state or the per-turn state of a strategy.
+
+    Args:
+        strategies (list[Strategy]): Strategies in seat order.
+        n_games (int): Number of games.
+        seed (int): Seed of the random stream of the task.
+        target_score (int): The score needed to win.
+        max_rounds (int | None): Maximum number of rounds of a game.
+        engine (str): "simulate" or "game".
+
+    Returns:
+        np.ndarray: Number of wins of every seat.
+    """
+    if engine == "simulate":
+        result = simulate(strategies, n_games, seed, target_score, max_rounds)
+    else:
+        players = [copy.copy(strategy) for strategy in strategies]
+        rng = random.Random(seed)
+        result = play_games(players, n_games, target_score, max_rounds, rng)
+    return result.wins()
+
+
+class TournamentResult:
+    """
+    Aggregated results of a tournament.
+
+    With two players at a table, wins[i, j] counts head-to-head games and
+    the pair results and ratings are proper pairwise statistics. At bigger
+    tables a win counts against every other player at the table, though
+    the others may have lost to a third one, so the pairwise matrices,
+    pair_results and ratings are only valid for tables of two; win_rates
+    and tables hold the exact results of bigger tables.
+
+    Attributes:
+        names : list[str]
+            Names of the strategies.
+        games : np.ndarray
+            games[i, j] is the number of games in which i and j played together.
+        wins : np.ndarray
+            wins[i, j] is the number of games won by i in which j played.
+        tables : dict[tuple[int, ...], np.ndarray]
+            Wins of every strategy of every table, by the indices of its strategies.
+
+    Methods:
+        win_rates() -> np.ndarray
+            Returns the fraction of its games every strategy won.
+
+        pair_results(z: float) -> list[dict]
+            Returns the head-to-head results of every pair with confidence intervals.
+
+        ratings(bootstrap: int, seed: int | None) -> list[dict]
+            Returns Elo-scale Bradley-Terry ratings with bootstrap confidence intervals.
+
+        as_dict() -> dict
+            Returns all the results as a dict.
+
+        to_json(**kwargs) -> str
+            Returns all the results as a JSON string.
+
+        to_csv() -> str
+            Returns the head-to-head results as CSV.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        games: np.ndarray,
+        wins: np.ndarray,
+        tables: Dict[Tuple[int, ...], np.ndarray],
+    ):
+        """
+        Initializes a TournamentResult object.
+
+        Args:
+            names (list[str]): Names of the strategies.
+            games (np.ndarray): Games played by every pair.
+            wins (np.ndarray): Wins of every strategy against every other one.
+            tables (dict[tuple[int, ...], np.ndarray]): Wins by table.
+        """
+        self.names: List[str] = names
+        self.games: np.ndarray = games
+        self.wins: np.ndarray = wins
+        self.tables: Dict[Tuple[int, ...], np.ndarray] = tables
+
+    def win_rates(self) -> np.ndarray:
+        """
+        Returns the fraction of its games every strategy won.
+
+        Returns:
+            np.ndarray: Win rates, one per strategy.
+        """
+        won = np.zeros(len(self.names))
+        played = np.zeros(len(self.names))
+        for seats, wins in self.tables.items():
+            total = wins.sum()
+            for seat, index in enumerate(seats):
+                won[index] += wins[seat]
+                played[index] += total
+        return won / np.maximum(played, 1)
+
+    def pair_results(self, z: float = 1.96) -> List[Dict[str, Any]]:
+        """
+        Returns the head-to-head results of every pair with confidence intervals.
+
+        In games of more than two players only the games won by one of the
+        two count as decisive for the pair.
+
+        Args:
+            z (float): Normal quantile of the confidence level (default 1.96).
+
+        Returns:
+            list[dict]: One entry per pair that played together.
+        """
+        results = []
+        for i, j in combinations(range(len(self.names)), 2):
+            if not self.games[i, j]:
+                continue
+            decisive = self.wins[i, j] + self.wins[j, i]
+            low, high = wilson_interval(self.wins[i, j], decisive, z)
+            results.append(
+                {
+                    "player": self.names[i],
+                    "opponent": self.names[j],
+                    "games": int(self.games[i, j]),
+                    "wins": int(self.wins[i, j]),
+                    "losses": int(self.wins[j, i]),
+                    "win_rate": float(self.wins[i, j] / decisive) if decisive else 0.5,
+                    "ci_low": low,
+                    "ci_high": high,
+                }
+            )
+        return results
+
+    def ratings(
+        self, bootstrap: int = 200, seed: Optional[int] = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns Elo-scale Bradley-Terry ratings with bootstrap confidence intervals.
+
+        A rating difference of 400 points means 10 to 1 odds in a head-to-head
+        game; the average rating is 1500. The 95% intervals come from refitting
+        the ratings to binomially resampled pair results. The ratings are fit
+        to the pairwise wins matrix, so they are only valid for tournaments
+        with tables of two players.
+
+        Args:
+            bootstrap (int): Number of resamples, 0 to skip the intervals (default 200).
+            seed (int | None): Seed of the resampling (default 0).
+
+        Returns:
+            list[dict]: Rating and interval of every strategy, best first.
+        """
+        ratings = 1500 + 400 * np.log10(bradley_terry(self.wins))
+        low, high = ratings.copy(), ratings.copy()
+        if bootstrap:
+            rng = np.random.default_rng(seed)
+            decisive = self.wins + self.wins.T
+            upper = np.triu(np.ones_like(decisive, dtype=bool), 1)
+            rates = np.divide(
+                self.wins, decisive, out=np.zeros(decisive.shape), where=decisive > 0
+            )
+            samples = []
+            for _ in range(bootstrap):
+                wins = np.where(
+                    upper, rng.binomial(decisive.astype(np.int64), rates), 0
+                )
+                wins = wins + np.where(upper, decisive - wins, 0).T
+                samples.append(1500 + 400 * np.log10(bradley_terry(wins)))
+            low, high = np.percentile(samples, [2.5, 97.5], axis=0)
+        order = np.argsort(-ratings, kind="stable")
+        return [
+            {
+                "name": self.names[i],
+                "rating": float(ratings[i]),
+                "ci_low": float(low[i]),
+                "ci_high": float(high[i]),
+            }
+            for i in order
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns all the results as a dict.
+
+        Returns:
+            dict: Names, matrices, ratings, pairs and tables.
+        """
+        rates = self.win_rates()
+        return {
+            "strategies": self.names,
+            "win_rates": dict(zip(self.names, rates.tolist())),
+            "games": self.games.tolist(),
+            "wins": self.wins.tolist(),
+            "ratings": self.ratings(),
+            "pairs": self.pair_results(),
+            "tables": [
+                {
+                    "players": [self.names[i] for i in seats],
+                    "wins": wins.tolist(),
+                }
+                for seats, wins in self.tables.items()
+            ],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """
+        Returns all the results as a JSON string.
+
+        Returns:
+            str: JSON document, kwargs are passed to json.dumps.
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_csv(self) -> str:
+        """
+        Returns the head-to-head results as CSV.
+
+        Returns:
+            str: One row per pair, with a header.
+        """
+        buffer = io.StringIO()
+        fields = [
+            "player",
+            "opponent",
+            "games",
+            "wins",
+            "losses",
+            "win_rate",
+            "ci_low",
+            "ci_high",
+        ]
+        writer = csv.DictWriter(buffer, fields, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(self.pair_results())
+        return buffer.getvalue()
+
+
+class Tournament:
+    """
+    Round-robin tournament between strategies.
+
+    Every combination of table_size strategies plays n_games games; the
+    seats are rotated so that every strategy moves first equally often.
+    Ratings and pair results are head-to-head only with table_size 2, see
+    TournamentResult.
+    The games are cut into tasks that run in a process pool, and every
+    task gets its own random stream spawned from one seed, so the results
+    only depend on the seed and not on the number of workers.
+
+    Attributes:
+        strategies : list[Strategy]
+            Strategies taking part.
+        names : list[str]
+            Names of the strategies.
+        n_games : int
+            Number of games of every table.
+        table_size : int
+            Number of players at a table.
+        seed : int | None
+            Seed of all the random streams.
+        target_score : int
+            The score needed to win.
+        max_rounds : int | None
+            Maximum number of rounds of a game.
+        engine : str
+            "simulate" for the vectorized simulation, "game" to play Game objects.
+        chunk_size : int
+            Maximum number of games of a task.
+
+    Methods:
+        tasks() -> list[tuple[tuple[int, ...], int, int]]
+            Returns the (seats, games, seed) of every task.
+
+        run(max_workers: int | None, executor: Executor | None) -> TournamentResult
+            Plays all the games and aggregates the results.
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[Strategy],
+        n_games: int = 1000,
+        table_size: int = 2,
+        seed: Optional[int] = None,
+        target_score: int = 10000,
+        max_rounds: Optional[int] = None,
+        names: Optional[Sequence[str]] = None,
+        engine: str = "simulate",
+        chunk_size: int = 10_000,
+    ):
+        """
+        Initializes a Tournament object.
+
+        Args:
+            strategies (Sequence[Strategy]): Strategies taking part.
+            n_games (int): Number of games of every table (default 1000).
+            table_size (int): Number of players at a table (default 2).
+            seed (int | None): Seed of all the random streams.
+            target_score (int): The score needed to win (default 10000).
+            max_rounds (int | None): Maximum number of rounds of a game.
+            names (Sequence[str] | None): Names of the strategies, class names by default.
+            engine (str): "simulate" or "game" (default "simulate").
+            chunk_size (int): Maximum number of games of a task (default 10_000).
+
+        Raises:
+            ValueError: If an argument is out of range or names do not match strategies.
+        """
+        if not 2 <= table_size <= len(strategies):
+            raise ValueError(
+                "table_size must be between 2 and the number of strategies"
+            )
+        if n_games < 1 or chunk_size < 1:
+            raise ValueError("n_games and chunk_size must be positive")
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+        if names is None:
+            names = self._default_names(strategies)
+        if len(names) != len(strategies):
+            raise ValueError("Number of names must match number of strategies")
+
+        self.strategies: List[Strategy] = list(strategies)
+        self.names: List[str] = list(names)
+        self.n_games: int = n_games
+        self.table_size: int = table_size
+        self.seed: Optional[int] = seed
+        self.target_score: int = target_score
+        self.max_rounds: Optional[int] = max_rounds
+        self.engine: str = engine
+        self.chunk_size: int = chunk_size
+
+    @staticmethod
+    def _default_names(strategies: Sequence[Strategy]) -> List[str]:
+        """
+        Names strategies by their classes, numbering repeated classes.
+
+        Args:
+            strategies (Sequence[Strategy]): Strategies taking part.
+
+        Returns:
+            list[str]: Unique names.
+        """
+        classes = [type(strategy).__name__ for strategy in strategies]
+        names = []
+        for index, name in enumerate(classes):
+            if classes.count(name) > 1:
+                name = f"{name}#{classes[:index].count(name) + 1}"
+            names.append(name)
+        return names
+
+    def tasks(self) -> List[Task]:
+        """
+        Returns the (seats, games, seed) of every task.
+
+        Returns:
+            list[tuple[tuple[int, ...], int, int]]: Strategy indices in seat
+                order, number of games and seed of every task.
+        """
+        plan = []
+        for table in combinations(range(len(self.strategies)), self.table_size):
+            for rotation in range(self.table_size):
+                seats = table[rotation:] + table[:rotation]
+                games = self.n_games // self.table_size
+                games += rotation < self.n_games % self.table_size
+                for start in range(0, games, self.chunk_size):
+                    plan.append((seats, min(self.chunk_size, games - start)))
+        streams = np.random.SeedSequence(self.seed).spawn(len(plan))
+        return [
+            (seats, games, int(stream.generate_state(1)[0]))
+            for (seats, games), stream in zip(plan, streams)
+        ]
+
+    def run(
+        self, max_workers: Optional[int] = None, executor: Optional[Executor] = None
+    ) -> TournamentResult:
+        """
+        Plays all the games and aggregates the results.
+
+        Args:
+            max_workers (int | None): Size of the process pool.
+            executor (Executor | None): Executor to use instead of a new process pool.
+
+        Returns:
+            TournamentResult: Win matrices and results of every table.
+        """
+        tasks = self.tasks()
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers)
+        try:
+            futures = [
+                pool.submit(
+                    _play_task,
+                    [self.strategies[i] for i in seats],
+                    games,
+                    seed,
+                    self.target_score,
+                    self.max_rounds,
+                    self.engine,
+                )
+                for seats, games, seed in tasks
+            ]
+            outcomes = [future.result() for future in futures]
+        finally:
+            if executor is None:
+                pool.shutdown(wait=True)
+
+        count = len(self.strategies)
+        games = np.zeros((count, count), dtype=np.int64)
+        wins = np.zeros((count, count), dtype=np.int64)
+        tables: Dict[Tuple[int, ...], np.ndarray] = {}
+        for (seats, n_games, _), seat_wins in zip(tasks, outcomes):
+            table = tuple(sorted(seats))
+            totals = tables.setdefault(table, np.zeros(len(table), dtype=np.int64))
+            for seat, index in enumerate(seats):
+                totals[table.index(index)] += seat_wins[seat]
+                for other in seats:
+                    if other != index:
+                        games[index, other] += n_games
+                        wins[index, other] += seat_wins[seat]
+        return TournamentResult(self.names, games, wins, tables)
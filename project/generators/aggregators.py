@@ -0,0 +1,467 @@
+import heapq
+import math
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class Aggregator(ABC):
+    """
+    Base class for incremental aggregators
+
+    An aggregator consumes elements one at a time in O(1) amortized time
+    and never keeps the whole stream. Partial aggregators of the same type
+    can be merged, which is what windows, group-by and parallel execution
+    rely on. Aggregators that also define remove and set supports_remove
+    can be used in sliding windows, where elements leave in the order they
+    came.
+
+    Methods:
+        add(value: Any)
+            Adds an element
+
+        remove(value: Any)
+            Removes the oldest element still in the aggregate; only defined
+            by aggregators that set supports_remove
+
+        merge(other: "Aggregator")
+            Merges a partial aggregate of the same type into this one
+
+        result() -> Any
+            Returns the current aggregated value
+
+        of(iterable: Iterable[Any], *args: Any, **kwargs: Any) -> Any
+            Aggregates a whole iterable, usable with Pipeline.aggregate
+    """
+
+    supports_remove = False
+
+    @abstractmethod
+    def add(self, value: Any) -> None:
+        """
+        Adds an element
+
+        Args:
+            value (Any): element to add
+        """
+
+    @abstractmethod
+    def merge(self, other: "Aggregator") -> None:
+        """
+        Merges a partial aggregate of the same type into this one
+
+        Args:
+            other (Aggregator): partial aggregate
+        """
+
+    @abstractmethod
+    def result(self) -> Any:
+        """
+        Returns the current aggregated value
+
+        Returns:
+            Any: aggregated value
+        """
+
+    @classmethod
+    def of(cls, iterable: Iterable[Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Aggregates a whole iterable, e.g. pipeline.aggregate(Mean.of)
+
+        Args:
+            iterable (Iterable[Any]): elements to aggregate
+
+        Returns:
+            Any: aggregated value
+        """
+        aggregator = cls(*args, **kwargs)
+        for value in iterable:
+            aggregator.add(value)
+        return aggregator.result()
+
+
+class Count(Aggregator):
+    """
+    Number of elements
+    """
+
+    supports_remove = True
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        self.count += 1
+
+    def remove(self, value: Any) -> None:
+        self.count -= 1
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, Count)
+        self.count += other.count
+
+    def result(self) -> int:
+        return self.count
+
+
+class Sum(Aggregator):
+    """
+    Sum of elements
+    """
+
+    supports_remove = True
+
+    def __init__(self) -> None:
+        self.total: Any = 0
+
+    def add(self, value: Any) -> None:
+        self.total += value
+
+    def remove(self, value: Any) -> None:
+        self.total -= value
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, Sum)
+        self.total += other.total
+
+    def result(self) -> Any:
+        return self.total
+
+
+class Mean(Aggregator):
+    """
+    Arithmetic mean of elements, None for an empty aggregate
+    """
+
+    supports_remove = True
+
+    def __init__(self) -> None:
+        self.total: Any = 0
+        self.count = 0
+
+    def add(self, value: Any) -> None:
+        self.total += value
+        self.count += 1
+
+    def remove(self, value: Any) -> None:
+        self.total -= value
+        self.count -= 1
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, Mean)
+        self.total += other.total
+        self.count += other.count
+
+    def result(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+class Min(Aggregator):
+    """
+    Minimum of elements, None for an empty aggregate
+
+    Keeps a monotonic deque, so removing the oldest element is O(1)
+    amortized and the minimum of a sliding window is always at the front.
+    """
+
+    supports_remove = True
+
+    def __init__(self) -> None:
+        self.candidates: Deque[Any] = deque()
+
+    def _before(self, first: Any, second: Any) -> bool:
+        return first < second
+
+    def add(self, value: Any) -> None:
+        candidates = self.candidates
+        while candidates and self._before(value, candidates[-1]):
+            candidates.pop()
+        candidates.append(value)
+
+    def remove(self, value: Any) -> None:
+        if self.candidates and self.candidates[0] == value:
+            self.candidates.popleft()
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, type(self))
+        if not other.candidates:
+            return
+        best = other.candidates[0]
+        if not self.candidates or self._before(best, self.candidates[0]):
+            self.candidates = deque([best])
+        else:
+            self.candidates = deque([self.candidates[0]])
+
+    def result(self) -> Any:
+        return self.candidates[0] if self.candidates else None
+
+
+class Max(Min):
+    """
+    Maximum of elements, None for an empty aggregate
+
+    Keeps a monotonic deque like Min.
+    """
+
+    def _before(self, first: Any, second: Any) -> bool:
+        return first > second
+
+
+class Quantile(Aggregator):
+    """
+    Streaming quantile sketch with relative accuracy (DDSketch)
+
+    Values are counted in logarithmic buckets, so any quantile is
+    returned within relative_accuracy of the true value while memory
+    depends only on the range of magnitudes, not on the stream length.
+    Buckets can be decremented, so the sketch works in sliding windows,
+    and two sketches merge by adding bucket counts.
+
+    Attributes:
+        q : float
+            Quantile to report, between 0 and 1
+        relative_accuracy : float
+            Maximum relative error of the reported value
+    """
+
+    supports_remove = True
+
+    def __init__(self, q: float = 0.5, relative_accuracy: float = 0.01):
+        """
+        Initializes an empty sketch
+
+        Args:
+            q (float): quantile to report. Defaults to 0.5.
+            relative_accuracy (float): maximum relative error. Defaults to 0.01.
+
+        Raises:
+            ValueError: if q or relative_accuracy is out of range
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.q = q
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, bucket: int) -> float:
+        return 2 * self._gamma**bucket / (self._gamma + 1)
+
+    def _update(self, value: float, delta: int) -> None:
+        self.count += delta
+        if value > 0:
+            buckets, key = self.positive, self._bucket(value)
+        elif value < 0:
+            buckets, key = self.negative, self._bucket(-value)
+        else:
+            self.zeros += delta
+            return
+        count = buckets.get(key, 0) + delta
+        if count:
+            buckets[key] = count
+        else:
+            del buckets[key]
+
+    def add(self, value: Any) -> None:
+        self._update(value, 1)
+
+    def remove(self, value: Any) -> None:
+        self._update(value, -1)
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, Quantile)
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for mine, theirs in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def result(self) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = self.q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+class TopK(Aggregator):
+    """
+    The k largest elements, kept in a bounded min-heap
+
+    Every element costs one comparison with the smallest kept element and
+    O(log k) only when it enters the heap, so the whole stream takes
+    O(n log k) time and O(k) memory. Partial results merge by pushing the
+    other heap's entries.
+
+    Attributes:
+        k : int
+            Number of elements to keep
+        key : Optional[Callable[[Any], Any]]
+            Sort key, None to compare elements directly
+    """
+
+    def __init__(self, k: int, key: Optional[Callable[[Any], Any]] = None):
+        """
+        Initializes an empty aggregate
+
+        Args:
+            k (int): number of elements to keep
+            key (Optional[Callable[[Any], Any]]): sort key. Defaults to None.
+
+        Raises:
+            ValueError: if k is negative
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        self.k = k
+        self.key = key
+        self.heap: List[Tuple[Any, int, Any]] = []
+        self.seen = 0
+
+    def _push(self, entry: Tuple[Any, int, Any]) -> None:
+        heap = self.heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif heap and entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, value: Any) -> None:
+        rank = value if self.key is None else self.key(value)
+        # Earlier elements win ties, like in sorted(..., reverse=True)
+        self.seen += 1
+        self._push((rank, -self.seen, value))
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, TopK)
+        # The other part of the stream is treated as coming after this one
+        for rank, order, value in other.heap:
+            self._push((rank, order - self.seen, value))
+        self.seen += other.seen
+
+    def result(self) -> List[Any]:
+        return [value for _, _, value in sorted(self.heap, reverse=True)]
+
+
+class ReservoirSample(Aggregator):
+    """
+    Uniform random sample of k elements of a stream
+
+    Every element gets a random priority and the k elements with the
+    smallest priorities are kept in a bounded max-heap. This is a uniform
+    sample without replacement, and two samples of disjoint streams merge
+    into a uniform sample of their union by keeping the k smallest
+    priorities of both. After the first k elements a new element costs one
+    random number and one comparison; the heap changes O(k log(n / k))
+    times in total.
+
+    Attributes:
+        k : int
+            Sample size
+        seed : Optional[int]
+            Seed of the random generator, None for a random one
+    """
+
+    def __init__(self, k: int, seed: Optional[int] = None):
+        """
+        Initializes an empty sample
+
+        Args:
+            k (int): sample size
+            seed (Optional[int]): seed of the random generator. Defaults to None.
+
+        Raises:
+            ValueError: if k is negative
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        self.k = k
+        self.seed = seed
+        self.heap: List[Tuple[float, int, Any]] = []
+        self.seen = 0
+        self._random = random.Random(seed)
+
+    def _push(self, entry: Tuple[float, int, Any]) -> None:
+        heap = self.heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif heap and entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    def add(self, value: Any) -> None:
+        # Priorities are negated: the heap root is the largest kept priority
+        self.seen += 1
+        self._push((-self._random.random(), self.seen, value))
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, ReservoirSample)
+        # The other part of the stream is treated as coming after this one
+        for priority, order, value in other.heap:
+            self._push((priority, order + self.seen, value))
+        self.seen += other.seen
+
+    def result(self) -> List[Any]:
+        return [value for _, _, value in sorted(self.heap, key=lambda e: e[1])]
+
+
+def top_k(
+    iterable: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]] = None
+) -> List[Any]:
+    """
+    Returns the k largest elements in descending order, in O(n log k)
+
+    Used as a terminal aggregator: pipeline.aggregate(top_k, 100, key=score)
+
+    Args:
+        iterable (Iterable[Any]): elements
+        k (int): number of elements
+        key (Optional[Callable[[Any], Any]]): sort key. Defaults to None.
+
+    Returns:
+        List[Any]: same as sorted(iterable, key=key, reverse=True)[:k]
+    """
+    return TopK.of(iterable, k, key)
+
+
+def reservoir_sample(
+    iterable: Iterable[Any], k: int, seed: Optional[int] = None
+) -> List[Any]:
+    """
+    Returns a uniform random sample of k elements in O(k) memory
+
+    Used as a terminal aggregator: pipeline.aggregate(reservoir_sample, 100, seed=1)
+
+    Args:
+        iterable (Iterable[Any]): elements
+        k (int): sample size
+        seed (Optional[int]): seed of the random generator. Defaults to None.
+
+    Returns:
+        List[Any]: sampled elements in stream order, all of them if there are fewer than k
+    """
+    return ReservoirSample.of(iterable, k, seed)
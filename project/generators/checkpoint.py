@@ -0,0 +1,291 @@
+import os
+import pickle
+from collections.abc import Sequence
+from functools import reduce
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from project.generators.aggregators import Aggregator
+from project.generators.operators import Operator
+
+Step = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+AggregatorFactory = Callable[[], Aggregator]
+
+CHECKPOINT_VERSION = 1
+
+_MISSING = object()
+
+
+class _MapOperator(Operator):
+    """
+    map step as a stateless operator
+    """
+
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+
+    def open(self) -> None:
+        return None
+
+    def push(self, state: None, item: Any) -> Iterable[Any]:
+        return (self.func(item),)
+
+
+class _FilterOperator(Operator):
+    """
+    filter step as a stateless operator
+    """
+
+    def __init__(self, predicate: Optional[Callable[[Any], Any]]):
+        self.predicate = predicate if predicate is not None else bool
+
+    def open(self) -> None:
+        return None
+
+    def push(self, state: None, item: Any) -> Iterable[Any]:
+        return (item,) if self.predicate(item) else ()
+
+
+class _EnumerateOperator(Operator):
+    """
+    enumerate step; the state is the next index
+    """
+
+    def __init__(self, start: int = 0):
+        self.start = start
+
+    def open(self) -> List[int]:
+        return [self.start]
+
+    def push(self, state: List[int], item: Any) -> Iterable[Any]:
+        index = state[0]
+        state[0] += 1
+        return ((index, item),)
+
+
+class _ReduceOperator(Operator):
+    """
+    reduce step; the state is [has_value, accumulated value]
+
+    The flag is stored instead of a sentinel value, as a sentinel object
+    would not be the same object after the state is unpickled.
+    """
+
+    def __init__(self, func: Callable[[Any, Any], Any], initial: Any = _MISSING):
+        self.func = func
+        self.initial = initial
+
+    def open(self) -> List[Any]:
+        if self.initial is _MISSING:
+            return [False, None]
+        return [True, self.initial]
+
+    def push(self, state: List[Any], item: Any) -> Iterable[Any]:
+        if state[0]:
+            state[1] = self.func(state[1], item)
+        else:
+            state[0], state[1] = True, item
+        return ()
+
+    def finish(self, state: List[Any]) -> Iterable[Any]:
+        if not state[0]:
+            raise TypeError("reduce() of empty iterable with no initial value")
+        return (state[1],)
+
+
+def as_operator(step: Step) -> Operator:
+    """
+    Returns the operator that performs a step one element at a time
+
+    map, filter, enumerate and reduce steps are converted; Operator
+    instances are used as they are. Other steps are arbitrary functions
+    of the whole stream, their state cannot be saved.
+
+    Args:
+        step (Step): (func, args, kwargs) triple
+
+    Raises:
+        ValueError: if the step cannot be checkpointed
+
+    Returns:
+        Operator: operator with picklable state
+    """
+    func, args, kwargs = step
+    if isinstance(func, Operator) and not args and not kwargs:
+        return func
+    if func is map and len(args) == 1 and not kwargs:
+        return _MapOperator(args[0])
+    if func is filter and len(args) == 1 and not kwargs:
+        return _FilterOperator(args[0])
+    if func is enumerate and len(args) <= 1:
+        return _EnumerateOperator(*args, **kwargs)
+    if func is reduce and 1 <= len(args) <= 2:
+        return _ReduceOperator(*args)
+    name = getattr(func, "__name__", type(func).__name__)
+    raise ValueError(
+        f"step {name} cannot be checkpointed, use map, filter, enumerate, "
+        "reduce or an Operator instance"
+    )
+
+
+def _skip(source: Iterable[Any], offset: int) -> Iterable[Any]:
+    """
+    Returns the source without its first offset elements
+
+    Sequences (lists, ranges, LazyRange) are sliced without iterating,
+    other sources are advanced element by element without processing.
+
+    Args:
+        source (Iterable[Any]): data to process
+        offset (int): number of elements already processed
+
+    Returns:
+        Iterable[Any]: remaining elements
+    """
+    if not offset:
+        return source
+    if isinstance(source, Sequence):
+        return source[offset:]
+    it = iter(source)
+    next(islice(it, offset, offset), None)
+    return it
+
+
+def _save(path: str, checkpoint: Dict[str, Any]) -> None:
+    """
+    Atomically replaces the checkpoint file
+
+    The new checkpoint is written to a temporary file, flushed to disk and
+    renamed over the old one, so a crash leaves either the old or the new
+    checkpoint, never a partial one.
+
+    Args:
+        path (str): checkpoint file
+        checkpoint (Dict[str, Any]): data to save
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        pickle.dump(checkpoint, file, pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def _load(path: str, names: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Reads a checkpoint if there is one
+
+    Args:
+        path (str): checkpoint file
+        names (List[str]): names of the steps of the run
+
+    Raises:
+        ValueError: if the checkpoint was written by different steps
+
+    Returns:
+        Optional[Dict[str, Any]]: checkpoint, None if there is no file
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        checkpoint: Dict[str, Any] = pickle.load(file)
+    if checkpoint.get("version") != CHECKPOINT_VERSION or checkpoint["steps"] != names:
+        raise ValueError(f"checkpoint {path} was written by a different pipeline")
+    return checkpoint
+
+
+def run_checkpointed(
+    steps: List[Step],
+    names: List[str],
+    source: Iterable[Any],
+    path: str,
+    aggregator: AggregatorFactory,
+    every: int = 10_000,
+) -> Any:
+    """
+    Runs steps over a source into an aggregator, saving progress to a file
+
+    Every every source elements the number of consumed elements, the
+    states of all the steps and the partial aggregate are saved together
+    in one atomic write. If the file exists when the run starts, the run
+    resumes from it: the processed prefix of the source is skipped and the
+    saved states are restored. Elements after the last checkpoint are
+    processed again, but only on top of the state saved before them, so
+    every element affects the final aggregate exactly once. The source
+    must yield the same elements on every run. A checkpoint is also saved
+    right after a step spills a file (see Operator.spill_files), so every
+    spilled file is referenced by the checkpoint and is either reused or
+    removed by the resumed run. On success the checkpoint file is removed;
+    on failure nothing is closed, so the spilled files stay for the
+    resumed run.
+
+    Args:
+        steps (List[Step]): map, filter, enumerate, reduce or Operator steps
+        names (List[str]): names of the steps, used to validate the checkpoint
+        source (Iterable[Any]): data to process
+        path (str): checkpoint file
+        aggregator (AggregatorFactory): creates the final aggregator, e.g. Sum
+        every (int): source elements between checkpoints. Defaults to 10_000.
+
+    Raises:
+        ValueError: if every is not positive, a step cannot be checkpointed
+            or the checkpoint belongs to different steps
+
+    Returns:
+        Any: result of the aggregator
+    """
+    if every < 1:
+        raise ValueError("every must be positive")
+    operators = [as_operator(step) for step in steps]
+    checkpoint = _load(path, names)
+    if checkpoint is None:
+        offset = 0
+        states = [operator.open() for operator in operators]
+        sink = aggregator()
+    else:
+        offset = checkpoint["offset"]
+        states = checkpoint["states"]
+        sink = checkpoint["aggregate"]
+
+    def push(index: int, item: Any) -> None:
+        if index == len(operators):
+            sink.add(item)
+            return
+        for output in operators[index].push(states[index], item):
+            push(index + 1, output)
+
+    # Operators that can spill files, checked after every element
+    spilling = [
+        (operator, state)
+        for operator, state in zip(operators, states)
+        if type(operator).spill_files is not Operator.spill_files
+    ]
+
+    def spilled() -> int:
+        return sum(len(operator.spill_files(state)) for operator, state in spilling)
+
+    files = spilled()
+    for item in _skip(source, offset):
+        push(0, item)
+        offset += 1
+        if offset % every == 0 or (spilling and spilled() != files):
+            files = spilled()
+            _save(
+                path,
+                {
+                    "version": CHECKPOINT_VERSION,
+                    "steps": names,
+                    "offset": offset,
+                    "states": states,
+                    "aggregate": sink,
+                },
+            )
+
+    for index, (operator, state) in enumerate(zip(operators, states)):
+        for output in operator.finish(state):
+            push(index + 1, output)
+    for operator, state in zip(operators, states):
+        operator.close(state)
+    if os.path.exists(path):
+        os.remove(path)
+    return sink.result()
@@ -0,0 +1,451 @@
+import heapq
+import os
+import pickle
+import tempfile
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from project.generators.aggregators import Aggregator
+from project.generators.operators import Operator
+
+AggregatorFactory = Callable[[], Aggregator]
+
+RUN_BLOCK_SIZE = 1024
+
+
+def write_run(items: Iterable[Any], directory: Optional[str] = None) -> str:
+    """
+    Writes already sorted elements to a temporary run file
+
+    Elements are pickled in blocks of RUN_BLOCK_SIZE, which keeps the file
+    compact and the number of pickle calls small.
+
+    Args:
+        items (Iterable[Any]): sorted elements
+        directory (Optional[str]): where to create the file. Defaults to the system temp dir.
+
+    Returns:
+        str: path of the run file
+    """
+    fd, path = tempfile.mkstemp(prefix="pipeline-run-", dir=directory)
+    with os.fdopen(fd, "wb") as file:
+        block: List[Any] = []
+        for item in items:
+            block.append(item)
+            if len(block) >= RUN_BLOCK_SIZE:
+                pickle.dump(block, file, pickle.HIGHEST_PROTOCOL)
+                block = []
+        if block:
+            pickle.dump(block, file, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def read_run(path: str) -> Iterator[Any]:
+    """
+    Lazily reads the elements of a run file, one block at a time
+
+    Args:
+        path (str): path of the run file
+
+    Yields:
+        Iterator[Any]: elements in the order they were written
+    """
+    with open(path, "rb") as file:
+        while True:
+            try:
+                block = pickle.load(file)
+            except EOFError:
+                return
+            yield from block
+
+
+def remove_runs(paths: List[str]) -> None:
+    """
+    Deletes run files, ignoring the ones that are already gone
+
+    Args:
+        paths (List[str]): paths of the run files
+    """
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    paths.clear()
+
+
+class GroupByStats:
+    """
+    Memory counters of one group-by run
+
+    Attributes:
+        peak_keys : int
+            Largest number of accumulators held in memory at once
+        spills : int
+            Number of run files written
+        spilled_keys : int
+            Number of partial aggregates written to disk
+        spilled_bytes : int
+            Total size of the run files
+    """
+
+    def __init__(self) -> None:
+        self.peak_keys = 0
+        self.spills = 0
+        self.spilled_keys = 0
+        self.spilled_bytes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Returns the counters as a dict
+
+        Returns:
+            Dict[str, int]: counters
+        """
+        return dict(vars(self))
+
+
+class _GroupState:
+    """
+    State of one group-by run: in-memory accumulators and spilled runs
+    """
+
+    def __init__(self) -> None:
+        self.groups: Dict[Any, Aggregator] = {}
+        self.runs: List[str] = []
+        self.stats = GroupByStats()
+
+
+class GroupBy(Operator):
+    """
+    Streaming group-by with a bounded number of in-memory keys
+
+    Every key gets an incremental aggregator. When more than max_keys
+    accumulators are held, they are sorted by key and written to a
+    temporary run file as partial aggregates; at the end all runs are
+    merged lazily with heapq.merge and equal keys are combined with
+    Aggregator.merge. Emits (key, result) pairs: in first-seen order if
+    nothing was spilled, in key order otherwise (keys must then be
+    orderable). The budget counts accumulators, not bytes, so it bounds
+    memory only as well as the size of one accumulator is bounded.
+
+    The counters of a run are returned by run, not kept on the operator,
+    so one GroupBy can process many streams at once.
+
+    Attributes:
+        key : Callable[[Any], Any]
+            Returns the group key of an element
+        aggregator : AggregatorFactory
+            Creates an empty aggregator for a new key
+        value : Optional[Callable[[Any], Any]]
+            Returns the value that is aggregated, None for the element itself
+        max_keys : int
+            Number of accumulators kept in memory before spilling
+        spill_dir : Optional[str]
+            Directory for run files, None for the system temp dir
+
+    Methods:
+        run(iterable: Iterable[Any], stats: Optional[GroupByStats] = None) -> Tuple[Iterator[Any], GroupByStats]
+            Runs the group-by and returns the counters of that run
+    """
+
+    def __init__(
+        self,
+        key: Callable[[Any], Any],
+        aggregator: AggregatorFactory,
+        value: Optional[Callable[[Any], Any]] = None,
+        max_keys: int = 100_000,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initializes the group-by
+
+        Args:
+            key (Callable[[Any], Any]): returns the group key of an element
+            aggregator (AggregatorFactory): creates an empty aggregator
+            value (Optional[Callable[[Any], Any]]): returns the aggregated value. Defaults to None.
+            max_keys (int): accumulators kept in memory. Defaults to 100_000.
+            spill_dir (Optional[str]): directory for run files. Defaults to None.
+
+        Raises:
+            ValueError: if max_keys is not positive
+        """
+        if max_keys < 1:
+            raise ValueError("max_keys must be positive")
+        self.key = key
+        self.aggregator = aggregator
+        self.value = value
+        self.max_keys = max_keys
+        self.spill_dir = spill_dir
+
+    def open(self) -> _GroupState:
+        return _GroupState()
+
+    def run(
+        self, iterable: Iterable[Any], stats: Optional[GroupByStats] = None
+    ) -> Tuple[Iterator[Any], GroupByStats]:
+        """
+        Runs the group-by over a stream and returns the counters of that run
+
+        Args:
+            iterable (Iterable[Any]): input elements
+            stats (Optional[GroupByStats]): counters to fill. Defaults to None (new counters).
+
+        Returns:
+            Tuple[Iterator[Any], GroupByStats]: (key, result) pairs and the
+            counters, filled as the pairs are consumed
+        """
+        state = self.open()
+        if stats is not None:
+            state.stats = stats
+        return self._drive(state, iterable), state.stats
+
+    def push(self, state: _GroupState, item: Any) -> Iterable[Any]:
+        groups = state.groups
+        key = self.key(item)
+        accumulator = groups.get(key)
+        if accumulator is None:
+            if len(groups) >= self.max_keys:
+                self._spill(state)
+                groups = state.groups
+            accumulator = groups[key] = self.aggregator()
+            state.stats.peak_keys = max(state.stats.peak_keys, len(groups))
+        accumulator.add(item if self.value is None else self.value(item))
+        return ()
+
+    def _spill(self, state: _GroupState) -> None:
+        """
+        Writes the in-memory accumulators to a sorted run file
+
+        Args:
+            state (_GroupState): state of the run
+        """
+        items = sorted(state.groups.items(), key=itemgetter(0))
+        path = write_run(items, self.spill_dir)
+        state.runs.append(path)
+        state.stats.spills += 1
+        state.stats.spilled_keys += len(items)
+        state.stats.spilled_bytes += os.path.getsize(path)
+        state.groups = {}
+
+    def finish(self, state: _GroupState) -> Iterable[Any]:
+        if not state.runs:
+            return ((key, agg.result()) for key, agg in state.groups.items())
+        return self._merge(state)
+
+    def _merge(self, state: _GroupState) -> Iterator[Any]:
+        """
+        Merges the spilled runs with the in-memory accumulators
+
+        Args:
+            state (_GroupState): state of the run
+
+        Yields:
+            Iterator[Any]: (key, result) pairs in key order
+        """
+        in_memory = sorted(state.groups.items(), key=itemgetter(0))
+        state.groups = {}
+        streams = [read_run(path) for path in state.runs] + [iter(in_memory)]
+        merged = heapq.merge(*streams, key=itemgetter(0))
+        current_key: Any = None
+        current: Optional[Aggregator] = None
+        for key, accumulator in merged:
+            if current is not None and key == current_key:
+                current.merge(accumulator)
+                continue
+            if current is not None:
+                yield current_key, current.result()
+            current_key, current = key, accumulator
+        if current is not None:
+            yield current_key, current.result()
+
+    def close(self, state: _GroupState) -> None:
+        remove_runs(state.runs)
+
+    def spill_files(self, state: _GroupState) -> List[str]:
+        return state.runs
+
+
+def group_by(
+    iterable: Iterable[Any],
+    key: Callable[[Any], Any],
+    aggregator: AggregatorFactory,
+    stats: Optional[GroupByStats] = None,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """
+    Groups a stream by key with incremental aggregators, spilling to disk
+
+    Used as a step: pipe_step(group_by, key_fn, Sum, max_keys=10_000)
+
+    max_keys limits the number of keys held in memory, not bytes: memory
+    is bounded only as well as the size of one accumulator is. Pass a
+    GroupByStats as stats to see the peak number of keys and the spills
+    of the step; the counters of every run of the step are added to it.
+
+    Args:
+        iterable (Iterable[Any]): input elements
+        key (Callable[[Any], Any]): returns the group key of an element
+        aggregator (AggregatorFactory): creates an empty aggregator
+        stats (Optional[GroupByStats]): counters to fill. Defaults to None.
+        **kwargs (Any): value, max_keys and spill_dir of GroupBy
+
+    Returns:
+        Iterator[Any]: (key, result) pairs
+    """
+    return GroupBy(key, aggregator, **kwargs).run(iterable, stats)[0]
+
+
+class SortStats:
+    """
+    Counters of one external sort run
+
+    Attributes:
+        runs : int
+            Number of run files written
+        spilled_bytes : int
+            Total size of the run files
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.spilled_bytes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """
+        Returns the counters as a dict
+
+        Returns:
+            Dict[str, int]: counters
+        """
+        return dict(vars(self))
+
+
+class _SortState:
+    """
+    State of one external sort run: the current in-memory run and the spilled ones
+    """
+
+    def __init__(self) -> None:
+        self.buffer: List[Any] = []
+        self.runs: List[str] = []
+        self.stats = SortStats()
+
+
+class ExternalSort(Operator):
+    """
+    External merge sort with a fixed number of elements in memory
+
+    Elements are collected into runs of memory_limit elements; each full
+    run is sorted in memory and written to a temporary file. At the end
+    the runs are k-way merged lazily with heapq.merge, reading one block
+    per run at a time. The sort is stable, like sorted. The counters of
+    a run are returned by run, not kept on the operator.
+
+    Attributes:
+        key : Optional[Callable[[Any], Any]]
+            Sort key, None to compare elements directly
+        reverse : bool
+            Sort in descending order
+        memory_limit : int
+            Number of elements kept in memory while collecting runs
+        spill_dir : Optional[str]
+            Directory for run files, None for the system temp dir
+
+    Methods:
+        run(iterable: Iterable[Any]) -> Tuple[Iterator[Any], SortStats]
+            Runs the sort and returns the counters of that run
+    """
+
+    def __init__(
+        self,
+        key: Optional[Callable[[Any], Any]] = None,
+        memory_limit: int = 1_000_000,
+        reverse: bool = False,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initializes the sort
+
+        Args:
+            key (Optional[Callable[[Any], Any]]): sort key. Defaults to None.
+            memory_limit (int): elements kept in memory. Defaults to 1_000_000.
+            reverse (bool): sort in descending order. Defaults to False.
+            spill_dir (Optional[str]): directory for run files. Defaults to None.
+
+        Raises:
+            ValueError: if memory_limit is not positive
+        """
+        if memory_limit < 1:
+            raise ValueError("memory_limit must be positive")
+        self.key = key
+        self.memory_limit = memory_limit
+        self.reverse = reverse
+        self.spill_dir = spill_dir
+
+    def open(self) -> _SortState:
+        return _SortState()
+
+    def run(self, iterable: Iterable[Any]) -> Tuple[Iterator[Any], SortStats]:
+        """
+        Runs the sort over a stream and returns the counters of that run
+
+        Args:
+            iterable (Iterable[Any]): input elements
+
+        Returns:
+            Tuple[Iterator[Any], SortStats]: sorted elements and the counters,
+            filled as the elements are consumed
+        """
+        state = self.open()
+        return self._drive(state, iterable), state.stats
+
+    def push(self, state: _SortState, item: Any) -> Iterable[Any]:
+        buffer = state.buffer
+        buffer.append(item)
+        if len(buffer) >= self.memory_limit:
+            buffer.sort(key=self.key, reverse=self.reverse)
+            path = write_run(buffer, self.spill_dir)
+            state.runs.append(path)
+            state.stats.runs += 1
+            state.stats.spilled_bytes += os.path.getsize(path)
+            state.buffer = []
+        return ()
+
+    def finish(self, state: _SortState) -> Iterable[Any]:
+        state.buffer.sort(key=self.key, reverse=self.reverse)
+        if not state.runs:
+            return state.buffer
+        streams = [read_run(path) for path in state.runs] + [iter(state.buffer)]
+        return heapq.merge(*streams, key=self.key, reverse=self.reverse)
+
+    def close(self, state: _SortState) -> None:
+        remove_runs(state.runs)
+
+    def spill_files(self, state: _SortState) -> List[str]:
+        return state.runs
+
+
+def sort(
+    iterable: Iterable[Any],
+    key: Optional[Callable[[Any], Any]] = None,
+    memory_limit: int = 1_000_000,
+    reverse: bool = False,
+    spill_dir: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Sorts a stream with a fixed number of elements in memory
+
+    Used as a step: pipe_step(sort, key_fn, memory_limit=100_000)
+
+    Args:
+        iterable (Iterable[Any]): input elements
+        key (Optional[Callable[[Any], Any]]): sort key. Defaults to None.
+        memory_limit (int): elements kept in memory. Defaults to 1_000_000.
+        reverse (bool): sort in descending order. Defaults to False.
+        spill_dir (Optional[str]): directory for run files. Defaults to None.
+
+    Returns:
+        Iterator[Any]: sorted elements
+    """
+    return ExternalSort(key, memory_limit, reverse, spill_dir)(iterable)
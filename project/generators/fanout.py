@@ -0,0 +1,137 @@
+import queue
+import threading
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from project.generators.staged import _DONE, _POLL_INTERVAL, _Cancelled
+
+Branch = Callable[[Iterable[Any]], Any]
+
+
+class _BranchRun:
+    """
+    One branch of a fan-out: a consumer thread fed through a bounded queue
+    """
+
+    def __init__(self, func: Branch, capacity: int, stop: threading.Event):
+        self.func = func
+        self.queue: "queue.Queue[Any]" = queue.Queue(capacity)
+        self.stop = stop
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _items(self) -> Iterator[Any]:
+        """
+        Yields the elements arriving through the queue
+
+        Raises:
+            _Cancelled: if the fan-out was stopped
+
+        Yields:
+            Iterator[Any]: elements
+        """
+        while True:
+            try:
+                batch = self.queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if self.stop.is_set():
+                    raise _Cancelled()
+                continue
+            if batch is _DONE:
+                return
+            yield from batch
+
+    def _run(self) -> None:
+        """
+        Body of the branch thread
+        """
+        try:
+            self.result = self.func(self._items())
+        except _Cancelled:
+            pass
+        except BaseException as error:
+            self.error = error
+        finally:
+            self.done.set()
+
+    def put(self, batch: Any) -> None:
+        """
+        Puts a batch into the queue, waiting while it is full
+
+        A branch that already returned does not read its queue any more,
+        so the batch is dropped for it.
+
+        Args:
+            batch (Any): list of elements or _DONE
+        """
+        while not self.done.is_set():
+            try:
+                self.queue.put(batch, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+
+def fan_out(
+    iterable: Iterable[Any],
+    *branches: Branch,
+    capacity: int = 16,
+    batch_size: int = 256,
+) -> Tuple[Any, ...]:
+    """
+    Feeds one stream to several consumers in a single pass
+
+    Every branch is a callable that consumes an iterable and returns a
+    result, e.g. sum, partial(plan.aggregate, aggregator=max) or an
+    Operator wrapped in list. Each branch runs in its own thread and reads
+    from a bounded queue, so the source and the upstream steps are
+    computed once and at most capacity * batch_size elements are buffered
+    per branch: a slow branch makes the source wait instead of letting
+    the buffers grow. A branch may stop reading early; the others still
+    receive the whole stream.
+
+    Used as a step, pipe_step(fan_out, sum, max), the stream is replaced
+    by the results of the branches.
+
+    Args:
+        iterable (Iterable[Any]): input elements
+        *branches (Branch): consumers of the stream
+        capacity (int): maximum number of batches queued per branch. Defaults to 16.
+        batch_size (int): elements moved through a queue at once. Defaults to 256.
+
+    Raises:
+        ValueError: if capacity or batch_size is not positive
+        BaseException: the first error raised by a branch or by the source
+
+    Returns:
+        Tuple[Any, ...]: results of the branches, in order
+    """
+    if capacity < 1 or batch_size < 1:
+        raise ValueError("capacity and batch_size must be positive")
+    stop = threading.Event()
+    runs: List[_BranchRun] = [_BranchRun(func, capacity, stop) for func in branches]
+    for run in runs:
+        run.thread.start()
+    try:
+        it = iter(iterable)
+        while True:
+            batch = list(islice(it, batch_size))
+            if not batch or all(run.done.is_set() for run in runs):
+                break
+            for run in runs:
+                run.put(batch)
+            if any(run.error is not None for run in runs):
+                break
+        if not any(run.error is not None for run in runs):
+            for run in runs:
+                run.put(_DONE)
+    finally:
+        stop.set()
+        for run in runs:
+            run.thread.join()
+    for run in runs:
+        if run.error is not None:
+            raise run.error
+    return tuple(run.result for run in runs)
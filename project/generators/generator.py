@@ -8,99 +8,1466 @@ from typing import (
     Generator,
     Tuple,
     Dict,
+    Optional,
 )
 from functools import reduce
+from itertools import chain, islice, takewhile
 import random
 
+import numpy as np
 
-def data_generator(
-    start: int = 0, end: int = 10, step: int = 1, data_type: str = "range"
+from project.generators.aggregators import Aggregator
+from project.generators.checkpoint import run_checkpointed
+from project.generators.fanout import Branch, fan_out
+from project.generators.joins import KeyFunc, build_side, join, known_length
+from project.generators.parallel import tree_reduce
+from project.generators.profiling import Profile, instrument
+from project.generators.sequences import (
+    LazyRange,
+    Number,
+    fibonacci_index,
+    fibonacci_range,
+    range_length,
+    shard,
+)
+from project.generators.sources import (
+    DEFAULT_READ_SIZE,
+    ByteRange,
+    LineSource,
+    RecordSource,
+)
+from project.generators.staged import StagedRun
+
+Step = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+Stage = Callable[[Iterable[Any]], Iterable[Any]]
+
+_FUSED_CACHE: Dict[Tuple[str, ...], Callable[..., Iterator[Any]]] = {}
+
+DEFAULT_CHUNK_SIZE = 1024
+
+_MISSING = object()
+
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+def spawn_seeds(seed: Seed, n: int) -> List[np.random.SeedSequence]:
+    """
+    Creates independent seeds for parallel random streams
+
+    Streams seeded with the results never overlap, and the whole set is
+    reproducible from the single parent seed.
+
+    Args:
+        seed (Seed): parent seed, None for fresh entropy
+        n (int): number of streams
+
+    Returns:
+        List[np.random.SeedSequence]: one seed per stream, for data_generator(seed=...)
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed.spawn(n)
+    return np.random.SeedSequence(seed).spawn(n)
+
+
+def _random_blocks(
+    start: int, end: int, count: int, seed: Seed, block_size: int, chunked: bool
 ) -> Generator[Any, None, None]:
+    """
+    Draws random integers from NumPy in blocks
+
+    Args:
+        start (int): smallest value
+        end (int): largest value + 1
+        count (int): number of values
+        seed (Seed): seed of the numpy.random.Generator
+        block_size (int): values drawn at once
+        chunked (bool): yield whole NumPy blocks instead of single values
+
+    Yields:
+        Generator[Any, None, None]: values or blocks
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    rng = np.random.default_rng(seed)
+    while count > 0:
+        block = rng.integers(start, end, size=min(block_size, count))
+        count -= len(block)
+        if chunked:
+            yield block
+        else:
+            yield from block.tolist()
+
+
+def _random_data(
+    start: int,
+    end: int,
+    step: int,
+    seed: Seed,
+    block_size: Optional[int],
+    chunked: bool,
+) -> Iterator[Any]:
+    """
+    Generates the values of the "random" mode of data_generator
+
+    Args:
+        start (int): lowest value
+        end (int): bound of the values, exclusive
+        step (int): divides the width of the interval into the number of values
+        seed (Seed): int or SeedSequence, None for the global generator
+        block_size (Optional[int]): draw values in NumPy blocks of this size
+        chunked (bool): yield whole NumPy blocks
+
+    Yields:
+        Iterator[Any]: random integers or NumPy blocks of them
+    """
+    count = (end - start) // step
+    if block_size is not None or chunked:
+        yield from _random_blocks(
+            start, end, count, seed, block_size or DEFAULT_CHUNK_SIZE, chunked
+        )
+        return
+    if isinstance(seed, np.random.SeedSequence):
+        seed = int(seed.generate_state(1)[0])
+    randint = random.Random(seed).randint if seed is not None else random.randint
+    for _ in range(count):
+        yield randint(start, end - 1)
+
+
+def data_generator(
+    start: Number = 0,
+    end: Number = 10,
+    step: Number = 1,
+    data_type: str = "range",
+    seed: Seed = None,
+    block_size: Optional[int] = None,
+    chunked: bool = False,
+    worker: Optional[Tuple[int, int]] = None,
+) -> Iterable[Any]:
     """
     Generates data based on specified parameters
 
-    Args:
-        start (int): Starting value for generation
-        end (int): Ending value for generation
-        step (int): Step size for generation
-        data_type (str): Type of data to generate ("range", "random", "fibonacci")
+    For "range", a LazyRange of start, start + step, ... below end is
+    returned: it supports len, indexing, slicing and split without
+    iterating, is backed by a range for integers and accepts float steps
+    without accumulating rounding errors.
+
+    For "random", (end - start) // step integers from [start, end) are
+    generated. With block_size or chunked they are drawn in blocks from a
+    numpy.random.Generator, which avoids a Python call per value; use
+    spawn_seeds to get reproducible independent streams for workers.
+
+    For "fibonacci", F(start), F(start + step), ... are generated while
+    they are below end; every number is computed by fast doubling and
+    stride jumps, so start can be a huge index.
+
+    worker=(i, n) keeps only the i-th of n contiguous shards of "range"
+    or "fibonacci".
+
+    Float bounds and steps are only meaningful for "range"; "random" and
+    "fibonacci" need integers.
+
+    Args:
+        start (Number): Starting value for generation
+        end (Number): Ending value for generation
+        step (Number): Step size for generation
+        data_type (str): Type of data to generate ("range", "random", "fibonacci")
+        seed (Seed): Seed of the "random" mode, int or SeedSequence. Defaults to None.
+        block_size (Optional[int]): Draw "random" values in NumPy blocks of this size. Defaults to None.
+        chunked (bool): Yield whole NumPy blocks in "random" mode. Defaults to False.
+        worker (Optional[Tuple[int, int]]): (worker, workers) shard of "range" or "fibonacci". Defaults to None.
+
+    Raises:
+        TypeError: if "random" or "fibonacci" data is given float arguments
+
+    Returns:
+        Iterable[Any]: Generated data values
+    """
+    if data_type == "range":
+        sequence = LazyRange(start, end, step)
+        if worker is not None:
+            positions = shard(range(range_length(start, end, step)), *worker)
+            sequence = sequence[positions.start : positions.stop]
+        return sequence
+    if data_type not in ("random", "fibonacci"):
+        return iter(())
+    if not (isinstance(start, int) and isinstance(end, int) and isinstance(step, int)):
+        raise TypeError(f'"{data_type}" data needs integer start, end and step')
+    if data_type == "random":
+        return _random_data(start, end, step, seed, block_size, chunked)
+    indices = range(start, max(fibonacci_index(end), start), step)
+    if worker is not None:
+        indices = shard(indices, *worker)
+    return fibonacci_range(indices.start, indices.stop, indices.step)
+
+
+def _chunks(iterable: Iterable[Any], chunk_size: int) -> Iterator[Any]:
+    """
+    Splits an iterable into chunks of at most chunk_size elements
+
+    NumPy arrays are sliced without copying, ranges and LazyRanges become
+    NumPy arrays, anything else is collected into lists.
+
+    Args:
+        iterable (Iterable[Any]): source data
+        chunk_size (int): maximum number of elements in a chunk
+
+    Yields:
+        Iterator[Any]: chunks of the source
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if isinstance(iterable, np.ndarray):
+        for i in range(0, len(iterable), chunk_size):
+            yield iterable[i : i + chunk_size]
+        return
+    if isinstance(iterable, range):
+        for i in range(0, len(iterable), chunk_size):
+            part = iterable[i : i + chunk_size]
+            yield np.arange(part.start, part.stop, part.step)
+        return
+    if isinstance(iterable, LazyRange):
+        for i in range(0, len(iterable), chunk_size):
+            yield iterable[i : i + chunk_size].to_numpy()
+        return
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _as_list(chunk: Any) -> List[Any]:
+    """
+    Converts a chunk to a list of plain Python objects
+
+    Args:
+        chunk (Any): list or NumPy array
+
+    Returns:
+        List[Any]: chunk elements
+    """
+    if isinstance(chunk, np.ndarray):
+        return chunk.tolist()
+    return chunk
+
+
+def _flatten(chunks: Iterable[Any]) -> Iterator[Any]:
+    """
+    Turns a stream of chunks back into a stream of elements
+
+    Args:
+        chunks (Iterable[Any]): lists or NumPy arrays
+
+    Returns:
+        Iterator[Any]: elements of all the chunks
+    """
+    return chain.from_iterable(map(_as_list, chunks))
+
+
+def _vmap_chunk(func: Callable[[Any], Any], chunk: Any) -> Any:
+    """
+    Applies a vectorized function to a whole chunk
+
+    Args:
+        func (Callable[[Any], Any]): function accepting a NumPy array
+        chunk (Any): list or NumPy array
+
+    Returns:
+        Any: transformed chunk
+    """
+    return func(np.asarray(chunk))
+
+
+def _vfilter_chunk(predicate: Callable[[Any], Any], chunk: Any) -> Any:
+    """
+    Keeps the chunk elements for which a vectorized predicate is true
+
+    Args:
+        predicate (Callable[[Any], Any]): function returning a boolean mask
+        chunk (Any): list or NumPy array
+
+    Returns:
+        Any: filtered chunk
+    """
+    array = np.asarray(chunk)
+    return array[np.asarray(predicate(array), dtype=bool)]
+
+
+def vmap(
+    func: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Vectorized map: applies func to NumPy arrays of chunk_size elements
+
+    Used as a step like map: pipe_step(vmap, np.sqrt)
+
+    Args:
+        func (Callable[[Any], Any]): function accepting and returning a NumPy array
+        iterable (Iterable[Any]): source data
+        chunk_size (int): number of elements per call. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        Iterator[Any]: transformed elements
+    """
+    return _flatten(_vmap_chunk(func, chunk) for chunk in _chunks(iterable, chunk_size))
+
+
+def vfilter(
+    predicate: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Vectorized filter: predicate gets a NumPy array and returns a boolean mask
+
+    Used as a step like filter: pipe_step(vfilter, is_positive)
+
+    Args:
+        predicate (Callable[[Any], Any]): function returning a boolean mask
+        iterable (Iterable[Any]): source data
+        chunk_size (int): number of elements per call. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        Iterator[Any]: elements for which the mask is true
+    """
+    return _flatten(
+        _vfilter_chunk(predicate, chunk) for chunk in _chunks(iterable, chunk_size)
+    )
+
+
+def _close(iterator: Iterable[Any]) -> None:
+    """
+    Closes an iterator that supports it: a generator, a StagedRun or an Operator run
+
+    Closing runs the finally blocks of the upstream generators, which
+    stops worker threads, cancels pool work and removes temporary files.
+    Plain iterables are left alone.
+
+    Args:
+        iterator (Iterable[Any]): iterator to close
+    """
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        close()
+
+
+def _borrowed(source: Iterable[Any]) -> Iterable[Any]:
+    """
+    Hides the close method of a source iterator owned by the caller
+
+    take, take_while and first close the iterator they read from, which
+    is right for the steps a Plan created but not for a generator, a file
+    or a StagedRun the caller passed in and may still use. Such a source
+    is read through islice, which has no close method; other sources are
+    returned as is.
+
+    Args:
+        source (Iterable[Any]): data given to a run
+
+    Returns:
+        Iterable[Any]: source that the run will not close
+    """
+    if isinstance(source, Iterator) and hasattr(source, "close"):
+        return islice(source, None)
+    return source
+
+
+def _closing(items: Iterator[Any], upstream: Iterable[Any]) -> Iterator[Any]:
+    """
+    Yields items and closes the upstream iterator as soon as they end
+
+    Args:
+        items (Iterator[Any]): limited view of the upstream iterator
+        upstream (Iterable[Any]): iterator to close
+
+    Yields:
+        Iterator[Any]: items
+    """
+    try:
+        yield from items
+    finally:
+        _close(upstream)
+
+
+def take(iterable: Iterable[Any], n: int) -> Iterator[Any]:
+    """
+    Yields the first n elements and stops the upstream steps
+
+    No element after the n-th is requested, and the upstream iterator is
+    closed right after it, so eager steps, threads and pools above stop
+    instead of running to the end. The source of a Plan run belongs to
+    the caller and is never closed.
+
+    Used as a step: pipe_step(take, 10)
+
+    Args:
+        iterable (Iterable[Any]): input elements
+        n (int): number of elements
+
+    Raises:
+        ValueError: if n is negative
+
+    Returns:
+        Iterator[Any]: at most n elements
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    it = iter(iterable)
+    return _closing(islice(it, n), it)
+
+
+def take_while(
+    iterable: Iterable[Any], predicate: Callable[[Any], Any]
+) -> Iterator[Any]:
+    """
+    Yields elements while the predicate holds and stops the upstream steps
+
+    Used as a step: pipe_step(take_while, is_small)
+
+    Args:
+        iterable (Iterable[Any]): input elements
+        predicate (Callable[[Any], Any]): condition to continue
+
+    Returns:
+        Iterator[Any]: elements before the first one failing the predicate
+    """
+    it = iter(iterable)
+    return _closing(takewhile(predicate, it), it)
+
+
+def _first(it: Iterator[Any], default: Any) -> Any:
+    """
+    Returns the first element of a run and closes the run
+
+    Args:
+        it (Iterator[Any]): processed data, from Plan.run
+        default (Any): value for an empty iterator, _MISSING to raise
+
+    Raises:
+        ValueError: if the iterator is empty and there is no default
+
+    Returns:
+        Any: first element or default
+    """
+    try:
+        for item in it:
+            return item
+    finally:
+        _close(it)
+    if default is _MISSING:
+        raise ValueError("first() of an empty stream with no default")
+    return default
+
+
+def _is_fusable(step: Step) -> bool:
+    """
+    Checks whether a step can be merged into a fused per-element loop
+
+    Args:
+        step (Step): (func, args, kwargs) triple
+
+    Returns:
+        bool: True for single-function map/filter steps
+    """
+    func, args, kwargs = step
+    return func in (map, filter) and len(args) == 1 and not kwargs
+
+
+def _fused_loop(shape: Tuple[str, ...]) -> Callable[..., Iterator[Any]]:
+    """
+    Generates (or takes from the cache) a single loop for a run of map/filter steps
+
+    Every element passes all the steps inside one generator frame, so the
+    per-element cost is one function call per step instead of one generator
+    switch per step.
+
+    Args:
+        shape (Tuple[str, ...]): "map", "filter" or "truth" (filter(None, ...)) per step
+
+    Returns:
+        Callable[..., Iterator[Any]]: generator function (iterable, *funcs)
+    """
+    loop = _FUSED_CACHE.get(shape)
+    if loop is not None:
+        return loop
+
+    params = ", ".join(f"f{i}" for i in range(len(shape)))
+    lines = [f"def fused(iterable, {params}):", "    for x in iterable:"]
+    for i, kind in enumerate(shape):
+        if kind == "map":
+            lines.append(f"        x = f{i}(x)")
+        elif kind == "filter":
+            lines.append(f"        if not f{i}(x):")
+            lines.append("            continue")
+        else:
+            lines.append("        if not x:")
+            lines.append("            continue")
+    lines.append("        yield x")
+
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    loop = namespace["fused"]
+    _FUSED_CACHE[shape] = loop
+    return loop
+
+
+def _fuse(steps: List[Step]) -> Callable[[Iterable[Any]], Iterator[Any]]:
+    """
+    Builds one stage out of consecutive map/filter steps
+
+    Args:
+        steps (List[Step]): fusable steps in pipeline order
+
+    Returns:
+        Callable[[Iterable[Any]], Iterator[Any]]: function from the input iterable to the fused iterator
+    """
+    shape = []
+    funcs = []
+    for func, args, _ in steps:
+        if func is filter and args[0] is None:
+            shape.append("truth")
+        else:
+            shape.append("map" if func is map else "filter")
+        funcs.append(args[0])
+    loop = _fused_loop(tuple(shape))
+
+    def stage(iterable: Iterable[Any]) -> Iterator[Any]:
+        return loop(iterable, *funcs)
+
+    return stage
+
+
+def _make_stage(step: Step) -> Stage:
+    """
+    Turns a single (unfused) step into a stage
+
+    Args:
+        step (Step): (func, args, kwargs) triple
+
+    Returns:
+        Stage: function from the input iterable to the output iterable
+    """
+    func, args, kwargs = step
+    if func == reduce:
+        options = dict(kwargs)
+        parallel = options.pop("parallel", False)
+        associative = options.pop("associative", False)
+        if parallel:
+            if not associative:
+                raise ValueError("parallel reduce requires associative=True")
+
+            def parallel_reduce_stage(iterable: Iterable[Any]) -> Iterable[Any]:
+                return iter([tree_reduce(args[0], iterable, *args[1:], **options)])
+
+            return parallel_reduce_stage
+
+        # The step arguments are forwarded as is, reduce's overloads cannot check them
+        reducer: Callable[..., Any] = func
+
+        def reduce_stage(iterable: Iterable[Any]) -> Iterable[Any]:
+            if len(args) < 2:
+                return iter([reducer(*args, iterable, **options)])
+            return iter([reducer(args[0], iterable, *args[1:], **options)])
+
+        return reduce_stage
+    if func in [filter, map, enumerate, vmap, vfilter]:
+        return lambda iterable: func(*args, iterable, **kwargs)
+    return lambda iterable: func(iterable, *args, **kwargs)
+
+
+def _callable_name(func: Any) -> str:
+    """
+    Returns a short readable name of a callable
+
+    Args:
+        func (Any): function, class or callable object
+
+    Returns:
+        str: its __name__, or the class name of callable objects
+    """
+    name = getattr(func, "__name__", None)
+    return name if name is not None else type(func).__name__
+
+
+def step_name(step: Step) -> str:
+    """
+    Returns a readable name of a step, e.g. "map(add_one)"
+
+    Args:
+        step (Step): (func, args, kwargs) triple
+
+    Returns:
+        str: name used in reports
+    """
+    func, args, _ = step
+    name = _callable_name(func)
+    if func in (map, filter, vmap, vfilter, reduce) and args:
+        return f"{name}({_callable_name(args[0])})"
+    return name
+
+
+def _is_chunkable(step: Step) -> bool:
+    """
+    Checks whether a step can work on whole chunks
+
+    Args:
+        step (Step): (func, args, kwargs) triple
+
+    Returns:
+        bool: True for vmap/vfilter and fusable map/filter steps
+    """
+    func, args, kwargs = step
+    if func in (vmap, vfilter):
+        return len(args) == 1 and not kwargs
+    return _is_fusable(step)
+
+
+def _chunk_stage(steps: List[Step], fuse: bool) -> Stage:
+    """
+    Builds a stage that maps a stream of chunks to a stream of chunks
+
+    Vectorized steps get the whole chunk as a NumPy array, map/filter
+    steps are run element by element over the chunk.
+
+    Args:
+        steps (List[Step]): chunkable steps, either one vectorized step or a map/filter run
+        fuse (bool): whether a map/filter run is fused into one loop
+
+    Returns:
+        Stage: function from chunks to chunks
+    """
+    func, args, _ = steps[0]
+    if func is vmap:
+        return lambda chunks: (_vmap_chunk(args[0], chunk) for chunk in chunks)
+    if func is vfilter:
+        return lambda chunks: (_vfilter_chunk(args[0], chunk) for chunk in chunks)
+
+    scalar: List[Stage] = [_fuse(steps)] if fuse else list(map(_make_stage, steps))
+
+    def run(chunk: Any) -> List[Any]:
+        it: Iterable[Any] = _as_list(chunk)
+        for stage in scalar:
+            it = stage(it)
+        return list(it)
+
+    return lambda chunks: map(run, chunks)
+
+
+def compile_steps(
+    steps: List[Step], fuse: bool = True, chunk_size: Optional[int] = None
+) -> List[Stage]:
+    """
+    Compiles pipeline steps into a list of stages
+
+    Consecutive map/filter steps are fused into a single generated loop,
+    every other step becomes a stage of its own. With chunk_size the
+    leading vmap/vfilter/map/filter steps run over chunks of the source,
+    and the stream is flattened back into elements after them.
+
+    Args:
+        steps (List[Step]): pipeline steps
+        fuse (bool): whether to fuse map/filter runs. Defaults to True.
+        chunk_size (Optional[int]): size of chunks, None for element mode. Defaults to None.
+
+    Returns:
+        List[Stage]: stages to be applied one after another
+    """
+    stages: List[Stage] = []
+    if chunk_size is not None:
+        size = chunk_size
+        count = 0
+        while count < len(steps) and _is_chunkable(steps[count]):
+            count += 1
+        if count:
+            stages.append(lambda iterable: _chunks(iterable, size))
+            group: List[Step] = []
+            for step in steps[:count]:
+                if step[0] in (vmap, vfilter):
+                    if group:
+                        stages.append(_chunk_stage(group, fuse))
+                        group = []
+                    stages.append(_chunk_stage([step], fuse))
+                else:
+                    group.append(step)
+            if group:
+                stages.append(_chunk_stage(group, fuse))
+            stages.append(_flatten)
+        steps = steps[count:]
+
+    run: List[Step] = []
+    for step in steps:
+        if fuse and _is_fusable(step):
+            run.append(step)
+            continue
+        if run:
+            stages.append(_fuse(run))
+            run = []
+        stages.append(_make_stage(step))
+    if run:
+        stages.append(_fuse(run))
+    return stages
+
+
+def _same_arg(first: Any, second: Any) -> bool:
+    """
+    Compares two step arguments
+
+    Arguments whose == does not give a bool, e.g. NumPy arrays, are equal
+    only if they are the same object.
+
+    Args:
+        first (Any): argument of one step
+        second (Any): argument of the other step
+
+    Returns:
+        bool: whether the arguments are equal
+    """
+    if first is second:
+        return True
+    try:
+        return bool(first == second)
+    except (TypeError, ValueError):
+        return False
+
+
+def _same_steps(first: Tuple[Any, ...], second: Tuple[Any, ...]) -> bool:
+    """
+    Compares frozen steps argument by argument
+
+    Args:
+        first (Tuple[Any, ...]): frozen (func, args, kwargs items) triples
+        second (Tuple[Any, ...]): frozen steps of the other plan
+
+    Returns:
+        bool: whether the steps are equal
+    """
+    if len(first) != len(second):
+        return False
+    for (func, args, kwargs), (other_func, other_args, other_kwargs) in zip(
+        first, second
+    ):
+        if func != other_func or len(args) != len(other_args):
+            return False
+        if [name for name, _ in kwargs] != [name for name, _ in other_kwargs]:
+            return False
+        values = list(args) + [value for _, value in kwargs]
+        other_values = list(other_args) + [value for _, value in other_kwargs]
+        if not all(map(_same_arg, values, other_values)):
+            return False
+    return True
+
+
+class Plan:
+    """
+    An immutable, hashable sequence of steps that can run against many sources
+
+    A plan is not bound to its data: the same plan can be applied to any
+    number of sources, from several threads at once, or sent to another
+    process (as long as its step functions are picklable). The steps are
+    compiled once per plan, on first use.
+
+    Attributes:
+        steps : Tuple[Step, ...]
+            Steps in the order they were added
+        fuse : bool
+            Whether consecutive map/filter steps are fused into one loop
+        chunk_size : Optional[int]
+            Number of elements moved at once by the leading vectorizable steps,
+            None to process elements one by one
+
+    Methods:
+        __init__(self, steps: Iterable[Step] = (), fuse: bool = True, chunk_size: Optional[int] = None)
+            Initialization of the plan
+
+        pipe_step(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> "Plan"
+            Returns a new plan with one more step
+
+        compile(self) -> List[Stage]
+            Returns the cached compiled stages
+
+        run(self, source: Iterable[Any]) -> Iterator[Any]
+            Applies the plan to a source
+
+        run_chunks(self, source: Iterable[Any]) -> Iterator[Any]
+            Applies the plan to a source and returns chunks
+
+        run_profiled(self, source: Iterable[Any]) -> Tuple[Iterator[Any], Profile]
+            Applies the plan to a source, recording per-step counters
+
+        run_staged(self, source: Iterable[Any], capacity: int = 64, batch_size: int = 1, group_size: int = 1) -> StagedRun
+            Applies the plan to a source with every group of stages in its own thread
+
+        aggregate(self, source: Iterable[Any], aggregator: Callable[..., Any] = list, *args: Any, **kwargs: Any) -> Any
+            Applies the plan to a source and aggregates the result
+
+        fan_out(self, source: Iterable[Any], *branches: Branch, capacity: int = 16, batch_size: int = 256) -> Tuple[Any, ...]
+            Applies the plan to a source once and feeds the result to several consumers
+
+        take(self, n: int) -> "Plan"
+            Returns a new plan that stops after n elements
+
+        take_while(self, predicate: Callable[[Any], Any]) -> "Plan"
+            Returns a new plan that stops at the first element failing the predicate
+
+        first(self, source: Iterable[Any], default: Any = _MISSING) -> Any
+            Applies the plan to a source and returns the first result only
+
+        run_checkpointed(self, source: Iterable[Any], path: str, aggregator: Callable[[], Aggregator], every: int = 10_000) -> Any
+            Aggregates the result of the plan, saving progress so a failed run can resume
+
+        join(self, other: Iterable[Any], left_key: KeyFunc, right_key: Optional[KeyFunc] = None, how: str = "inner", algorithm: str = "hash", build: Optional[str] = None) -> "Plan"
+            Returns a new plan that joins the stream with another one by key
+    """
+
+    __slots__ = ("_steps", "_fuse", "_chunk_size", "_key", "_stages")
+
+    _steps: Tuple[Tuple[Callable[..., Any], Tuple[Any, ...], Tuple[Any, ...]], ...]
+    _fuse: bool
+    _chunk_size: Optional[int]
+    _key: Tuple[Any, ...]
+    _stages: Optional[List[Stage]]
+
+    def __init__(
+        self,
+        steps: Iterable[Step] = (),
+        fuse: bool = True,
+        chunk_size: Optional[int] = None,
+    ):
+        """
+        Initialization of the plan
+
+        Args:
+            steps (Iterable[Step]): (func, args, kwargs) triples. Defaults to ().
+            fuse (bool): fuse consecutive map/filter steps. Defaults to True.
+            chunk_size (Optional[int]): run vectorizable steps over chunks of this size. Defaults to None.
+        """
+        frozen = tuple(
+            (func, tuple(args), tuple(sorted(kwargs.items())))
+            for func, args, kwargs in steps
+        )
+        object.__setattr__(self, "_steps", frozen)
+        object.__setattr__(self, "_fuse", fuse)
+        object.__setattr__(self, "_chunk_size", chunk_size)
+        object.__setattr__(self, "_key", (frozen, fuse, chunk_size))
+        object.__setattr__(self, "_stages", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Plan is immutable, use pipe_step to get a new plan")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return Plan, (self.steps, self._fuse, self._chunk_size)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Plan):
+            return NotImplemented
+        try:
+            return bool(self._key == other._key)
+        except (TypeError, ValueError):
+            # Some step arg (a NumPy array) does not compare to a bool:
+            # compare the steps one arg at a time instead
+            return (
+                self._fuse == other._fuse
+                and self._chunk_size == other._chunk_size
+                and _same_steps(self._steps, other._steps)
+            )
+
+    def __hash__(self) -> int:
+        try:
+            return hash(self._key)
+        except TypeError:
+            # Some step has unhashable args (a list, a dict): hash what
+            # equal plans share anyway, so the plan still works as a key
+            funcs = tuple(func for func, _, _ in self._steps)
+            return hash((funcs, self._fuse, self._chunk_size))
+
+    def __len__(self) -> int:
+        return len(self._steps)
 
-    Yields:
-        Generator[Any, None, None]: Generated data values
-    """
-    if data_type == "range":
-        current = start
-        while current < end:
-            yield current
-            current += step
-    elif data_type == "random":
-        for _ in range((end - start) // step):
-            yield random.randint(start, end - 1)
-    elif data_type == "fibonacci":
-        a, b = 0, 1
-        while a < end:
-            yield a
-            a, b = b, a + b
+    def __repr__(self) -> str:
+        names = ", ".join(
+            getattr(func, "__name__", repr(func)) for func, _, _ in self._steps
+        )
+        return f"Plan([{names}])"
+
+    @property
+    def steps(self) -> Tuple[Step, ...]:
+        return tuple((func, args, dict(kwargs)) for func, args, kwargs in self._steps)
+
+    @property
+    def fuse(self) -> bool:
+        return self._fuse
+
+    @property
+    def chunk_size(self) -> Optional[int]:
+        return self._chunk_size
+
+    def pipe_step(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> "Plan":
+        """
+        Returns a new plan with one more step
+
+        Args:
+            func (Callable[..., Any]): input function
+
+        Returns:
+            Plan: new plan, the current one is left unchanged
+        """
+        return Plan(self.steps + ((func, args, kwargs),), self._fuse, self._chunk_size)
+
+    def compile(self) -> List[Stage]:
+        """
+        Returns the compiled stages, compiling the steps on first use
+
+        Returns:
+            List[Stage]: stages to be applied one after another
+        """
+        stages = self._stages
+        if stages is None:
+            stages = compile_steps(list(self.steps), self._fuse, self._chunk_size)
+            object.__setattr__(self, "_stages", stages)
+        return stages
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Applies the plan to a source
+
+        A take or take_while step closes the steps above it as soon as it
+        is done, but never the source: a generator or file passed in stays
+        open, so the caller can go on reading it.
+
+        Args:
+            source (Iterable[Any]): data to process
+
+        Returns:
+            Iterator[Any]: iterator over processed data
+        """
+        it = _borrowed(source)
+        for stage in self.compile():
+            it = stage(it)
+        return iter(it)
+
+    def run_chunks(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Applies the plan to a source and returns the result in chunks
+
+        When every step works on chunks the result is never flattened into
+        single elements, so chunk-level aggregation (e.g. summing NumPy
+        arrays) avoids per-element interpreter overhead entirely.
+
+        Args:
+            source (Iterable[Any]): data to process
+
+        Raises:
+            ValueError: if the plan has no chunk_size
+
+        Returns:
+            Iterator[Any]: iterator over lists or NumPy arrays
+        """
+        if self._chunk_size is None:
+            raise ValueError("run_chunks requires chunk_size")
+        stages = self.compile()
+        it = _borrowed(source)
+        if stages and stages[-1] is _flatten:
+            for stage in stages[:-1]:
+                it = stage(it)
+            return iter(it)
+        for stage in stages:
+            it = stage(it)
+        return _chunks(it, self._chunk_size)
+
+    def run_profiled(self, source: Iterable[Any]) -> Tuple[Iterator[Any], Profile]:
+        """
+        Applies the plan to a source, recording per-step counters
+
+        Every step runs as a separate stage (no fusion, no chunking) so its
+        elements in/out, wall and CPU time can be attributed to it. The
+        profile is filled while the returned iterator is consumed. As with
+        run, take and first stop the steps but leave the source open.
+
+        Args:
+            source (Iterable[Any]): data to process
+
+        Returns:
+            Tuple[Iterator[Any], Profile]: iterator over processed data and its report
+        """
+        steps = self.steps
+        profile = Profile(
+            [step_name(step) for step in steps],
+            ["filter" if func in (filter, vfilter) else "step" for func, _, _ in steps],
+        )
+        stages = [_make_stage(step) for step in steps]
+        return instrument(_borrowed(source), stages, profile), profile
+
+    def run_staged(
+        self,
+        source: Iterable[Any],
+        capacity: int = 64,
+        batch_size: int = 1,
+        group_size: int = 1,
+    ) -> StagedRun:
+        """
+        Applies the plan to a source with every group of stages in its own thread
+
+        The source and the groups are connected by bounded queues, so a fast
+        producer is slowed down to the pace of the slowest stage instead of
+        buffering without limit. Queue depth and stall times are available
+        in the metrics of the returned run.
+
+        Args:
+            source (Iterable[Any]): data to process
+            capacity (int): maximum number of batches per queue. Defaults to 64.
+            batch_size (int): elements moved through a queue at once. Defaults to 1.
+            group_size (int): compiled stages per worker. Defaults to 1.
+
+        Raises:
+            ValueError: if capacity, batch_size or group_size is not positive
+
+        Returns:
+            StagedRun: iterator over processed data with queue metrics
+        """
+        if group_size < 1:
+            raise ValueError("group_size must be positive")
+        stages = self.compile()
+        groups = [stages[i : i + group_size] for i in range(0, len(stages), group_size)]
+        return StagedRun(source, groups, capacity, batch_size)
+
+    def aggregate(
+        self,
+        source: Iterable[Any],
+        aggregator: Callable[..., Any] = list,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Applies the plan to a source and aggregates the result
+
+        Args:
+            source (Iterable[Any]): data to process
+            aggregator (Callable[..., Any], optional): aggregator, called with the results and args. Defaults to list.
+            *args (Any): extra positional arguments of the aggregator
+            **kwargs (Any): keyword arguments of the aggregator
+
+        Returns:
+            Any: Aggregated data
+        """
+        return aggregator(self.run(source), *args, **kwargs)
+
+    def fan_out(
+        self,
+        source: Iterable[Any],
+        *branches: Branch,
+        capacity: int = 16,
+        batch_size: int = 256,
+    ) -> Tuple[Any, ...]:
+        """
+        Applies the plan to a source once and feeds the result to several consumers
+
+        Args:
+            source (Iterable[Any]): data to process
+            *branches (Branch): consumers of the processed stream, e.g. sum
+            capacity (int): maximum number of batches queued per branch. Defaults to 16.
+            batch_size (int): elements moved through a queue at once. Defaults to 256.
+
+        Returns:
+            Tuple[Any, ...]: results of the branches, in order
+        """
+        return fan_out(
+            self.run(source), *branches, capacity=capacity, batch_size=batch_size
+        )
+
+    def take(self, n: int) -> "Plan":
+        """
+        Returns a new plan that stops after n elements
+
+        Args:
+            n (int): number of elements
+
+        Returns:
+            Plan: extended plan
+        """
+        return self.pipe_step(take, n)
+
+    def take_while(self, predicate: Callable[[Any], Any]) -> "Plan":
+        """
+        Returns a new plan that stops at the first element failing the predicate
+
+        Args:
+            predicate (Callable[[Any], Any]): condition to continue
+
+        Returns:
+            Plan: extended plan
+        """
+        return self.pipe_step(take_while, predicate)
+
+    def first(self, source: Iterable[Any], default: Any = _MISSING) -> Any:
+        """
+        Applies the plan to a source and returns the first result only
+
+        Only the work needed for one result is done; the run is closed
+        right after it, the source is left open.
+
+        Args:
+            source (Iterable[Any]): data to process
+            default (Any): value returned when there are no results
+
+        Raises:
+            ValueError: if there are no results and no default
+
+        Returns:
+            Any: first result or default
+        """
+        return _first(self.run(source), default)
+
+    def run_checkpointed(
+        self,
+        source: Iterable[Any],
+        path: str,
+        aggregator: Callable[[], Aggregator],
+        every: int = 10_000,
+    ) -> Any:
+        """
+        Aggregates the result of the plan, saving progress so a failed run can resume
+
+        The source offset, the states of the steps and the partial
+        aggregate are saved to path every every elements. Running the same
+        plan again with the same path resumes from the last checkpoint, and
+        every element is counted in the result exactly once. Steps run one
+        element at a time, without fusion or chunking; only map, filter,
+        enumerate, reduce and Operator steps (windows, group-by, sort) are
+        supported.
+
+        Args:
+            source (Iterable[Any]): data to process, the same on every run
+            path (str): checkpoint file
+            aggregator (Callable[[], Aggregator]): creates the final aggregator
+            every (int): source elements between checkpoints. Defaults to 10_000.
+
+        Raises:
+            ValueError: if a step cannot be checkpointed or the checkpoint
+                belongs to another plan
+
+        Returns:
+            Any: aggregated result
+        """
+        steps = list(self.steps)
+        names = [step_name(step) for step in steps]
+        return run_checkpointed(steps, names, source, path, aggregator, every)
+
+    def join(
+        self,
+        other: Iterable[Any],
+        left_key: KeyFunc,
+        right_key: Optional[KeyFunc] = None,
+        how: str = "inner",
+        algorithm: str = "hash",
+        build: Optional[str] = None,
+    ) -> "Plan":
+        """
+        Returns a new plan that joins the stream with another one by key
+
+        A plan does not know the length of the stream it will run on, so
+        unless build is given the hash join holds the other side in memory,
+        or this stream if it turns out to be sized and shorter.
+
+        Args:
+            other (Iterable[Any]): right rows, e.g. another Pipeline
+            left_key (KeyFunc): join key of a row of this stream
+            right_key (Optional[KeyFunc]): join key of a right row. Defaults to left_key.
+            how (str): "inner" or "left". Defaults to "inner".
+            algorithm (str): "hash", or "merge" for inputs sorted by key. Defaults to "hash".
+            build (Optional[str]): side the hash join holds in memory, "left" or "right". Defaults to None.
+
+        Returns:
+            Plan: extended plan producing (row, right_row) pairs
+        """
+        return self.pipe_step(join, other, left_key, right_key, how, algorithm, build)
 
 
 class Pipeline:
     """
     A class for lazy data processing
 
+    A Pipeline is a Plan bound to one data source. pipe_step replaces the
+    plan with an extended one, the plan itself is never mutated.
+
     Attributes:
         data : Iterable[Any]
             Source iterable data
+        plan : Plan
+            Steps to be performed over the data
+        instrument : bool
+            Whether iteration records per-step counters
+        profile : Optional[Profile]
+            Report of the last instrumented iteration
 
     Methods:
-        __init__(self, data: Iterable[Any])
+        __init__(self, data: Iterable[Any], fuse: bool = True, chunk_size: Optional[int] = None, instrument: bool = False)
             Initialization of data
 
+        from_file(cls, path: str, byte_range: Optional[ByteRange] = None, encoding: Optional[str] = "utf-8", read_size: int = DEFAULT_READ_SIZE, **kwargs: Any) -> "Pipeline"
+            Pipeline over the lines of a file, read in large chunks
+
+        from_mmap(cls, path: str, byte_range: Optional[ByteRange] = None, encoding: Optional[str] = "utf-8", read_size: int = DEFAULT_READ_SIZE, **kwargs: Any) -> "Pipeline"
+            Pipeline over the lines of a memory-mapped file
+
+        from_binary_records(cls, path: str, struct_fmt: str, byte_range: Optional[ByteRange] = None, read_size: int = DEFAULT_READ_SIZE, use_mmap: bool = False, **kwargs: Any) -> "Pipeline"
+            Pipeline over fixed-size binary records of a file
+
+        compile(self) -> List[Stage]
+            Returns the cached compiled stages
+
         __iter__(self) -> Iterator[Any]
             Returns iterator over processed data
 
+        iter_chunks(self) -> Iterator[Any]
+            Returns iterator over chunks of processed data
+
+        run_staged(self, capacity: int = 64, batch_size: int = 1, group_size: int = 1) -> StagedRun
+            Returns iterator over processed data with stages running in threads
+
         def pipe_step(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> "Pipeline"
             Add a step to the Pipeline
 
         def aggregate(
             self,
-            aggregator: Callable[[Iterable[Any]], Any] = list,
+            aggregator: Callable[..., Any] = list,
             *args: Any,
             **kwargs: Any
         ) -> Any
             Aggregates data into an aggregator
+
+        fan_out(self, *branches: Branch, capacity: int = 16, batch_size: int = 256) -> Tuple[Any, ...]
+            Feeds processed data to several consumers in one pass
+
+        take(self, n: int) -> "Pipeline"
+            Stops the pipeline after n elements
+
+        take_while(self, predicate: Callable[[Any], Any]) -> "Pipeline"
+            Stops the pipeline at the first element failing the predicate
+
+        first(self, default: Any = _MISSING) -> Any
+            Returns the first processed element only
+
+        run_checkpointed(self, path: str, aggregator: Callable[[], Aggregator], every: int = 10_000) -> Any
+            Aggregates processed data, saving progress so a failed run can resume
+
+        join(self, other: Iterable[Any], left_key: KeyFunc, right_key: Optional[KeyFunc] = None, how: str = "inner", algorithm: str = "hash", build: Optional[str] = None) -> "Pipeline"
+            Joins processed data with another stream by key
     """
 
-    def __init__(self, data: Iterable[Any]):
+    def __init__(
+        self,
+        data: Iterable[Any],
+        fuse: bool = True,
+        chunk_size: Optional[int] = None,
+        instrument: bool = False,
+    ):
         """
         Initialization of data
 
         Args:
             data (Iterable[Any]): Data
+            fuse (bool): fuse consecutive map/filter steps. Defaults to True.
+            chunk_size (Optional[int]): run vectorizable steps over chunks of this size. Defaults to None.
+            instrument (bool): record per-step counters into profile. Defaults to False.
         """
         self.data = data
-        self.steps: List[
-            Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
-        ] = []
+        self.plan = Plan(fuse=fuse, chunk_size=chunk_size)
+        self.instrument = instrument
+        self.profile: Optional[Profile] = None
+        self._consumed = False
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        byte_range: Optional[ByteRange] = None,
+        encoding: Optional[str] = "utf-8",
+        read_size: int = DEFAULT_READ_SIZE,
+        **kwargs: Any,
+    ) -> "Pipeline":
+        """
+        Creates a pipeline over the lines of a file, read in large chunks
+
+        The lines come without the trailing newline. Pass a range from
+        partition_file to process only the lines starting in it.
+
+        Args:
+            path (str): path of the file
+            byte_range (Optional[ByteRange]): (start, end) bytes to read. Defaults to the whole file.
+            encoding (Optional[str]): text encoding, None for bytes. Defaults to "utf-8".
+            read_size (int): bytes read at once. Defaults to DEFAULT_READ_SIZE.
+            **kwargs (Any): fuse, chunk_size and instrument of the pipeline
+
+        Returns:
+            Pipeline: pipeline over a re-iterable LineSource
+        """
+        start, end = byte_range if byte_range is not None else (0, None)
+        return cls(LineSource(path, start, end, encoding, read_size), **kwargs)
+
+    @classmethod
+    def from_mmap(
+        cls,
+        path: str,
+        byte_range: Optional[ByteRange] = None,
+        encoding: Optional[str] = "utf-8",
+        read_size: int = DEFAULT_READ_SIZE,
+        **kwargs: Any,
+    ) -> "Pipeline":
+        """
+        Creates a pipeline over the lines of a memory-mapped file
+
+        Same as from_file, but the chunks are sliced from an mmap, so no
+        read call is made at all.
+
+        Args:
+            path (str): path of the file
+            byte_range (Optional[ByteRange]): (start, end) bytes to read. Defaults to the whole file.
+            encoding (Optional[str]): text encoding, None for bytes. Defaults to "utf-8".
+            read_size (int): bytes split at once. Defaults to DEFAULT_READ_SIZE.
+            **kwargs (Any): fuse, chunk_size and instrument of the pipeline
+
+        Returns:
+            Pipeline: pipeline over a re-iterable LineSource
+        """
+        start, end = byte_range if byte_range is not None else (0, None)
+        source = LineSource(path, start, end, encoding, read_size, use_mmap=True)
+        return cls(source, **kwargs)
+
+    @classmethod
+    def from_binary_records(
+        cls,
+        path: str,
+        struct_fmt: str,
+        byte_range: Optional[ByteRange] = None,
+        read_size: int = DEFAULT_READ_SIZE,
+        use_mmap: bool = False,
+        **kwargs: Any,
+    ) -> "Pipeline":
+        """
+        Creates a pipeline over fixed-size binary records of a file
+
+        Every record is a tuple unpacked with the struct format; whole
+        chunks are unpacked at once.
+
+        Args:
+            path (str): path of the file
+            struct_fmt (str): struct format of one record, e.g. "<qd"
+            byte_range (Optional[ByteRange]): (start, end) bytes to read. Defaults to the whole file.
+            read_size (int): bytes read at once. Defaults to DEFAULT_READ_SIZE.
+            use_mmap (bool): read through a memory map. Defaults to False.
+            **kwargs (Any): fuse, chunk_size and instrument of the pipeline
+
+        Returns:
+            Pipeline: pipeline over a re-iterable RecordSource
+        """
+        start, end = byte_range if byte_range is not None else (0, None)
+        source = RecordSource(path, struct_fmt, start, end, read_size, use_mmap)
+        return cls(source, **kwargs)
+
+    @property
+    def steps(self) -> Tuple[Step, ...]:
+        """
+        Returns the steps of the current plan
+
+        The steps are a snapshot: use pipe_step to add a step.
+
+        Returns:
+            Tuple[Step, ...]: (func, args, kwargs) triples
+        """
+        return self.plan.steps
+
+    @property
+    def fuse(self) -> bool:
+        return self.plan.fuse
+
+    @property
+    def chunk_size(self) -> Optional[int]:
+        return self.plan.chunk_size
+
+    def compile(self) -> List[Stage]:
+        """
+        Returns the compiled stages of the current plan
+
+        Returns:
+            List[Stage]: stages to be applied one after another
+        """
+        return self.plan.compile()
+
+    def _stream_length(self) -> Optional[int]:
+        """
+        Returns the number of processed rows if it is known without iterating
+
+        Returns:
+            Optional[int]: length of the data while the plan has no steps,
+                None if the data is not sized or a step may change it
+        """
+        return known_length(self.data) if len(self.plan) == 0 else None
+
+    def _source(self) -> Iterable[Any]:
+        """
+        Returns the data, refusing to reuse a one-shot iterator
+
+        Raises:
+            RuntimeError: if the data is an iterator that was already used
+
+        Returns:
+            Iterable[Any]: source data
+        """
+        if iter(self.data) is self.data:
+            if self._consumed:
+                raise RuntimeError(
+                    "Pipeline source is a one-shot iterator that was already used, "
+                    "use Plan.run to apply the steps to a new source"
+                )
+            self._consumed = True
+        return self.data
 
     def __iter__(self) -> Iterator[Any]:
         """
         Performs all the steps
 
+        With instrument=True a fresh report is stored in profile and filled
+        while the iterator is consumed.
+
         Returns:
             Iterator[Any]: iterator over processed data
         """
-        it = self.data
-        for func, args, kwargs in self.steps:
-            if func == reduce:
-                if len(args) < 2:
-                    it = iter([func(*args, it, **kwargs)])
-                else:
-                    it = iter([func(args[0], it, *args[1:], **kwargs)])
-            elif func in [filter, map, enumerate]:
-                it = func(*args, it, **kwargs)
-            else:
-                it = func(it, *args, **kwargs)
-        return iter(it)
+        if self.instrument:
+            it, self.profile = self.plan.run_profiled(self._source())
+            return it
+        return self.plan.run(self._source())
+
+    def iter_chunks(self) -> Iterator[Any]:
+        """
+        Performs all the steps and returns the result in chunks
+
+        Raises:
+            ValueError: if the pipeline has no chunk_size
+
+        Returns:
+            Iterator[Any]: iterator over lists or NumPy arrays
+        """
+        return self.plan.run_chunks(self._source())
+
+    def run_staged(
+        self, capacity: int = 64, batch_size: int = 1, group_size: int = 1
+    ) -> StagedRun:
+        """
+        Performs all the steps with stages running in threads connected by bounded queues
+
+        Args:
+            capacity (int): maximum number of batches per queue. Defaults to 64.
+            batch_size (int): elements moved through a queue at once. Defaults to 1.
+            group_size (int): compiled stages per worker. Defaults to 1.
+
+        Returns:
+            StagedRun: iterator over processed data with queue metrics
+        """
+        return self.plan.run_staged(self._source(), capacity, batch_size, group_size)
 
     def pipe_step(
         self, func: Callable[..., Any], *args: Any, **kwargs: Any
@@ -114,22 +1481,149 @@ class Pipeline:
         Returns:
             Pipeline: self object
         """
-        self.steps.append((func, args, kwargs))
+        self.plan = self.plan.pipe_step(func, *args, **kwargs)
         return self
 
     def aggregate(
         self,
-        aggregator: Callable[[Iterable[Any]], Any] = list,
+        aggregator: Callable[..., Any] = list,
         *args: Any,
-        **kwargs: Any
+        **kwargs: Any,
     ) -> Any:
         """
         Aggregates data into an aggregator
 
         Args:
-            aggregator (Callable[[Iterable[Any]], Any], optional): aggrefator. Defaults to list.
+            aggregator (Callable[..., Any], optional): aggregator, called with the data and args. Defaults to list.
+            *args (Any): extra positional arguments of the aggregator
+            **kwargs (Any): keyword arguments of the aggregator
 
         Returns:
             Any: Aggregated data
         """
         return aggregator(self.__iter__(), *args, **kwargs)
+
+    def fan_out(
+        self, *branches: Branch, capacity: int = 16, batch_size: int = 256
+    ) -> Tuple[Any, ...]:
+        """
+        Feeds processed data to several consumers in one pass
+
+        The source and the steps run once; every branch gets the whole
+        stream through its own bounded queue.
+
+        Args:
+            *branches (Branch): consumers of the processed stream, e.g. sum
+            capacity (int): maximum number of batches queued per branch. Defaults to 16.
+            batch_size (int): elements moved through a queue at once. Defaults to 256.
+
+        Returns:
+            Tuple[Any, ...]: results of the branches, in order
+        """
+        return fan_out(
+            self.__iter__(), *branches, capacity=capacity, batch_size=batch_size
+        )
+
+    def take(self, n: int) -> "Pipeline":
+        """
+        Stops the pipeline after n elements
+
+        Args:
+            n (int): number of elements
+
+        Returns:
+            Pipeline: self object
+        """
+        return self.pipe_step(take, n)
+
+    def take_while(self, predicate: Callable[[Any], Any]) -> "Pipeline":
+        """
+        Stops the pipeline at the first element failing the predicate
+
+        Args:
+            predicate (Callable[[Any], Any]): condition to continue
+
+        Returns:
+            Pipeline: self object
+        """
+        return self.pipe_step(take_while, predicate)
+
+    def first(self, default: Any = _MISSING) -> Any:
+        """
+        Returns the first processed element only
+
+        The steps run just far enough to produce one element, then the
+        iteration is closed; the data of the pipeline is left open.
+
+        Args:
+            default (Any): value returned when there are no elements
+
+        Raises:
+            ValueError: if there are no elements and no default
+
+        Returns:
+            Any: first element or default
+        """
+        return _first(self.__iter__(), default)
+
+    def run_checkpointed(
+        self, path: str, aggregator: Callable[[], Aggregator], every: int = 10_000
+    ) -> Any:
+        """
+        Aggregates processed data, saving progress so a failed run can resume
+
+        See Plan.run_checkpointed. The source is taken as is, so it has to
+        be re-iterable (a list, a LazyRange, a file source) to be read
+        again by the resumed run.
+
+        Args:
+            path (str): checkpoint file
+            aggregator (Callable[[], Aggregator]): creates the final aggregator
+            every (int): source elements between checkpoints. Defaults to 10_000.
+
+        Returns:
+            Any: aggregated result
+        """
+        return self.plan.run_checkpointed(self.data, path, aggregator, every)
+
+    def join(
+        self,
+        other: Iterable[Any],
+        left_key: KeyFunc,
+        right_key: Optional[KeyFunc] = None,
+        how: str = "inner",
+        algorithm: str = "hash",
+        build: Optional[str] = None,
+    ) -> "Pipeline":
+        """
+        Joins processed data with another stream by key
+
+        The hash join keeps one stream in memory and streams the other
+        one; the merge join expects both streams sorted by key and keeps
+        neither. Rows are paired as (row, right_row); with how="left" rows
+        without a match get None.
+
+        Unless build is given, the hash join holds the shorter stream in
+        memory when both lengths are known: a pipeline knows its length
+        while it has no steps and its data is sized, e.g. a list or a
+        LazyRange. Otherwise the other stream is held.
+
+        Args:
+            other (Iterable[Any]): right rows, e.g. another Pipeline
+            left_key (KeyFunc): join key of a row of this pipeline
+            right_key (Optional[KeyFunc]): join key of a right row. Defaults to left_key.
+            how (str): "inner" or "left". Defaults to "inner".
+            algorithm (str): "hash", or "merge" for inputs sorted by key. Defaults to "hash".
+            build (Optional[str]): side the hash join holds in memory, "left" or "right". Defaults to None.
+
+        Returns:
+            Pipeline: self object
+        """
+        if build is None and algorithm == "hash":
+            other_length = (
+                other._stream_length()
+                if isinstance(other, Pipeline)
+                else known_length(other)
+            )
+            build = build_side(self._stream_length(), other_length)
+        return self.pipe_step(join, other, left_key, right_key, how, algorithm, build)
@@ -0,0 +1,304 @@
+from collections.abc import Sized
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from project.generators.sequences import LazyRange
+
+KeyFunc = Callable[[Any], Any]
+
+JOIN_TYPES = ("inner", "left")
+
+_END = object()
+
+
+def _check_how(how: str) -> None:
+    """
+    Checks the join type
+
+    Args:
+        how (str): "inner" or "left"
+
+    Raises:
+        ValueError: if the join type is unknown
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"how must be one of {JOIN_TYPES}, got {how!r}")
+
+
+def known_length(iterable: Iterable[Any]) -> Optional[int]:
+    """
+    Returns the length of a sized iterable without iterating it
+
+    Args:
+        iterable (Iterable[Any]): data
+
+    Returns:
+        Optional[int]: length, None if unknown
+    """
+    if isinstance(iterable, LazyRange):
+        return iterable.length
+    return len(iterable) if isinstance(iterable, Sized) else None
+
+
+def build_side(left_length: Optional[int], right_length: Optional[int]) -> str:
+    """
+    Chooses the side a hash join holds in memory
+
+    Args:
+        left_length (Optional[int]): number of left rows, None if unknown
+        right_length (Optional[int]): number of right rows, None if unknown
+
+    Returns:
+        str: "left" if both lengths are known and the left one is smaller,
+            "right" otherwise
+    """
+    if left_length is not None and right_length is not None:
+        if left_length < right_length:
+            return "left"
+    return "right"
+
+
+def _build(rows: Iterable[Any], key: KeyFunc) -> Dict[Any, List[Any]]:
+    """
+    Builds the hash table of a join side
+
+    Args:
+        rows (Iterable[Any]): rows of the build side
+        key (KeyFunc): join key of a row
+
+    Returns:
+        Dict[Any, List[Any]]: rows by key, in their original order
+    """
+    table: Dict[Any, List[Any]] = {}
+    for row in rows:
+        table.setdefault(key(row), []).append(row)
+    return table
+
+
+def hash_join(
+    left: Iterable[Any],
+    right: Iterable[Any],
+    left_key: KeyFunc,
+    right_key: KeyFunc,
+    how: str = "inner",
+    build: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Joins two streams through a hash table of one of them
+
+    Only the build side is held in memory; the other side is streamed.
+    By default the right side is built, unless both sides have a length
+    and the left one is smaller. Building the right side keeps the order
+    of the left stream; building the left side emits pairs in the order
+    of the right stream, followed by the unmatched left rows of a left
+    join.
+
+    Args:
+        left (Iterable[Any]): left rows
+        right (Iterable[Any]): right rows
+        left_key (KeyFunc): join key of a left row
+        right_key (KeyFunc): join key of a right row
+        how (str): "inner" or "left". Defaults to "inner".
+        build (Optional[str]): side to hold in memory, "left" or "right". Defaults to None (smaller one).
+
+    Raises:
+        ValueError: if how or build is unknown
+
+    Returns:
+        Iterator[Any]: (left_row, right_row) pairs, right_row is None for
+            unmatched rows of a left join
+    """
+    _check_how(how)
+    if build is None:
+        build = build_side(known_length(left), known_length(right))
+    if build == "right":
+        return _probe_left(left, right, left_key, right_key, how)
+    if build == "left":
+        return _probe_right(left, right, left_key, right_key, how)
+    raise ValueError(f"build must be 'left' or 'right', got {build!r}")
+
+
+def _probe_left(
+    left: Iterable[Any],
+    right: Iterable[Any],
+    left_key: KeyFunc,
+    right_key: KeyFunc,
+    how: str,
+) -> Iterator[Any]:
+    """
+    Hash join with the right side in memory
+
+    Yields:
+        Iterator[Any]: (left_row, right_row) pairs in left order
+    """
+    table = _build(right, right_key)
+    outer = how == "left"
+    for row in left:
+        matches = table.get(left_key(row))
+        if matches:
+            for match in matches:
+                yield row, match
+        elif outer:
+            yield row, None
+
+
+def _probe_right(
+    left: Iterable[Any],
+    right: Iterable[Any],
+    left_key: KeyFunc,
+    right_key: KeyFunc,
+    how: str,
+) -> Iterator[Any]:
+    """
+    Hash join with the left side in memory
+
+    Yields:
+        Iterator[Any]: (left_row, right_row) pairs in right order, then the
+            unmatched left rows of a left join
+    """
+    table = _build(left, left_key)
+    matched: Set[Any] = set()
+    for match in right:
+        key = right_key(match)
+        rows = table.get(key)
+        if rows:
+            matched.add(key)
+            for row in rows:
+                yield row, match
+    if how == "left":
+        for key, rows in table.items():
+            if key not in matched:
+                for row in rows:
+                    yield row, None
+
+
+def merge_join(
+    left: Iterable[Any],
+    right: Iterable[Any],
+    left_key: KeyFunc,
+    right_key: KeyFunc,
+    how: str = "inner",
+) -> Iterator[Any]:
+    """
+    Joins two streams sorted by their keys in ascending order
+
+    Both sides are streamed; only the right rows sharing the current key
+    are buffered, so memory does not depend on the stream lengths. Use
+    the sort step first if an input is not sorted.
+
+    Args:
+        left (Iterable[Any]): left rows sorted by left_key
+        right (Iterable[Any]): right rows sorted by right_key
+        left_key (KeyFunc): join key of a left row
+        right_key (KeyFunc): join key of a right row
+        how (str): "inner" or "left". Defaults to "inner".
+
+    Raises:
+        ValueError: if how is unknown or an input is not sorted
+
+    Returns:
+        Iterator[Any]: (left_row, right_row) pairs in left order
+    """
+    _check_how(how)
+    return _merge_join(iter(left), iter(right), left_key, right_key, how == "left")
+
+
+def _merge_join(
+    left: Iterator[Any],
+    right: Iterator[Any],
+    left_key: KeyFunc,
+    right_key: KeyFunc,
+    outer: bool,
+) -> Iterator[Any]:
+    """
+    Body of merge_join
+
+    Yields:
+        Iterator[Any]: (left_row, right_row) pairs in left order
+    """
+    group: List[Any] = []
+    group_key: Any = _END
+    pending = next(right, _END)
+    previous: Any = _END
+    for row in left:
+        key = left_key(row)
+        if previous is not _END and key < previous:
+            raise ValueError("merge_join: left input is not sorted by key")
+        previous = key
+        if group_key is _END or group_key < key:
+            group = []
+            group_key = _END
+            while pending is not _END:
+                pending_key = right_key(pending)
+                if pending_key < key:
+                    pending = _next_sorted(right, right_key, pending_key)
+                    continue
+                if pending_key == key:
+                    group_key = key
+                    while pending is not _END and right_key(pending) == key:
+                        group.append(pending)
+                        pending = _next_sorted(right, right_key, key)
+                break
+        if group_key is not _END and group_key == key:
+            for match in group:
+                yield row, match
+        elif outer:
+            yield row, None
+
+
+def _next_sorted(right: Iterator[Any], right_key: KeyFunc, previous: Any) -> Any:
+    """
+    Takes the next right row and checks that the keys do not decrease
+
+    Args:
+        right (Iterator[Any]): right rows
+        right_key (KeyFunc): join key of a right row
+        previous (Any): key of the previous right row
+
+    Raises:
+        ValueError: if the right input is not sorted
+
+    Returns:
+        Any: next right row or _END
+    """
+    row = next(right, _END)
+    if row is not _END and right_key(row) < previous:
+        raise ValueError("merge_join: right input is not sorted by key")
+    return row
+
+
+def join(
+    left: Iterable[Any],
+    right: Iterable[Any],
+    left_key: KeyFunc,
+    right_key: Optional[KeyFunc] = None,
+    how: str = "inner",
+    algorithm: str = "hash",
+    build: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Joins a stream with another one by key
+
+    Used as a step: pipe_step(join, other_pipeline, user_id, how="left")
+
+    Args:
+        left (Iterable[Any]): left rows, the stream of the pipeline
+        right (Iterable[Any]): right rows, e.g. another Pipeline
+        left_key (KeyFunc): join key of a left row
+        right_key (Optional[KeyFunc]): join key of a right row. Defaults to left_key.
+        how (str): "inner" or "left". Defaults to "inner".
+        algorithm (str): "hash", or "merge" for inputs sorted by key. Defaults to "hash".
+        build (Optional[str]): side the hash join holds in memory. Defaults to None.
+
+    Raises:
+        ValueError: if how, algorithm or build is unknown
+
+    Returns:
+        Iterator[Any]: (left_row, right_row) pairs
+    """
+    if right_key is None:
+        right_key = left_key
+    if algorithm == "hash":
+        return hash_join(left, right, left_key, right_key, how, build)
+    if algorithm == "merge":
+        return merge_join(left, right, left_key, right_key, how)
+    raise ValueError(f"algorithm must be 'hash' or 'merge', got {algorithm!r}")
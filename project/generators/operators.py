@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator, List
+
+
+class Operator(ABC):
+    """
+    Base class for stateful streaming steps
+
+    The state of a run lives in the object returned by open, not in the
+    operator itself, so one operator (and one Plan holding it) can process
+    many streams at once, and the state of a run can be saved and restored.
+    An operator is used as a regular Pipeline step: pipe_step(operator).
+
+    Methods:
+        open() -> Any
+            Creates the state of a new run
+
+        push(state: Any, item: Any) -> Iterable[Any]
+            Consumes one element and returns the elements to emit
+
+        finish(state: Any) -> Iterable[Any]
+            Returns the elements to emit at the end of the stream
+
+        close(state: Any)
+            Releases resources of a run, even when it was not finished
+
+        spill_files(state: Any) -> List[str]
+            Returns the temporary files the state refers to
+
+        __call__(iterable: Iterable[Any]) -> Iterator[Any]
+            Runs the operator over a stream
+    """
+
+    @abstractmethod
+    def open(self) -> Any:
+        """
+        Creates the state of a new run
+
+        Returns:
+            Any: picklable state object
+        """
+
+    @abstractmethod
+    def push(self, state: Any, item: Any) -> Iterable[Any]:
+        """
+        Consumes one element and returns the elements to emit
+
+        Args:
+            state (Any): state of the run
+            item (Any): input element
+
+        Returns:
+            Iterable[Any]: output elements, usually empty
+        """
+
+    def finish(self, state: Any) -> Iterable[Any]:
+        """
+        Returns the elements to emit at the end of the stream
+
+        Args:
+            state (Any): state of the run
+
+        Returns:
+            Iterable[Any]: output elements
+        """
+        return ()
+
+    def close(self, state: Any) -> None:
+        """
+        Releases resources of a run, even when it was not finished
+
+        Args:
+            state (Any): state of the run
+        """
+
+    def spill_files(self, state: Any) -> List[str]:
+        """
+        Returns the temporary files the state refers to
+
+        Checkpointed runs save the state as soon as this list grows, so a
+        run that dies never leaves files that no checkpoint knows about.
+
+        Args:
+            state (Any): state of the run
+
+        Returns:
+            List[str]: paths of the files, empty for in-memory operators
+        """
+        return []
+
+    def __call__(self, iterable: Iterable[Any]) -> Iterator[Any]:
+        """
+        Runs the operator over a stream
+
+        Args:
+            iterable (Iterable[Any]): input elements
+
+        Yields:
+            Iterator[Any]: output elements
+        """
+        yield from self._drive(self.open(), iterable)
+
+    def _drive(self, state: Any, iterable: Iterable[Any]) -> Iterator[Any]:
+        """
+        Runs the operator over a stream with an already opened state
+
+        Args:
+            state (Any): state of the run, closed when the stream ends
+            iterable (Iterable[Any]): input elements
+
+        Yields:
+            Iterator[Any]: output elements
+        """
+        push = self.push
+        try:
+            for item in iterable:
+                yield from push(state, item)
+            yield from self.finish(state)
+        finally:
+            self.close(state)
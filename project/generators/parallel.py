@@ -0,0 +1,110 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import reduce
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+def _reduce_chunk(op: Callable[[Any, Any], Any], chunk: List[Any]) -> Any:
+    """
+    Reduces one chunk in a worker
+
+    Args:
+        op (Callable[[Any, Any], Any]): associative binary operator
+        chunk (List[Any]): non-empty list of elements
+
+    Returns:
+        Any: reduced value of the chunk
+    """
+    return reduce(op, chunk)
+
+
+def _push_partial(
+    op: Callable[[Any, Any], Any], stack: List[Tuple[int, Any]], value: Any
+) -> None:
+    """
+    Adds a partial result to an in-order combining tree
+
+    The stack works like a binary counter: two partials of the same level
+    are combined into one of the next level, so the partials are combined
+    as a balanced tree in their original order and at most log2(chunks)
+    of them are held at once.
+
+    Args:
+        op (Callable[[Any, Any], Any]): associative binary operator
+        stack (List[Tuple[int, Any]]): (level, value) pairs, oldest first
+        value (Any): partial result of the next chunk
+    """
+    level = 0
+    while stack and stack[-1][0] == level:
+        _, left = stack.pop()
+        value = op(left, value)
+        level += 1
+    stack.append((level, value))
+
+
+def tree_reduce(
+    op: Callable[[Any, Any], Any],
+    iterable: Iterable[Any],
+    initial: Any = _MISSING,
+    chunk_size: int = 10_000,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Any:
+    """
+    Reduces a stream with an associative operator in parallel
+
+    The stream is cut into chunks that are reduced in a process pool; the
+    partial results are combined in order as a balanced tree. Only about
+    two chunks per worker are in flight, so the stream is never
+    materialized. The operator does not have to be commutative, but it
+    must be associative and picklable.
+
+    Args:
+        op (Callable[[Any, Any], Any]): associative binary operator
+        iterable (Iterable[Any]): elements to reduce
+        initial (Any): value placed before the stream, like in functools.reduce
+        chunk_size (int): elements per task. Defaults to 10_000.
+        max_workers (Optional[int]): size of the process pool. Defaults to None.
+        executor (Optional[Executor]): executor to use instead of a new process pool. Defaults to None.
+
+    Raises:
+        ValueError: if chunk_size is not positive
+        TypeError: if the stream is empty and there is no initial value
+
+    Returns:
+        Any: reduced value
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers)
+    workers = max_workers or getattr(pool, "_max_workers", None) or 1
+    it = iter(iterable)
+    pending: Deque["Future[Any]"] = deque()
+    stack: List[Tuple[int, Any]] = []
+    if initial is not _MISSING:
+        _push_partial(op, stack, initial)
+    try:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(it, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_reduce_chunk, op, chunk))
+            if not pending:
+                break
+            _push_partial(op, stack, pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True)
+
+    if not stack:
+        raise TypeError("tree_reduce() of empty iterable with no initial value")
+    result = stack.pop()[1]
+    while stack:
+        result = op(stack.pop()[1], result)
+    return result
@@ -0,0 +1,243 @@
+import json
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+Stage = Callable[[Iterable[Any]], Iterable[Any]]
+
+
+class StepStats:
+    """
+    Counters of one instrumented step
+
+    Times stored here are inclusive, Profile.as_dict subtracts the time of
+    the previous step to get exclusive times.
+
+    Attributes:
+        name : str
+            Readable name of the step
+        kind : str
+            "filter" for filtering steps, "step" for everything else
+        items_in : int
+            Number of elements the step pulled from its input
+        items_out : int
+            Number of elements the step produced
+        wall : float
+            Wall time in seconds, including upstream steps
+        cpu : float
+            CPU time of the running thread in seconds, including upstream steps
+
+    Methods:
+        selectivity() -> Optional[float]
+            Fraction of elements passed by a filter
+    """
+
+    def __init__(self, name: str, kind: str = "step"):
+        """
+        Initializes empty counters
+
+        Args:
+            name (str): readable name of the step
+            kind (str): "filter" or "step". Defaults to "step".
+        """
+        self.name = name
+        self.kind = kind
+        self.items_in = 0
+        self.items_out = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def selectivity(self) -> Optional[float]:
+        """
+        Fraction of elements passed by a filter
+
+        Returns:
+            Optional[float]: items_out / items_in for filters, None otherwise
+        """
+        if self.kind != "filter" or not self.items_in:
+            return None
+        return self.items_out / self.items_in
+
+
+class Profile:
+    """
+    Per-step report of one instrumented run
+
+    Attributes:
+        source : StepStats
+            Counters of pulling elements from the source
+        steps : List[StepStats]
+            Counters of every step, in pipeline order
+
+    Methods:
+        as_dict() -> Dict[str, Any]
+            Returns the report as a dict with exclusive times
+
+        to_json(**kwargs: Any) -> str
+            Returns the report as a JSON string
+
+        table() -> str
+            Returns the report as a human-readable table
+    """
+
+    def __init__(self, names: List[str], kinds: List[str]):
+        """
+        Initializes counters for every step
+
+        Args:
+            names (List[str]): readable names of the steps
+            kinds (List[str]): "filter" or "step" for every step
+        """
+        self.source = StepStats("source")
+        self.steps = [StepStats(name, kind) for name, kind in zip(names, kinds)]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the report as a dict with exclusive times
+
+        Returns:
+            Dict[str, Any]: totals and a list of per-step counters
+        """
+        steps = []
+        upstream = self.source
+        for stats in self.steps:
+            steps.append(
+                {
+                    "name": stats.name,
+                    "kind": stats.kind,
+                    "items_in": stats.items_in,
+                    "items_out": stats.items_out,
+                    "selectivity": stats.selectivity(),
+                    "wall": max(stats.wall - upstream.wall, 0.0),
+                    "cpu": max(stats.cpu - upstream.cpu, 0.0),
+                }
+            )
+            upstream = stats
+        return {
+            "source_items": self.source.items_out,
+            "source_wall": self.source.wall,
+            "source_cpu": self.source.cpu,
+            "wall": upstream.wall,
+            "cpu": upstream.cpu,
+            "steps": steps,
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """
+        Returns the report as a JSON string
+
+        Returns:
+            str: JSON document, kwargs are passed to json.dumps
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def table(self) -> str:
+        """
+        Returns the report as a human-readable table
+
+        Returns:
+            str: one line per step, wall and cpu in milliseconds
+        """
+        report = self.as_dict()
+        width = max([len(step["name"]) for step in report["steps"]] + [6])
+        lines = [
+            f"{'step':<{width}} | {'in':>10} | {'out':>10} | {'sel':>6} | "
+            f"{'wall ms':>9} | {'cpu ms':>9}"
+        ]
+        lines.append("-" * len(lines[0]))
+        rows = [
+            {
+                "name": "source",
+                "items_in": "",
+                "items_out": report["source_items"],
+                "selectivity": None,
+                "wall": report["source_wall"],
+                "cpu": report["source_cpu"],
+            }
+        ]
+        for row in rows + report["steps"]:
+            selectivity = row["selectivity"]
+            sel = "" if selectivity is None else f"{selectivity:.1%}"
+            lines.append(
+                f"{row['name']:<{width}} | {row['items_in']:>10} | "
+                f"{row['items_out']:>10} | {sel:>6} | "
+                f"{row['wall'] * 1e3:>9.3f} | {row['cpu'] * 1e3:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.table()
+
+
+def _timed(
+    stats: StepStats,
+    consumer: Optional[StepStats],
+    produce: Callable[[], Iterable[Any]],
+) -> Iterator[Any]:
+    """
+    Yields the elements of a step, adding inclusive times and counts to stats
+
+    The step output is closed when this generator is, so take and first
+    stop the upstream steps of an instrumented run as they do otherwise.
+
+    Args:
+        stats (StepStats): counters of the step
+        consumer (Optional[StepStats]): counters of the next step, None for the last one
+        produce (Callable[[], Iterable[Any]]): creates the step output (may be eager)
+
+    Yields:
+        Iterator[Any]: elements produced by the step
+    """
+    perf_counter = time.perf_counter
+    thread_time = time.thread_time
+    wall = perf_counter()
+    cpu = thread_time()
+    it = iter(produce())
+    stats.wall += perf_counter() - wall
+    stats.cpu += thread_time() - cpu
+    try:
+        while True:
+            wall = perf_counter()
+            cpu = thread_time()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                stats.wall += perf_counter() - wall
+                stats.cpu += thread_time() - cpu
+            stats.items_out += 1
+            if consumer is not None:
+                consumer.items_in += 1
+            yield item
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+
+
+def instrument(
+    source: Iterable[Any], stages: List[Stage], profile: Profile
+) -> Iterator[Any]:
+    """
+    Applies stages to a source, recording per-step counters into profile
+
+    Every stage must correspond to exactly one step of the profile.
+
+    Args:
+        source (Iterable[Any]): data to process
+        stages (List[Stage]): one stage per step
+        profile (Profile): report to fill
+
+    Returns:
+        Iterator[Any]: iterator over processed data
+    """
+    consumers: List[Optional[StepStats]] = list(profile.steps[1:]) + [None]
+    it: Iterator[Any] = _timed(
+        profile.source,
+        profile.steps[0] if profile.steps else None,
+        partial(iter, source),
+    )
+    for stage, stats, consumer in zip(stages, profile.steps, consumers):
+        it = _timed(stats, consumer, partial(stage, it))
+    return it
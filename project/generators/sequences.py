@@ -0,0 +1,331 @@
+import math
+from collections.abc import Sequence
+from functools import partial
+from numbers import Integral
+from operator import add, mul
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+Number = Union[int, float]
+
+_LOG_PHI = math.log((1 + math.sqrt(5)) / 2)
+_LOG_SQRT5 = math.log(math.sqrt(5))
+
+
+def fibonacci_pair(n: int) -> Tuple[int, int]:
+    """
+    Returns (F(n), F(n + 1)) by fast doubling in O(log n) multiplications
+
+    Uses F(2k) = F(k) * (2 * F(k + 1) - F(k)) and
+    F(2k + 1) = F(k) ** 2 + F(k + 1) ** 2.
+
+    Args:
+        n (int): non-negative index
+
+    Raises:
+        ValueError: if n is negative
+
+    Returns:
+        Tuple[int, int]: F(n) and F(n + 1)
+    """
+    if n < 0:
+        raise ValueError("index must be non-negative")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == "1":
+            a, b = b, a + b
+    return a, b
+
+
+def fibonacci(n: int) -> int:
+    """
+    Returns F(n) in O(log n) multiplications
+
+    Args:
+        n (int): non-negative index
+
+    Returns:
+        int: n-th Fibonacci number, F(0) = 0, F(1) = 1
+    """
+    return fibonacci_pair(n)[0]
+
+
+def fibonacci_index(value: int) -> int:
+    """
+    Returns the smallest index n with F(n) >= value
+
+    Args:
+        value (int): bound on the Fibonacci number
+
+    Returns:
+        int: index, 0 for value <= 0
+    """
+    if value <= 0:
+        return 0
+    n = max(int((math.log(value) + _LOG_SQRT5) / _LOG_PHI) - 2, 0)
+    a, b = fibonacci_pair(n)
+    while a >= value and n > 0:
+        n -= 1
+        a, b = b - a, a
+    while a < value:
+        a, b = b, a + b
+        n += 1
+    return n
+
+
+def fibonacci_range(start: int, stop: int, step: int = 1) -> Iterator[int]:
+    """
+    Yields F(i) for i in range(start, stop, step)
+
+    The first pair is computed by fast doubling and every stride uses
+    F(m + s) = F(m + 1) * F(s) + F(m) * (F(s + 1) - F(s)), so the range
+    can start at any index and step by any stride without iterating
+    over the skipped numbers.
+
+    Args:
+        start (int): first index
+        stop (int): index bound, exclusive
+        step (int): index stride. Defaults to 1.
+
+    Raises:
+        ValueError: if start is negative or step is not positive
+
+    Yields:
+        Iterator[int]: Fibonacci numbers
+    """
+    if step < 1:
+        raise ValueError("step must be positive")
+    a, b = fibonacci_pair(start)
+    c, d = fibonacci_pair(step)
+    for _ in range(start, stop, step):
+        yield a
+        a, b = b * c + a * (d - c), b * d + a * c
+
+
+def range_length(start: Number, stop: Number, step: Number) -> int:
+    """
+    Returns the number of elements of start, start + step, ... below stop
+
+    Integral bounds are counted with floor division, which is exact for
+    any size; len(range(...)) overflows above sys.maxsize and true
+    division loses precision above 2 ** 53.
+
+    Args:
+        start (Number): first element
+        stop (Number): bound of the elements, exclusive
+        step (Number): non-zero difference between neighbouring elements
+
+    Returns:
+        int: number of elements, 0 if start is already past stop
+    """
+    if all(isinstance(value, Integral) for value in (start, stop, step)):
+        return max(int(-((start - stop) // step)), 0)
+    return max(math.ceil((stop - start) / step), 0)
+
+
+def shard(indices: range, worker: int, workers: int) -> range:
+    """
+    Returns the contiguous part of a range processed by one worker
+
+    Parts of all the workers cover the range exactly once and differ in
+    length by at most one element.
+
+    Args:
+        indices (range): whole range
+        worker (int): worker number, from 0 to workers - 1
+        workers (int): number of workers
+
+    Raises:
+        ValueError: if worker is out of range
+
+    Returns:
+        range: part of the range
+    """
+    if not 0 <= worker < workers:
+        raise ValueError("worker must be between 0 and workers - 1")
+    size = range_length(indices.start, indices.stop, indices.step)
+    return indices[worker * size // workers : (worker + 1) * size // workers]
+
+
+class LazyRange(Sequence):
+    """
+    Lazy arithmetic sequence start, start + step, ... below stop
+
+    Works like the built-in range, including LazyRange(stop), but also
+    accepts float bounds and steps. With integral arguments everything is
+    delegated to a range object, so iteration runs in C; with floats the
+    i-th element is computed as start + i * step, so no rounding error
+    accumulates over a long sequence. Length, indexing, slicing and
+    splitting are O(1) and never iterate over the elements.
+
+    Indexing, slicing and splitting work for any number of elements, but
+    the built-in len() is limited to sys.maxsize by Python itself and
+    raises OverflowError above it; the length property has no limit.
+
+    Attributes:
+        start : Number
+            First element
+        step : Number
+            Difference between neighbouring elements
+        length : int
+            Number of elements, also above sys.maxsize
+
+    Methods:
+        split(n: int) -> List[LazyRange]
+            Splits the sequence into n contiguous parts
+
+        to_numpy() -> np.ndarray
+            Materializes the elements as a NumPy array
+    """
+
+    __slots__ = ("start", "step", "_length", "_range")
+
+    start: Number
+    step: Number
+    _length: int
+    _range: Optional[range]
+
+    def __init__(self, start: Number, stop: Optional[Number] = None, step: Number = 1):
+        """
+        Initializes the sequence
+
+        Args:
+            start (Number): first element, or stop if stop is not given
+            stop (Optional[Number]): bound of the elements, exclusive. Defaults to None.
+            step (Number): difference between neighbouring elements. Defaults to 1.
+
+        Raises:
+            ValueError: if step is zero
+        """
+        if stop is None:
+            start, stop = 0, start
+        if step == 0:
+            raise ValueError("step must not be zero")
+        self._init(start, step, range_length(start, stop, step))
+
+    def _init(self, start: Number, step: Number, length: int) -> None:
+        """
+        Sets the fields from the first element, the step and the length
+        """
+        self.start = start
+        self.step = step
+        self._length = length
+        if isinstance(start, Integral) and isinstance(step, Integral):
+            self._range = range(start, start + length * step, step)
+        else:
+            self._range = None
+
+    @classmethod
+    def _of_length(cls, start: Number, step: Number, length: int) -> "LazyRange":
+        """
+        Creates a sequence with a known number of elements
+        """
+        sequence = cls.__new__(cls)
+        sequence._init(start, step, length)
+        return sequence
+
+    @property
+    def stop(self) -> Number:
+        """
+        Returns the element following the last one
+        """
+        return self.start + self._length * self.step
+
+    @property
+    def length(self) -> int:
+        """
+        Returns the number of elements
+
+        Unlike len(), the length is not limited to sys.maxsize.
+        """
+        return self._length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._range is not None:
+            return iter(self._range)
+        return map(
+            partial(add, self.start), map(partial(mul, self.step), range(self._length))
+        )
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            positions = range(self._length)[index]
+            return LazyRange._of_length(
+                self.start + positions.start * self.step,
+                self.step * positions.step,
+                range_length(positions.start, positions.stop, positions.step),
+            )
+        if self._range is not None:
+            return self._range[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("LazyRange index out of range")
+        return self.start + index * self.step
+
+    def __contains__(self, value: Any) -> bool:
+        if self._range is not None:
+            return value in self._range
+        position = (value - self.start) / self.step
+        index = round(position)
+        return 0 <= index < self._length and self[index] == value
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, LazyRange):
+            return NotImplemented
+        if self._length != other._length:
+            return False
+        if self._length == 0:
+            return True
+        return self.start == other.start and (
+            self._length == 1 or self.step == other.step
+        )
+
+    def __hash__(self) -> int:
+        if self._length == 0:
+            return hash((LazyRange, 0))
+        step = self.step if self._length > 1 else None
+        return hash((LazyRange, self._length, self.start, step))
+
+    def __repr__(self) -> str:
+        return f"LazyRange({self.start!r}, {self.stop!r}, {self.step!r})"
+
+    def __reduce__(self) -> Any:
+        return LazyRange._of_length, (self.start, self.step, self._length)
+
+    def split(self, n: int) -> List["LazyRange"]:
+        """
+        Splits the sequence into n contiguous parts for parallel workers
+
+        Args:
+            n (int): number of parts
+
+        Raises:
+            ValueError: if n is not positive
+
+        Returns:
+            List[LazyRange]: parts that differ in length by at most one element
+        """
+        if n < 1:
+            raise ValueError("n must be positive")
+        positions = range(self._length)
+        return [
+            self[part.start : part.stop]
+            for part in (shard(positions, i, n) for i in range(n))
+        ]
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Materializes the elements as a NumPy array
+
+        Returns:
+            np.ndarray: elements
+        """
+        if self._range is not None:
+            return np.arange(self._range.start, self._range.stop, self._range.step)
+        return self.start + np.arange(self._length) * self.step
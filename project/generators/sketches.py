@@ -0,0 +1,331 @@
+import hashlib
+import math
+import pickle
+from typing import Any, Callable, Iterable, Iterator, Optional, Set, Tuple, Union
+
+from project.generators.aggregators import Aggregator
+from project.generators.operators import Operator
+
+
+def _as_bytes(item: Any) -> bytes:
+    """
+    Returns a representation of an element that is stable across processes
+
+    Built-in hash() of str and bytes is salted per process, so sketches
+    hash these bytes instead and can be merged between workers. Strings,
+    bytes and machine-size integers are converted directly, everything
+    else is pickled.
+
+    Args:
+        item (Any): element
+
+    Returns:
+        bytes: representation of the element
+    """
+    if isinstance(item, bytes):
+        return b"b" + item
+    if isinstance(item, str):
+        return b"s" + item.encode("utf-8", "surrogatepass")
+    if type(item) is int and -(1 << 63) <= item < 1 << 63:
+        return b"i" + item.to_bytes(8, "little", signed=True)
+    return b"p" + pickle.dumps(item, 4)
+
+
+def hash128(item: Any) -> Tuple[int, int]:
+    """
+    Returns two independent 64-bit hashes of an element
+
+    Args:
+        item (Any): element
+
+    Returns:
+        Tuple[int, int]: hashes
+    """
+    digest = hashlib.blake2b(_as_bytes(item), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class BloomFilter:
+    """
+    Set membership with a fixed memory budget and no false negatives
+
+    The bits are kept in a bytearray sized for capacity elements at the
+    requested false-positive rate; positions are derived from one 128-bit
+    hash by double hashing. Filters built with the same parameters merge
+    with a bitwise or.
+
+    Attributes:
+        capacity : int
+            Expected number of distinct elements
+        fp_rate : float
+            False-positive probability once capacity elements are added
+        bits : int
+            Number of bits
+        hashes : int
+            Number of bit positions per element
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        """
+        Initializes an empty filter
+
+        Args:
+            capacity (int): expected number of distinct elements
+            fp_rate (float): false-positive probability. Defaults to 0.01.
+
+        Raises:
+            ValueError: if capacity or fp_rate is out of range
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bits = max(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.bits / capacity * math.log(2)), 1)
+        self.array = bytearray((self.bits + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the size of the bit array in bytes
+        """
+        return len(self.array)
+
+    def _positions(self, item: Any) -> Iterator[int]:
+        first, second = hash128(item)
+        bits = self.bits
+        for i in range(self.hashes):
+            yield (first + i * second) % bits
+
+    def add(self, item: Any) -> bool:
+        """
+        Adds an element
+
+        Args:
+            item (Any): element
+
+        Returns:
+            bool: True if the element was definitely not in the filter before
+        """
+        array = self.array
+        new = False
+        for position in self._positions(item):
+            index, mask = position >> 3, 1 << (position & 7)
+            if not array[index] & mask:
+                array[index] |= mask
+                new = True
+        return new
+
+    def __contains__(self, item: Any) -> bool:
+        array = self.array
+        return all(
+            array[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def merge(self, other: "BloomFilter") -> None:
+        """
+        Adds all the elements of another filter with the same parameters
+
+        Args:
+            other (BloomFilter): filter to merge
+
+        Raises:
+            ValueError: if the filters have different sizes
+        """
+        if (other.bits, other.hashes) != (self.bits, self.hashes):
+            raise ValueError("cannot merge Bloom filters with different parameters")
+        merged = int.from_bytes(self.array, "little") | int.from_bytes(
+            other.array, "little"
+        )
+        self.array = bytearray(merged.to_bytes(len(self.array), "little"))
+
+
+class HyperLogLog(Aggregator):
+    """
+    Approximate number of distinct elements (HyperLogLog)
+
+    Uses 2 ** precision one-byte registers regardless of the stream
+    length; the standard error of the estimate is 1.04 / sqrt(2 ** precision),
+    about 0.8% for the default precision of 14 (16 KiB). Small
+    cardinalities are estimated by linear counting. Sketches with the same
+    precision merge by taking the register maximum.
+
+    Attributes:
+        precision : int
+            Number of hash bits selecting a register, between 4 and 18
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Initializes an empty sketch
+
+        Args:
+            precision (int): number of register bits. Defaults to 14.
+
+        Raises:
+            ValueError: if precision is out of range
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the size of the registers in bytes
+        """
+        return len(self.registers)
+
+    def add(self, value: Any) -> None:
+        hashed = hash128(value)[0]
+        width = 64 - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, HyperLogLog)
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def result(self) -> int:
+        m = len(self.registers)
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0**-register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class CountDistinct(Aggregator):
+    """
+    Exact number of distinct elements, kept in a set
+
+    Memory grows with the number of distinct elements; use HyperLogLog
+    for large streams and this one to check its accuracy.
+    """
+
+    def __init__(self) -> None:
+        self.seen: Set[Any] = set()
+
+    def add(self, value: Any) -> None:
+        self.seen.add(value)
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, CountDistinct)
+        self.seen |= other.seen
+
+    def result(self) -> int:
+        return len(self.seen)
+
+
+def approx_count_distinct(iterable: Iterable[Any], precision: int = 14) -> int:
+    """
+    Estimates the number of distinct elements with fixed memory
+
+    Used as a terminal aggregator: pipeline.aggregate(approx_count_distinct)
+
+    Args:
+        iterable (Iterable[Any]): elements
+        precision (int): HyperLogLog register bits. Defaults to 14.
+
+    Returns:
+        int: estimated number of distinct elements
+    """
+    return HyperLogLog.of(iterable, precision)
+
+
+class Distinct(Operator):
+    """
+    Drops repeated elements, exactly or with a fixed-size Bloom filter
+
+    The exact mode remembers every key in a set. The approximate mode
+    keeps only a Bloom filter of capacity elements, so memory is fixed:
+    a duplicate is never emitted, but with probability about fp_rate a
+    new element is taken for a seen one and dropped.
+
+    Attributes:
+        approx : bool
+            Use a Bloom filter instead of a set
+        fp_rate : float
+            False-positive rate of the Bloom filter
+        capacity : int
+            Number of distinct elements the Bloom filter is sized for
+        key : Optional[Callable[[Any], Any]]
+            Returns the identity of an element, None for the element itself
+    """
+
+    def __init__(
+        self,
+        approx: bool = False,
+        fp_rate: float = 0.01,
+        capacity: int = 1_000_000,
+        key: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Initializes the step
+
+        Args:
+            approx (bool): use a Bloom filter. Defaults to False.
+            fp_rate (float): false-positive rate. Defaults to 0.01.
+            capacity (int): expected distinct elements. Defaults to 1_000_000.
+            key (Optional[Callable[[Any], Any]]): identity of an element. Defaults to None.
+
+        Raises:
+            ValueError: if fp_rate or capacity is out of range
+        """
+        if approx and (capacity < 1 or not 0 < fp_rate < 1):
+            raise ValueError("capacity must be positive and fp_rate between 0 and 1")
+        self.approx = approx
+        self.fp_rate = fp_rate
+        self.capacity = capacity
+        self.key = key
+
+    def open(self) -> Union[BloomFilter, Set[Any]]:
+        if self.approx:
+            return BloomFilter(self.capacity, self.fp_rate)
+        return set()
+
+    def push(self, state: Union[BloomFilter, Set[Any]], item: Any) -> Iterable[Any]:
+        key = item if self.key is None else self.key(item)
+        if isinstance(state, BloomFilter):
+            return (item,) if state.add(key) else ()
+        if key in state:
+            return ()
+        state.add(key)
+        return (item,)
+
+
+def distinct(
+    iterable: Iterable[Any],
+    approx: bool = False,
+    fp_rate: float = 0.01,
+    capacity: int = 1_000_000,
+    key: Optional[Callable[[Any], Any]] = None,
+) -> Iterator[Any]:
+    """
+    Drops repeated elements, keeping the first occurrence
+
+    Used as a step: pipe_step(distinct, approx=True, fp_rate=0.001)
+
+    Args:
+        iterable (Iterable[Any]): input elements
+        approx (bool): use a fixed-size Bloom filter instead of a set. Defaults to False.
+        fp_rate (float): false-positive rate of the filter. Defaults to 0.01.
+        capacity (int): distinct elements the filter is sized for. Defaults to 1_000_000.
+        key (Optional[Callable[[Any], Any]]): identity of an element. Defaults to None.
+
+    Returns:
+        Iterator[Any]: elements seen for the first time
+    """
+    return Distinct(approx, fp_rate, capacity, key)(iterable)
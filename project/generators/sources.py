@@ -0,0 +1,388 @@
+import mmap
+import os
+import struct
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_READ_SIZE = 1 << 20
+
+Line = Union[str, bytes]
+ByteRange = Tuple[int, int]
+
+
+def _line_boundary(buffer: Any, position: int, size: int) -> int:
+    """
+    Returns the start of the first line that begins at or after a position
+
+    Args:
+        buffer (Any): mmap of the file
+        position (int): byte offset
+        size (int): file size
+
+    Returns:
+        int: offset right after a newline, 0 or the file size
+    """
+    if position <= 0:
+        return 0
+    if position >= size:
+        return size
+    newline = buffer.find(b"\n", position - 1)
+    return size if newline < 0 else newline + 1
+
+
+def _record_boundary(position: int, record_size: int, size: int) -> int:
+    """
+    Returns the start of the first fixed-size record at or after a position
+
+    Args:
+        position (int): byte offset
+        record_size (int): size of one record
+        size (int): file size
+
+    Returns:
+        int: multiple of record_size, clamped to the file
+    """
+    if position <= 0:
+        return 0
+    boundary = -(-position // record_size) * record_size
+    return min(boundary, size - size % record_size)
+
+
+def _aligned_range(
+    path: str, start: int, end: Optional[int], record_size: Optional[int]
+) -> ByteRange:
+    """
+    Moves both ends of a byte range to record boundaries
+
+    A record belongs to the range in which its first byte lies, so the
+    aligned ranges of adjacent byte ranges never overlap or leave gaps.
+    Aligning an already aligned range does not change it.
+
+    Args:
+        path (str): path of the file
+        start (int): first byte of the range
+        end (Optional[int]): end of the range, exclusive, None for the end of file
+        record_size (Optional[int]): size of fixed records, None for lines
+
+    Returns:
+        ByteRange: aligned (start, end)
+    """
+    size = os.path.getsize(path)
+    end = size if end is None else min(end, size)
+    if start >= end:
+        return start, start
+    if record_size is not None:
+        return (
+            _record_boundary(start, record_size, size),
+            _record_boundary(end, record_size, size),
+        )
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        return _line_boundary(buffer, start, size), _line_boundary(buffer, end, size)
+
+
+def partition_file(
+    path: str, parts: int, record_size: Optional[int] = None
+) -> List[ByteRange]:
+    """
+    Splits a file into byte ranges of about equal size for parallel workers
+
+    Every range starts and ends on a record boundary: after a newline for
+    text files, at a multiple of record_size for binary records.
+
+    Args:
+        path (str): path of the file
+        parts (int): number of ranges
+        record_size (Optional[int]): size of fixed records. Defaults to None (lines).
+
+    Raises:
+        ValueError: if parts is not positive
+
+    Returns:
+        List[ByteRange]: (start, end) pairs covering the file, some may be empty
+    """
+    if parts < 1:
+        raise ValueError("parts must be positive")
+    size = os.path.getsize(path)
+    bounds = [size * i // parts for i in range(parts + 1)]
+    aligned = [
+        _aligned_range(path, bound, None, record_size)[0] for bound in bounds[:-1]
+    ]
+    aligned.append(size if record_size is None else size - size % record_size)
+    return list(zip(aligned, aligned[1:]))
+
+
+def _split_lines(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[Line]:
+    """
+    Splits a stream of byte chunks into lines
+
+    Every chunk is cut at its last newline and decoded and split in one
+    call, so the work per line happens in C; the rest is carried over to
+    the next chunk.
+
+    Args:
+        chunks (Iterable[bytes]): consecutive pieces of the data
+        encoding (Optional[str]): text encoding, None to yield bytes
+
+    Yields:
+        Iterator[Line]: lines without the newline
+    """
+    tail = b""
+    for chunk in chunks:
+        cut = chunk.rfind(b"\n")
+        if cut < 0:
+            tail += chunk
+            continue
+        block = tail + chunk[:cut]
+        tail = chunk[cut + 1 :]
+        if encoding is None:
+            yield from block.split(b"\n")
+        else:
+            yield from block.decode(encoding).split("\n")
+    if tail:
+        yield tail if encoding is None else tail.decode(encoding)
+
+
+def _read_chunks(path: str, start: int, end: int, size: int) -> Iterator[bytes]:
+    """
+    Reads a byte range of a file in large chunks
+
+    A raw read may return fewer bytes than asked for (pipes, sockets,
+    network file systems), so every chunk is read in a loop until it is
+    full or the file ends; only the last chunk can be short.
+
+    Args:
+        path (str): path of the file
+        start (int): first byte
+        end (int): end of the range, exclusive
+        size (int): bytes per read call
+
+    Yields:
+        Iterator[bytes]: consecutive chunks
+    """
+    with open(path, "rb", buffering=0) as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            wanted = min(size, remaining)
+            chunk = file.read(wanted)
+            if not chunk:
+                return
+            if len(chunk) < wanted:
+                parts = [chunk]
+                missing = wanted - len(chunk)
+                while missing:
+                    part = file.read(missing)
+                    if not part:
+                        break
+                    parts.append(part)
+                    missing -= len(part)
+                chunk = b"".join(parts)
+            remaining -= len(chunk)
+            yield chunk
+            if len(chunk) < wanted:
+                return
+
+
+def _map_chunks(path: str, start: int, end: int, size: int) -> Iterator[bytes]:
+    """
+    Slices a byte range of a memory-mapped file into chunks
+
+    Args:
+        path (str): path of the file
+        start (int): first byte
+        end (int): end of the range, exclusive
+        size (int): bytes per chunk
+
+    Yields:
+        Iterator[bytes]: consecutive chunks
+    """
+    if start >= end:
+        return
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        for position in range(start, end, size):
+            yield buffer[position : min(position + size, end)]
+
+
+class LineSource:
+    """
+    Re-iterable source of the lines of a text file or of its byte range
+
+    The file is read in chunks of read_size bytes (or sliced from an mmap)
+    and split into lines in bulk, instead of one read per line. Lines are
+    yielded without the trailing newline. A byte range covers the lines
+    that start inside it, so the ranges from partition give every line to
+    exactly one worker. The object only holds the path and the range, so
+    it can be sent to a worker process.
+
+    Attributes:
+        path : str
+            Path of the file
+        start : int
+            First byte of the range
+        end : Optional[int]
+            End of the range, exclusive, None for the end of file
+        encoding : Optional[str]
+            Text encoding, None to yield bytes
+        read_size : int
+            Bytes read at once
+        use_mmap : bool
+            Read through a memory map instead of read calls
+
+    Methods:
+        partition(parts: int) -> List[LineSource]
+            Splits the source into sources of record-aligned byte ranges
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        encoding: Optional[str] = "utf-8",
+        read_size: int = DEFAULT_READ_SIZE,
+        use_mmap: bool = False,
+    ):
+        """
+        Initializes the source
+
+        Args:
+            path (str): path of the file
+            start (int): first byte of the range. Defaults to 0.
+            end (Optional[int]): end of the range. Defaults to None.
+            encoding (Optional[str]): text encoding. Defaults to "utf-8".
+            read_size (int): bytes read at once. Defaults to DEFAULT_READ_SIZE.
+            use_mmap (bool): read through a memory map. Defaults to False.
+
+        Raises:
+            ValueError: if read_size is not positive
+        """
+        if read_size < 1:
+            raise ValueError("read_size must be positive")
+        self.path = path
+        self.start = start
+        self.end = end
+        self.encoding = encoding
+        self.read_size = read_size
+        self.use_mmap = use_mmap
+
+    def __iter__(self) -> Iterator[Line]:
+        start, end = _aligned_range(self.path, self.start, self.end, None)
+        read = _map_chunks if self.use_mmap else _read_chunks
+        return _split_lines(read(self.path, start, end, self.read_size), self.encoding)
+
+    def partition(self, parts: int) -> List["LineSource"]:
+        """
+        Splits the source into sources of record-aligned byte ranges
+
+        Args:
+            parts (int): number of sources
+
+        Returns:
+            List[LineSource]: sources for parallel workers
+        """
+        return [
+            LineSource(
+                self.path, start, end, self.encoding, self.read_size, self.use_mmap
+            )
+            for start, end in partition_file(self.path, parts)
+        ]
+
+    def __repr__(self) -> str:
+        return f"LineSource({self.path!r}, {self.start}, {self.end})"
+
+
+class RecordSource:
+    """
+    Re-iterable source of fixed-size binary records of a file
+
+    Records are decoded with a struct format; whole chunks of records are
+    unpacked by struct.iter_unpack, so no Python code runs per field. A
+    trailing incomplete record is ignored.
+
+    Attributes:
+        path : str
+            Path of the file
+        struct_fmt : str
+            struct format of one record, e.g. "<if"
+        start : int
+            First byte of the range
+        end : Optional[int]
+            End of the range, exclusive, None for the end of file
+        read_size : int
+            Bytes read at once, rounded down to whole records
+        use_mmap : bool
+            Read through a memory map instead of read calls
+
+    Methods:
+        partition(parts: int) -> List[RecordSource]
+            Splits the source into sources of record-aligned byte ranges
+    """
+
+    def __init__(
+        self,
+        path: str,
+        struct_fmt: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        read_size: int = DEFAULT_READ_SIZE,
+        use_mmap: bool = False,
+    ):
+        """
+        Initializes the source
+
+        Args:
+            path (str): path of the file
+            struct_fmt (str): struct format of one record
+            start (int): first byte of the range. Defaults to 0.
+            end (Optional[int]): end of the range. Defaults to None.
+            read_size (int): bytes read at once. Defaults to DEFAULT_READ_SIZE.
+            use_mmap (bool): read through a memory map. Defaults to False.
+
+        Raises:
+            ValueError: if read_size is not positive
+            struct.error: if the format is invalid
+        """
+        if read_size < 1:
+            raise ValueError("read_size must be positive")
+        self.path = path
+        self.struct_fmt = struct_fmt
+        self.record_size = struct.calcsize(struct_fmt)
+        self.start = start
+        self.end = end
+        self.read_size = read_size
+        self.use_mmap = use_mmap
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        record = struct.Struct(self.struct_fmt)
+        start, end = _aligned_range(self.path, self.start, self.end, record.size)
+        read = _map_chunks if self.use_mmap else _read_chunks
+        size = max(self.read_size // record.size, 1) * record.size
+        for chunk in read(self.path, start, end, size):
+            # Only a file that shrank while being read ends mid-record
+            whole = len(chunk) - len(chunk) % record.size
+            yield from record.iter_unpack(
+                chunk[:whole] if whole < len(chunk) else chunk
+            )
+
+    def partition(self, parts: int) -> List["RecordSource"]:
+        """
+        Splits the source into sources of record-aligned byte ranges
+
+        Args:
+            parts (int): number of sources
+
+        Returns:
+            List[RecordSource]: sources for parallel workers
+        """
+        return [
+            RecordSource(
+                self.path, self.struct_fmt, start, end, self.read_size, self.use_mmap
+            )
+            for start, end in partition_file(self.path, parts, self.record_size)
+        ]
+
+    def __repr__(self) -> str:
+        return f"RecordSource({self.path!r}, {self.struct_fmt!r}, {self.start}, {self.end})"
@@ -0,0 +1,349 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+Stage = Callable[[Iterable[Any]], Iterable[Any]]
+
+_DONE = object()
+_POLL_INTERVAL = 0.05
+
+
+class _Failure:
+    """
+    Wraps an exception raised in a worker so it can travel through queues
+    """
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Cancelled(Exception):
+    """
+    Raised inside a worker when the run was closed by the consumer
+    """
+
+
+class QueueMetrics:
+    """
+    Counters of one bounded queue between two stages
+
+    Attributes:
+        name : str
+            Name of the producing stage
+        capacity : int
+            Maximum number of batches the queue can hold
+        items : int
+            Number of elements passed through the queue
+        batches : int
+            Number of batches passed through the queue
+        max_depth : int
+            Largest number of batches observed in the queue
+        put_stall : float
+            Seconds the producer was blocked on a full queue (backpressure)
+        get_stall : float
+            Seconds the consumer was blocked on an empty queue (starvation)
+
+    Methods:
+        mean_depth() -> float
+            Average number of batches in the queue right after a put
+
+        as_dict() -> Dict[str, Any]
+            Returns the counters as a dict
+    """
+
+    def __init__(self, name: str, capacity: int):
+        """
+        Initializes empty counters
+
+        Args:
+            name (str): name of the producing stage
+            capacity (int): queue capacity in batches
+        """
+        self.name = name
+        self.capacity = capacity
+        self.items = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.put_stall = 0.0
+        self.get_stall = 0.0
+        self._depth_total = 0
+
+    def mean_depth(self) -> float:
+        """
+        Average number of batches in the queue right after a put
+
+        Returns:
+            float: mean depth, 0 if nothing was put
+        """
+        return self._depth_total / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the counters as a dict
+
+        Returns:
+            Dict[str, Any]: counters
+        """
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "items": self.items,
+            "batches": self.batches,
+            "max_depth": self.max_depth,
+            "mean_depth": self.mean_depth(),
+            "put_stall": self.put_stall,
+            "get_stall": self.get_stall,
+        }
+
+
+class StagedRun:
+    """
+    Runs stages concurrently, each in its own thread, connected by bounded queues
+
+    A fast producer blocks once its output queue is full, so at most
+    capacity * batch_size elements are buffered between any two stages.
+    Iterating the run yields the output of the last stage.
+
+    Attributes:
+        metrics : List[QueueMetrics]
+            Counters of every queue, from the source to the last stage
+
+    Methods:
+        __init__(source: Iterable[Any], stages: List[List[Stage]], capacity: int, batch_size: int, names: Optional[List[str]])
+            Starts the worker threads
+
+        __next__() -> Any
+            Returns the next processed element
+
+        close()
+            Stops all workers and waits for them
+
+        report() -> List[Dict[str, Any]]
+            Returns queue metrics as dicts
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        stages: List[List[Stage]],
+        capacity: int = 64,
+        batch_size: int = 1,
+        names: Optional[List[str]] = None,
+    ):
+        """
+        Starts the worker threads
+
+        Args:
+            source (Iterable[Any]): data to process
+            stages (List[List[Stage]]): groups of stages, one worker per group
+            capacity (int): maximum number of batches per queue. Defaults to 64.
+            batch_size (int): elements moved through a queue at once. Defaults to 1.
+            names (Optional[List[str]]): names of the groups. Defaults to None.
+
+        Raises:
+            ValueError: if capacity or batch_size is not positive
+        """
+        if capacity < 1 or batch_size < 1:
+            raise ValueError("capacity and batch_size must be positive")
+        if names is None:
+            names = [f"stage {i}" for i in range(1, len(stages) + 1)]
+
+        self.batch_size = batch_size
+        self.metrics: List[QueueMetrics] = [QueueMetrics("source", capacity)]
+        self.metrics.extend(QueueMetrics(name, capacity) for name in names)
+        self._queues: List["queue.Queue[Any]"] = [
+            queue.Queue(capacity) for _ in self.metrics
+        ]
+        self._stop = threading.Event()
+        self._buffer: Iterator[Any] = iter(())
+        self._finished = False
+
+        self._threads = [
+            threading.Thread(target=self._work, args=(source, [], 0), daemon=True)
+        ]
+        for i, group in enumerate(stages):
+            self._threads.append(
+                threading.Thread(
+                    target=self._work,
+                    args=(self._drain(i), group, i + 1),
+                    daemon=True,
+                )
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def _put(self, index: int, batch: Any) -> None:
+        """
+        Puts a batch into a queue, waiting while it is full
+
+        Args:
+            index (int): queue index
+            batch (Any): list of elements, _DONE or _Failure
+
+        Raises:
+            _Cancelled: if the run was closed while waiting
+        """
+        q = self._queues[index]
+        metrics = self.metrics[index]
+        try:
+            q.put_nowait(batch)
+        except queue.Full:
+            started = time.perf_counter()
+            while True:
+                if self._stop.is_set():
+                    raise _Cancelled()
+                try:
+                    q.put(batch, timeout=_POLL_INTERVAL)
+                    break
+                except queue.Full:
+                    pass
+            metrics.put_stall += time.perf_counter() - started
+        if isinstance(batch, list):
+            depth = q.qsize()
+            metrics.items += len(batch)
+            metrics.batches += 1
+            metrics._depth_total += depth
+            metrics.max_depth = max(metrics.max_depth, depth)
+
+    def _get(self, index: int) -> Any:
+        """
+        Takes a batch from a queue, waiting while it is empty
+
+        Args:
+            index (int): queue index
+
+        Raises:
+            _Cancelled: if the run was closed while waiting
+
+        Returns:
+            Any: list of elements, _DONE or _Failure
+        """
+        q = self._queues[index]
+        try:
+            return q.get_nowait()
+        except queue.Empty:
+            started = time.perf_counter()
+            while True:
+                if self._stop.is_set():
+                    raise _Cancelled()
+                try:
+                    batch = q.get(timeout=_POLL_INTERVAL)
+                    break
+                except queue.Empty:
+                    pass
+            self.metrics[index].get_stall += time.perf_counter() - started
+            return batch
+
+    def _drain(self, index: int) -> Iterator[Any]:
+        """
+        Yields the elements arriving through a queue
+
+        Args:
+            index (int): queue index
+
+        Raises:
+            BaseException: the error of an upstream worker
+
+        Yields:
+            Iterator[Any]: elements
+        """
+        while True:
+            batch = self._get(index)
+            if batch is _DONE:
+                return
+            if isinstance(batch, _Failure):
+                raise batch.error
+            yield from batch
+
+    def _work(self, items: Iterable[Any], group: List[Stage], index: int) -> None:
+        """
+        Body of a worker thread: applies a group of stages and feeds the next queue
+
+        Args:
+            items (Iterable[Any]): the source or the previous queue
+            group (List[Stage]): stages run by this worker
+            index (int): output queue index
+        """
+        try:
+            it: Iterable[Any] = items
+            for stage in group:
+                it = stage(it)
+            batch: List[Any] = []
+            for item in it:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._put(index, batch)
+                    batch = []
+            if batch:
+                self._put(index, batch)
+            self._put(index, _DONE)
+        except _Cancelled:
+            pass
+        except BaseException as error:
+            try:
+                self._put(index, _Failure(error))
+            except _Cancelled:
+                pass
+
+    def __iter__(self) -> "StagedRun":
+        return self
+
+    def __next__(self) -> Any:
+        """
+        Returns the next processed element
+
+        Raises:
+            StopIteration: when all the stages are done
+
+        Returns:
+            Any: processed element
+        """
+        for item in self._buffer:
+            return item
+        if self._finished:
+            raise StopIteration
+        last = len(self._queues) - 1
+        batch = self._get(last)
+        if batch is _DONE:
+            self._finish()
+            raise StopIteration
+        if isinstance(batch, _Failure):
+            self.close()
+            raise batch.error
+        self._buffer = iter(batch)
+        return next(self._buffer)
+
+    def _finish(self) -> None:
+        """
+        Stops the workers that are still blocked and waits for all of them
+
+        Upstream workers may still be running after the last stage is done,
+        e.g. when a step stops reading its input early.
+        """
+        self._finished = True
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def close(self) -> None:
+        """
+        Stops all workers and waits for them
+        """
+        if not self._finished:
+            self._finish()
+
+    def __enter__(self) -> "StagedRun":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Returns queue metrics as dicts
+
+        Returns:
+            List[Dict[str, Any]]: one dict per queue
+        """
+        return [metrics.as_dict() for metrics in self.metrics]
@@ -0,0 +1,280 @@
+import math
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+from project.generators.aggregators import Aggregator
+from project.generators.operators import Operator
+
+AggregatorFactory = Callable[[], Aggregator]
+
+
+def _check_removable(aggregator: AggregatorFactory) -> None:
+    """
+    Checks that a sliding window can remove elements from the aggregator
+
+    Args:
+        aggregator (AggregatorFactory): creates an empty aggregator
+
+    Raises:
+        ValueError: if the aggregator does not support remove
+    """
+    if not aggregator().supports_remove:
+        raise ValueError("sliding windows need an aggregator that supports remove")
+
+
+_NOTHING: Tuple[Any, ...] = ()
+
+
+class _WindowState:
+    """
+    State of one window run: the aggregator and the elements it still holds
+    """
+
+    def __init__(self, aggregator: Aggregator):
+        # Any: sliding windows call remove, which only some aggregators define
+        self.aggregator: Any = aggregator
+        self.items: Deque[Any] = deque()
+        self.seen = 0
+        self.start: Optional[float] = None
+
+
+class CountWindow(Operator):
+    """
+    Count-based window: aggregates every size consecutive elements
+
+    Without slide the windows are tumbling: the aggregator is emptied after
+    each window and only the running aggregate is kept. With slide a new
+    window of the last size elements is emitted every slide elements; the
+    oldest elements are removed from the aggregator incrementally, so only
+    the current window is buffered.
+
+    Attributes:
+        size : int
+            Number of elements in a window
+        aggregator : AggregatorFactory
+            Creates an empty aggregator, e.g. Mean or partial(Quantile, 0.9)
+        slide : Optional[int]
+            Distance between sliding windows, None for tumbling windows
+    """
+
+    def __init__(
+        self, size: int, aggregator: AggregatorFactory, slide: Optional[int] = None
+    ):
+        """
+        Initializes the window
+
+        Args:
+            size (int): number of elements in a window
+            aggregator (AggregatorFactory): creates an empty aggregator
+            slide (Optional[int]): distance between sliding windows. Defaults to None.
+
+        Raises:
+            ValueError: if size or slide is out of range
+        """
+        if size < 1:
+            raise ValueError("size must be positive")
+        if slide is not None:
+            if not 1 <= slide <= size:
+                raise ValueError("slide must be between 1 and size")
+            _check_removable(aggregator)
+        self.size = size
+        self.aggregator = aggregator
+        self.slide = slide
+
+    def open(self) -> _WindowState:
+        return _WindowState(self.aggregator())
+
+    def push(self, state: _WindowState, item: Any) -> Iterable[Any]:
+        aggregator = state.aggregator
+        aggregator.add(item)
+        state.seen += 1
+        if self.slide is None:
+            if state.seen < self.size:
+                return _NOTHING
+            result = aggregator.result()
+            state.aggregator = self.aggregator()
+            state.seen = 0
+            return (result,)
+
+        items = state.items
+        items.append(item)
+        if len(items) > self.size:
+            aggregator.remove(items.popleft())
+        if state.seen >= self.size and (state.seen - self.size) % self.slide == 0:
+            return (aggregator.result(),)
+        return _NOTHING
+
+    def finish(self, state: _WindowState) -> Iterable[Any]:
+        if self.slide is None and state.seen:
+            return (state.aggregator.result(),)
+        return _NOTHING
+
+
+class TumblingWindow(Operator):
+    """
+    Time-based tumbling window
+
+    Elements are assigned to windows [k * size, (k + 1) * size) by their
+    timestamp and one (window_start, result) pair is emitted per non-empty
+    window as soon as a later element arrives. Timestamps must not go
+    backwards; only the running aggregate of the current window is kept.
+
+    Attributes:
+        size : float
+            Length of a window
+        aggregator : AggregatorFactory
+            Creates an empty aggregator
+        key : Callable[[Any], float]
+            Returns the timestamp of an element
+        value : Callable[[Any], Any]
+            Returns the value that is aggregated
+    """
+
+    def __init__(
+        self,
+        size: float,
+        aggregator: AggregatorFactory,
+        key: Callable[[Any], float],
+        value: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Initializes the window
+
+        Args:
+            size (float): length of a window
+            aggregator (AggregatorFactory): creates an empty aggregator
+            key (Callable[[Any], float]): returns the timestamp of an element
+            value (Optional[Callable[[Any], Any]]): returns the aggregated value. Defaults to the element itself.
+
+        Raises:
+            ValueError: if size is not positive
+        """
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.size = size
+        self.aggregator = aggregator
+        self.key = key
+        self.value = value
+
+    def open(self) -> _WindowState:
+        return _WindowState(self.aggregator())
+
+    def push(self, state: _WindowState, item: Any) -> Iterable[Any]:
+        timestamp = self.key(item)
+        start = math.floor(timestamp / self.size) * self.size
+        emitted: Iterable[Any] = _NOTHING
+        if state.start is None:
+            state.start = start
+        elif start > state.start:
+            emitted = ((state.start, state.aggregator.result()),)
+            state.aggregator = self.aggregator()
+            state.start = start
+        elif start < state.start:
+            raise ValueError(f"timestamp {timestamp} is older than the current window")
+        state.aggregator.add(item if self.value is None else self.value(item))
+        return emitted
+
+    def finish(self, state: _WindowState) -> Iterable[Any]:
+        if state.start is None:
+            return _NOTHING
+        return ((state.start, state.aggregator.result()),)
+
+
+class SlidingWindow(Operator):
+    """
+    Time-based sliding window
+
+    Windows [s, s + size) start at every multiple s of slide; one
+    (window_start, result) pair is emitted per non-empty window. Elements
+    older than the current window are removed from the aggregator as time
+    moves on, so only the elements of the current window are buffered and
+    every element is added and removed once. Timestamps must not go
+    backwards.
+
+    Attributes:
+        size : float
+            Length of a window
+        slide : float
+            Distance between window starts
+        aggregator : AggregatorFactory
+            Creates an empty aggregator
+        key : Callable[[Any], float]
+            Returns the timestamp of an element
+        value : Callable[[Any], Any]
+            Returns the value that is aggregated
+    """
+
+    def __init__(
+        self,
+        size: float,
+        slide: float,
+        aggregator: AggregatorFactory,
+        key: Callable[[Any], float],
+        value: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Initializes the window
+
+        Args:
+            size (float): length of a window
+            slide (float): distance between window starts
+            aggregator (AggregatorFactory): creates an empty aggregator
+            key (Callable[[Any], float]): returns the timestamp of an element
+            value (Optional[Callable[[Any], Any]]): returns the aggregated value. Defaults to the element itself.
+
+        Raises:
+            ValueError: if size or slide is out of range, or the aggregator
+                cannot remove elements
+        """
+        if size <= 0 or not 0 < slide <= size:
+            raise ValueError("size must be positive and slide between 0 and size")
+        _check_removable(aggregator)
+        self.size = size
+        self.slide = slide
+        self.aggregator = aggregator
+        self.key = key
+        self.value = value
+
+    def open(self) -> _WindowState:
+        return _WindowState(self.aggregator())
+
+    def _first_start(self, timestamp: float) -> float:
+        """
+        Returns the start of the earliest window containing the timestamp
+        """
+        return (math.floor((timestamp - self.size) / self.slide) + 1) * self.slide
+
+    def _advance(self, state: _WindowState) -> None:
+        """
+        Moves to the next window and evicts elements older than its start
+        """
+        assert state.start is not None
+        state.start += self.slide
+        items = state.items
+        while items and items[0][0] < state.start:
+            state.aggregator.remove(items.popleft()[1])
+
+    def push(self, state: _WindowState, item: Any) -> Iterable[Any]:
+        timestamp = self.key(item)
+        value = item if self.value is None else self.value(item)
+        emitted: List[Any] = []
+        if state.start is None:
+            state.start = self._first_start(timestamp)
+        elif state.items and timestamp < state.items[-1][0]:
+            raise ValueError(f"timestamp {timestamp} is older than the previous one")
+        while timestamp >= state.start + self.size:
+            if state.items:
+                emitted.append((state.start, state.aggregator.result()))
+                self._advance(state)
+            else:
+                state.start = max(state.start, self._first_start(timestamp))
+        state.items.append((timestamp, value))
+        state.aggregator.add(value)
+        return emitted
+
+    def finish(self, state: _WindowState) -> Iterable[Any]:
+        emitted = []
+        while state.items:
+            emitted.append((state.start, state.aggregator.result()))
+            self._advance(state)
+        return emitted
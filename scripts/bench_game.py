@@ -0,0 +1,98 @@
+"""
+Measures Zonk turns per second: Game.play_turn with its per-roll turn
+information, play_turn_fast without it and with a list as event sink,
+and the vectorized simulation for comparison
+
+Usage:
+    python scripts/bench_game.py [--turns N] [--repeat R] [--seed S]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from project.game.game import Game
+from project.game.player import Player
+from project.game.simulation import simulate
+from project.game.strategies import (
+    AggressiveStrategy,
+    BalancedStrategy,
+    ConservativeStrategy,
+    Strategy,
+)
+
+
+def strategies() -> List[Strategy]:
+    return [ConservativeStrategy(), AggressiveStrategy(), BalancedStrategy()]
+
+
+def endless_game() -> Game:
+    players = [Player(f"Bot{i + 1}") for i in range(3)]
+    return Game(players, strategies(), target_score=10**12)
+
+
+def logged_turns(turns: int) -> None:
+    game = endless_game()
+    for _ in range(turns):
+        game.play_turn()
+
+
+def fast_turns(turns: int) -> None:
+    game = endless_game()
+    for _ in range(turns):
+        game.play_turn_fast()
+
+
+def sink_turns(turns: int) -> None:
+    game = endless_game()
+    events: List[Any] = []
+    for _ in range(turns):
+        game.play_turn_fast(events.append)
+
+
+def turns_per_sec(run: Callable[[int], None], turns: int, repeat: int) -> float:
+    best = min(timeit.repeat(lambda: run(turns), number=1, repeat=repeat))
+    return turns / best
+
+
+def simulated_turns_per_sec(turns: int, repeat: int, seed: int) -> float:
+    # A game to 10000 points takes about 21 rounds of three turns
+    n_games = max(turns // 63, 1)
+    best = float("inf")
+    played = 0
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        result = simulate(strategies(), n_games, seed)
+        best = min(best, timeit.default_timer() - start)
+        played = int(result.rounds.sum()) * 3
+    return played / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    random.seed(options.seed)
+    logged = turns_per_sec(logged_turns, options.turns, options.repeat)
+    print(f"{'mode':<28} | {'turns/s':>12} | speedup")
+    print(f"{'play_turn (turn info)':<28} | {logged:>12.0f} | 1.00x")
+    for name, run in [
+        ("play_turn_fast", fast_turns),
+        ("play_turn_fast + list sink", sink_turns),
+    ]:
+        rate = turns_per_sec(run, options.turns, options.repeat)
+        print(f"{name:<28} | {rate:>12.0f} | {rate / logged:.2f}x")
+    rate = simulated_turns_per_sec(options.turns * 10, options.repeat, options.seed)
+    print(f"{'simulate (vectorized)':<28} | {rate:>12.0f} | {rate / logged:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures per-element overhead of Pipeline against the number of map/filter steps,
+and element mode against chunked (vectorized) mode on a numeric stream
+
+Usage:
+    python scripts/bench_pipeline.py [--size N] [--repeat R]
+"""
+
+import argparse
+import math
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from project.generators.generator import Pipeline, vmap
+
+
+def identity(x: int) -> int:
+    return x
+
+
+def always(x: int) -> bool:
+    return True
+
+
+def build(size: int, steps: int, fuse: bool) -> Pipeline:
+    pipeline = Pipeline(range(size), fuse=fuse)
+    for i in range(steps):
+        if i % 2:
+            pipeline.pipe_step(filter, always)
+        else:
+            pipeline.pipe_step(map, identity)
+    return pipeline
+
+
+def per_element_ns(size: int, steps: int, fuse: bool, repeat: int) -> float:
+    pipeline = build(size, steps, fuse)
+    best = min(timeit.repeat(lambda: pipeline.aggregate(), number=1, repeat=repeat))
+    return best / size * 1e9
+
+
+def numeric_ns(size: int, chunk_size: int, repeat: int) -> float:
+    def run() -> float:
+        if not chunk_size:
+            return Pipeline(range(size)).pipe_step(map, math.sqrt).aggregate(sum)
+        pipeline = Pipeline(range(size), chunk_size=chunk_size)
+        pipeline.pipe_step(vmap, np.sqrt)
+        return sum(float(chunk.sum()) for chunk in pipeline.iter_chunks())
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / size * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    print(f"{'steps':>5} | {'unfused ns/elem':>15} | {'fused ns/elem':>13} | speedup")
+    for steps in (1, 2, 5, 10, 20, 40):
+        unfused = per_element_ns(options.size, steps, False, options.repeat)
+        fused = per_element_ns(options.size, steps, True, options.repeat)
+        print(
+            f"{steps:>5} | {unfused:>15.1f} | {fused:>13.1f} | {unfused / fused:.2f}x"
+        )
+
+    print()
+    print(f"{'chunk':>5} | {'sqrt ns/elem':>12}")
+    for chunk_size in (0, 64, 1024, 16384):
+        elapsed = numeric_ns(options.size, chunk_size, options.repeat)
+        print(f"{chunk_size or '-':>5} | {elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Benchmark suite for data_generator and Pipeline throughput
+
+Every case is run at every requested size: the best of several runs gives
+elements per second, and one more run under tracemalloc gives the peak
+memory allocated through Python and NumPy. Results are saved as JSON and
+can be compared against an earlier result file to catch regressions.
+
+Usage:
+    python scripts/bench_suite.py [--sizes 1e3,1e4,1e5] [--cases generator,reduce]
+                                  [--repeat R] [--output results.json]
+                                  [--baseline baseline.json] [--tolerance 0.2]
+                                  [--no-memory]
+
+Sizes up to 1e8 work: the sources are lazy and the results are drained
+without being stored. Cases that cannot reasonably run at a size (big
+Fibonacci numbers) are skipped above their limit. The process pool of
+the parallel reduce gets one worker per chunk, up to the number of CPUs,
+so small sizes do not pay for starting a full pool.
+"""
+
+import argparse
+import json
+import operator
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from functools import reduce
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from project.generators.generator import Pipeline, data_generator, vmap
+from project.generators.sequences import fibonacci
+
+SEED = 12345
+
+
+def drain(iterable: Iterable[Any]) -> None:
+    deque(iterable, maxlen=0)
+
+
+def identity(x: int) -> int:
+    return x
+
+
+def always(x: int) -> bool:
+    return True
+
+
+def steps_pipeline(size: int, steps: int, fuse: bool = True) -> Pipeline:
+    pipeline = Pipeline(data_generator(0, size), fuse=fuse)
+    for i in range(steps):
+        if i % 2:
+            pipeline.pipe_step(filter, always)
+        else:
+            pipeline.pipe_step(map, identity)
+    return pipeline
+
+
+def generator_range(size: int) -> None:
+    drain(data_generator(0, size))
+
+
+def generator_random(size: int) -> None:
+    drain(data_generator(0, size, 1, "random", seed=SEED))
+
+
+def generator_random_bulk(size: int) -> None:
+    drain(data_generator(0, size, 1, "random", seed=SEED, block_size=65536))
+
+
+def generator_fibonacci(size: int) -> None:
+    drain(data_generator(0, fibonacci(size), 1, "fibonacci"))
+
+
+def map_filter_1(size: int) -> None:
+    drain(steps_pipeline(size, 1))
+
+
+def map_filter_5(size: int) -> None:
+    drain(steps_pipeline(size, 5))
+
+
+def map_filter_20(size: int) -> None:
+    drain(steps_pipeline(size, 20))
+
+
+def map_filter_20_unfused(size: int) -> None:
+    drain(steps_pipeline(size, 20, fuse=False))
+
+
+def reduce_add(size: int) -> None:
+    drain(Pipeline(data_generator(0, size)).pipe_step(reduce, operator.add))
+
+
+def enumerate_steps(size: int) -> None:
+    drain(Pipeline(data_generator(0, size)).pipe_step(enumerate))
+
+
+def chunked_vmap(size: int) -> None:
+    pipeline = Pipeline(data_generator(0, size), chunk_size=65536)
+    drain(pipeline.pipe_step(vmap, np.sqrt).iter_chunks())
+
+
+def staged(size: int) -> None:
+    pipeline = steps_pipeline(size, 2)
+    with pipeline.run_staged(batch_size=1024) as run:
+        drain(run)
+
+
+PARALLEL_CHUNK_SIZE = 100_000
+
+
+def parallel_reduce(size: int) -> None:
+    chunks = max(-(-size // PARALLEL_CHUNK_SIZE), 1)
+    pipeline = Pipeline(data_generator(0, size)).pipe_step(
+        reduce,
+        operator.add,
+        parallel=True,
+        associative=True,
+        chunk_size=PARALLEL_CHUNK_SIZE,
+        max_workers=min(os.cpu_count() or 1, chunks),
+    )
+    drain(pipeline)
+
+
+def fan_out(size: int) -> None:
+    Pipeline(data_generator(0, size)).fan_out(sum, max, batch_size=4096)
+
+
+# name -> (function, largest size it is run at)
+CASES: Dict[str, Tuple[Callable[[int], Any], Optional[int]]] = {
+    "generator.range": (generator_range, None),
+    "generator.random": (generator_random, None),
+    "generator.random_bulk": (generator_random_bulk, None),
+    "generator.fibonacci": (generator_fibonacci, 10**5),
+    "pipeline.map_filter_1": (map_filter_1, None),
+    "pipeline.map_filter_5": (map_filter_5, None),
+    "pipeline.map_filter_20": (map_filter_20, None),
+    "pipeline.map_filter_20_unfused": (map_filter_20_unfused, None),
+    "pipeline.reduce": (reduce_add, None),
+    "pipeline.enumerate": (enumerate_steps, None),
+    "pipeline.chunked_vmap": (chunked_vmap, None),
+    "pipeline.staged": (staged, None),
+    "pipeline.parallel_reduce": (parallel_reduce, None),
+    "pipeline.fan_out": (fan_out, None),
+}
+
+
+def peak_memory(func: Callable[[int], Any], size: int) -> int:
+    tracemalloc.start()
+    try:
+        func(size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name: str, size: int, repeat: int, memory: bool) -> Dict[str, Any]:
+    func = CASES[name][0]
+    # Small sizes are looped to at least 1e5 elements per timing to cut
+    # the noise; big sizes get fewer repeats to keep 1e8 runs affordable
+    number = max(1, 10**5 // size)
+    runs = repeat if size <= 10**6 else 1
+    total = min(timeit.repeat(lambda: func(size), number=number, repeat=runs))
+    seconds = total / number
+    return {
+        "case": name,
+        "size": size,
+        "seconds": seconds,
+        "elements_per_sec": size / seconds if seconds else float("inf"),
+        "peak_bytes": peak_memory(func, size) if memory else None,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """
+    Compares throughput against a baseline run
+
+    Args:
+        results (List[Dict[str, Any]]): current results
+        baseline (List[Dict[str, Any]]): earlier results
+        tolerance (float): allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: descriptions of the regressions
+    """
+    previous = {(row["case"], row["size"]): row for row in baseline}
+    regressions = []
+    print()
+    print(
+        f"{'case':<32} | {'size':>9} | {'baseline el/s':>14} | {'now el/s':>14} | ratio"
+    )
+    for row in results:
+        old = previous.get((row["case"], row["size"]))
+        if old is None:
+            continue
+        ratio = row["elements_per_sec"] / old["elements_per_sec"]
+        mark = ""
+        if ratio < 1 - tolerance:
+            mark = "  REGRESSION"
+            regressions.append(f"{row['case']} at {row['size']}: {ratio:.2f}x")
+        print(
+            f"{row['case']:<32} | {row['size']:>9} | {old['elements_per_sec']:>14.0f} | "
+            f"{row['elements_per_sec']:>14.0f} | {ratio:.2f}x{mark}"
+        )
+    return regressions
+
+
+def parse_sizes(text: str) -> List[int]:
+    return [int(float(size)) for size in text.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=parse_sizes, default=[10**3, 10**4, 10**5]
+    )
+    parser.add_argument("--cases", default="", help="comma separated name filters")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--no-memory", action="store_true")
+    options = parser.parse_args()
+
+    filters = [part for part in options.cases.split(",") if part]
+    names = [name for name in CASES if not filters or any(f in name for f in filters)]
+
+    results = []
+    print(f"{'case':<32} | {'size':>9} | {'el/s':>14} | {'peak KiB':>10}")
+    for name in names:
+        limit = CASES[name][1]
+        for size in options.sizes:
+            if limit is not None and size > limit:
+                continue
+            row = measure(name, size, options.repeat, not options.no_memory)
+            results.append(row)
+            peak = (
+                "-" if row["peak_bytes"] is None else f"{row['peak_bytes'] / 1024:.0f}"
+            )
+            print(
+                f"{name:<32} | {size:>9} | {row['elements_per_sec']:>14.0f} | {peak:>10}"
+            )
+
+    report = {"environment": environment(), "results": results}
+    if options.output is not None:
+        options.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nSaved to {options.output}")
+
+    if options.baseline is not None:
+        baseline = json.loads(options.baseline.read_text())["results"]
+        regressions = compare(results, baseline, options.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
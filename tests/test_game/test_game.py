@@ -3,6 +3,8 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+import random
+
 import pytest
 from project.game.game import Game
 from project.game.player import Player
@@ -148,3 +150,78 @@ def test_game_state_structure(game_setup):
     assert "target_score" in state, "State should have target score"
     assert "game_over" in state, "State should have game_over flag"
     assert "winner" in state, "State should have winner field"
+
+
+def make_game(target_score=3000, rng=None):
+    players = [Player("Bot1"), Player("Bot2"), Player("Bot3")]
+    strategies = [ConservativeStrategy(), AggressiveStrategy(), BalancedStrategy()]
+    return Game(players, strategies, target_score=target_score, rng=rng)
+
+
+def test_fast_turns_match_logged_turns():
+    random.seed(10)
+    logged = make_game()
+    logged_results = []
+    while not logged.is_game_over():
+        turn_info = logged.play_turn()
+        logged_results.append(
+            [(roll["dice"], roll.get("score", 0)) for roll in turn_info["rolls"]]
+        )
+
+    random.seed(10)
+    fast = make_game()
+    fast_results = []
+    while not fast.is_game_over():
+        events = []
+        fast.play_turn_fast(events.append)
+        fast_results.append([(list(dice), score) for _, dice, score, _ in events])
+
+    assert fast_results == logged_results, "Both modes should play the same rolls"
+    assert fast.get_game_state() == logged.get_game_state()
+
+
+def test_play_turn_fast_returns_banked_points():
+    random.seed(11)
+    game = make_game()
+    for _ in range(30):
+        player = game.players[game.current_player_index]
+        before = player.get_total_score()
+        events = []
+        banked = game.play_turn_fast(events.append)
+        assert player.get_total_score() == before + banked
+        assert player.get_round_score() == 0
+        if events[-1][2] == 0:
+            assert banked == 0, "A zonk banks nothing"
+        else:
+            assert banked == sum(event[2] for event in events)
+
+
+def test_play_turn_fast_events():
+    random.seed(12)
+    game = make_game()
+    events = []
+    game.play_turn_fast(events.append)
+    assert events, "Every turn has at least one roll"
+    assert all(index == 0 for index, _, _, _ in events)
+    assert len(events[0][1]) == 6, "The first roll uses six dice"
+    assert all(1 <= value <= 6 for _, dice, _, _ in events for value in dice)
+
+
+def test_play_game_with_sink():
+    random.seed(13)
+    events = []
+    game = make_game()
+    winner = game.play_game(sink=events.append)
+    assert winner is not None
+    assert sum(score for _, _, score, _ in events) >= winner.get_total_score()
+
+
+def test_own_random_generator():
+    games = []
+    for seed in (14, 99):
+        random.seed(seed)
+        game = make_game(rng=random.Random(5))
+        game.play_turn()
+        game.play_game()
+        games.append(game.get_game_state())
+    assert games[0] == games[1], "The global random state should not matter"
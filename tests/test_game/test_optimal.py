@@ -0,0 +1,125 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import random
+
+import numpy as np
+import pytest
+from project.game.game import Game
+from project.game.optimal import OptimalStrategy, roll_outcomes, solve
+from project.game.player import Player
+from project.game.simulation import simulate
+from project.game.strategies import (
+    Strategy,
+    ConservativeStrategy,
+    BalancedStrategy,
+)
+
+
+@pytest.mark.parametrize(
+    "num_dice, zonk", [(1, 2 / 3), (2, 4 / 9), (3, 60 / 216), (6, 1 - 0.976851851851)]
+)
+def test_roll_outcomes_probabilities(num_dice: int, zonk: float) -> None:
+    outcomes = roll_outcomes(num_dice)
+    assert 1 - sum(p for _, _, p in outcomes) == pytest.approx(zonk)
+    assert all(1 <= used <= num_dice for _, used, _ in outcomes)
+
+
+def test_single_die_expectation() -> None:
+    policy = solve()
+    # A 1 or a 5 gives six new dice, which are always worth rolling
+    assert policy.keep_count(100, 1, 1) == 1
+    assert policy.should_continue(0, 6)
+    assert not policy.should_continue(5000, 1), "One die is not worth 5000 points"
+
+
+def test_expected_turn_score_beats_fixed_thresholds() -> None:
+    policy = solve()
+    assert 600 < policy.expected_turn_score < 700
+
+
+def test_bank_thresholds_grow_with_dice() -> None:
+    policy = solve()
+    thresholds = [
+        next(r for r in range(0, 30001, 50) if not policy.should_continue(r, n))
+        for n in range(2, 7)
+    ]
+    assert thresholds == sorted(thresholds)
+
+
+def test_keeps_fewest_dice_when_rolling_on() -> None:
+    policy = solve()
+    assert policy.keep_count(100, 6, 2) == 1, "Should keep one die to roll five"
+    assert policy.keep_count(300, 2, 2) == 2, "Should keep both to get six dice"
+
+
+def test_solve_rejects_low_limit() -> None:
+    with pytest.raises(ValueError):
+        solve(1000)
+
+
+def test_strategy_banks_at_target() -> None:
+    strategy = OptimalStrategy(target_score=10000)
+    assert strategy.should_continue(300, 6, 5000)
+    assert not strategy.should_continue(300, 6, 9800), "Should bank to win"
+    assert OptimalStrategy(target_score=None).should_continue(300, 6, 9800)
+
+
+def test_strategy_follows_turn_score() -> None:
+    strategy = OptimalStrategy()
+    strategy.start_turn()
+    assert strategy.choose_dice_to_keep([1, 5], [1, 5]) == [1, 5], "Six new dice"
+    strategy.start_turn()
+    assert strategy.choose_dice_to_keep([1, 5, 2, 3, 6, 6], [1, 5]) == [1]
+    assert strategy.choose_dice_to_keep([1, 5, 2, 3, 6, 6], [1, 5]) == [1]
+
+
+def test_strategy_requires_start_turn() -> None:
+    strategy = OptimalStrategy()
+    with pytest.raises(RuntimeError):
+        strategy.choose_dice_to_keep([1, 5], [1, 5])
+    strategy.start_turn()
+    strategy.choose_dice_to_keep([1, 2, 3, 4, 6, 6], [1])
+    assert not strategy.should_continue(5000, 5, 0)
+    with pytest.raises(RuntimeError):
+        strategy.choose_dice_to_keep([1, 5], [1, 5])
+
+
+@pytest.mark.parametrize("target_score", [None, 3000])
+def test_vectorized_decisions_match_scalar(target_score: int) -> None:
+    strategy = OptimalStrategy(target_score=target_score)
+    grid = np.meshgrid(np.arange(0, 31000, 50), np.arange(1, 7), [0, 2500])
+    round_scores, num_dice, totals = (axis.ravel() for axis in grid)
+    expected = [
+        strategy.should_continue(int(r), int(n), int(t))
+        for r, n, t in zip(round_scores, num_dice, totals)
+    ]
+    assert list(strategy.continue_mask(round_scores, num_dice, totals)) == expected
+
+    used = np.minimum(num_dice, 2)
+    dice = np.zeros((len(num_dice), 6), dtype=np.int64)
+    expected_keeps = [
+        strategy.policy.keep_count(int(r), int(n), int(u))
+        for r, n, u in zip(round_scores, num_dice, used)
+    ]
+    keeps = strategy.keep_counts(dice, num_dice, used, round_scores)
+    assert list(keeps) == expected_keeps
+    with pytest.raises(ValueError):
+        strategy.keep_counts(dice, num_dice, used)
+
+
+def test_optimal_strategy_wins_most_games() -> None:
+    strategies = [OptimalStrategy(), ConservativeStrategy(), BalancedStrategy()]
+    result = simulate(strategies, 5000, seed=0)
+    assert result.win_rates()[0] > 0.75
+
+
+def test_optimal_strategy_plays_game() -> None:
+    random.seed(0)
+    players = [Player("Optimal"), Player("Balanced")]
+    game = Game(players, [OptimalStrategy(), BalancedStrategy()], target_score=3000)
+    winner = game.play_game()
+    assert winner is not None
+    assert winner.get_total_score() >= 3000
@@ -3,6 +3,8 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+import itertools
+
 import pytest
 from project.game.score_calculator import ScoreCalculator
 
@@ -109,3 +111,43 @@ def test_three_ones_with_five():
     dice = [1, 1, 1, 5, 2, 3]
     score = ScoreCalculator.calculate_score(dice)
     assert score == 1050, f"Three 1s and a 5 should score 1050, got {score}"
+
+
+def test_lookup_table_covers_all_multisets():
+    table = ScoreCalculator.lookup_table()
+    assert len(table) == 924, "Should hold every multiset of 0-6 dice"
+    assert ScoreCalculator.lookup_table() is table, "Should be built once"
+
+
+@pytest.mark.parametrize("num_dice", range(7))
+def test_lookup_matches_computation(num_dice):
+    for roll in itertools.product(range(1, 7), repeat=num_dice):
+        dice = list(roll)
+        assert ScoreCalculator.find_best_scoring_combination(
+            dice
+        ) == ScoreCalculator._compute_best_scoring_combination(dice)
+        assert ScoreCalculator.get_possible_scoring_options(
+            dice
+        ) == ScoreCalculator._compute_scoring_options(dice)
+        assert ScoreCalculator.calculate_score(dice) == (
+            ScoreCalculator._compute_best_scoring_combination(dice)[0]
+        )
+
+
+def test_encode_ignores_order():
+    assert ScoreCalculator.encode([5, 1, 1]) == ScoreCalculator.encode([1, 5, 1])
+    assert ScoreCalculator.encode([2]) != ScoreCalculator.encode([1])
+    assert ScoreCalculator.encode([]) == 0
+
+
+def test_rolls_outside_table_are_computed():
+    assert ScoreCalculator.encode([1] * 7) is None, "Seven dice are not in the table"
+    assert ScoreCalculator.encode([0, 1]) is None, "0 is not a face"
+    assert ScoreCalculator.calculate_score([1] * 7) == 1400
+    assert ScoreCalculator.is_zonk([7, 7])
+
+
+def test_lookup_results_are_copies():
+    _, scoring = ScoreCalculator.find_best_scoring_combination([1, 5])
+    scoring.append(3)
+    assert ScoreCalculator.get_scoring_dice([1, 5]) == [1, 5]
@@ -0,0 +1,134 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import itertools
+import random
+from typing import List
+
+import numpy as np
+import pytest
+from project.game.score_calculator import ScoreCalculator
+from project.game.simulation import count_faces, play_games, score_counts, simulate
+from project.game.strategies import (
+    Strategy,
+    ConservativeStrategy,
+    AggressiveStrategy,
+    BalancedStrategy,
+)
+
+STRATEGIES = [ConservativeStrategy(), AggressiveStrategy(), BalancedStrategy()]
+
+
+class CautiousStrategy(Strategy):
+    def should_continue(
+        self, round_score: int, num_dice: int, total_score: int
+    ) -> bool:
+        return round_score < 300
+
+    def choose_dice_to_keep(
+        self, dice: List[int], scoring_dice: List[int]
+    ) -> List[int]:
+        return scoring_dice[:1]
+
+
+def all_rolls(num_dice: int) -> np.ndarray:
+    rolls = np.array(list(itertools.product(range(1, 7), repeat=num_dice)))
+    dice = np.zeros((len(rolls), 6), dtype=np.int64)
+    dice[:, :num_dice] = rolls
+    return dice
+
+
+@pytest.mark.parametrize("num_dice", range(1, 7))
+def test_score_counts_matches_score_calculator(num_dice: int) -> None:
+    dice = all_rolls(num_dice)
+    scores, used = score_counts(count_faces(dice))
+    for row, score, count in zip(dice, scores, used):
+        expected, scoring_dice = ScoreCalculator.find_best_scoring_combination(
+            row[:num_dice].tolist()
+        )
+        assert (score, count) == (expected, len(scoring_dice))
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_vectorized_decisions_match_strategy(strategy: Strategy) -> None:
+    grid = np.meshgrid(np.arange(0, 1000, 50), np.arange(1, 7), [0, 7950, 8000])
+    round_scores, num_dice, totals = (axis.ravel() for axis in grid)
+    assert (
+        strategy.continue_mask(round_scores, num_dice, totals)
+        == Strategy.continue_mask(strategy, round_scores, num_dice, totals)
+    ).all()
+
+    for n in range(1, 7):
+        dice = all_rolls(n)
+        _, used = score_counts(count_faces(dice))
+        dice, used = dice[used > 0], used[used > 0]
+        rolled = np.full(len(dice), n)
+        round_scores = np.full(len(dice), 300)
+        assert (
+            strategy.keep_counts(dice, rolled, used, round_scores)
+            == Strategy.keep_counts(strategy, dice, rolled, used, round_scores)
+        ).all()
+        assert (
+            strategy.keep_counts(dice, rolled, used)
+            == strategy.keep_counts(dice, rolled, used, round_scores)
+        ).all(), "The round scores are optional"
+
+
+def test_simulate_matches_game() -> None:
+    random.seed(0)
+    games = play_games(STRATEGIES, 2000, target_score=3000)
+    result = simulate(STRATEGIES, 20000, seed=0, target_score=3000)
+
+    for rate, expected in zip(result.win_rates(), games.win_rates()):
+        error = np.sqrt(expected * (1 - expected) / games.n_games)
+        assert abs(rate - expected) < 4 * error
+    assert abs(result.rounds.mean() - games.rounds.mean()) < 0.5
+    scores, expected = result.final_scores.mean(axis=0), games.final_scores.mean(axis=0)
+    assert np.allclose(scores, expected, rtol=0.05)
+
+
+def test_simulate_custom_strategy_matches_game() -> None:
+    strategies = [CautiousStrategy(), ConservativeStrategy()]
+    random.seed(1)
+    games = play_games(strategies, 1000, target_score=2000)
+    result = simulate(strategies, 1000, seed=1, target_score=2000)
+    assert abs(result.win_rates()[0] - games.win_rates()[0]) < 0.07
+
+
+def test_simulate_is_reproducible() -> None:
+    first = simulate(STRATEGIES, 500, seed=42)
+    second = simulate(STRATEGIES, 500, seed=42)
+    assert (first.winners == second.winners).all()
+    assert (first.final_scores == second.final_scores).all()
+
+
+def test_simulate_results() -> None:
+    result = simulate(STRATEGIES, 1000, seed=3, target_score=5000)
+    assert result.n_games == 1000
+    assert result.wins().sum() == 1000
+    assert result.win_rates().sum() == pytest.approx(1.0)
+    assert (result.final_scores[np.arange(1000), result.winners] >= 5000).all()
+    assert (result.final_scores % 50 == 0).all()
+    assert sum(result.score_distribution(0).values()) == 1000
+
+
+def test_simulate_max_rounds() -> None:
+    result = simulate(STRATEGIES, 1000, seed=4, max_rounds=3)
+    assert result.rounds.max() == 3
+    best = result.final_scores.max(axis=1)
+    assert (result.final_scores[np.arange(1000), result.winners] == best).all()
+
+
+def test_simulate_no_games() -> None:
+    result = simulate(STRATEGIES, 0, seed=5)
+    assert result.n_games == 0
+    assert list(result.wins()) == [0, 0, 0]
+
+
+def test_simulate_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        simulate([], 10)
+    with pytest.raises(ValueError):
+        simulate(STRATEGIES, -1)
@@ -0,0 +1,151 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import csv
+import io
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from project.game.optimal import OptimalStrategy
+from project.game.strategies import (
+    ConservativeStrategy,
+    AggressiveStrategy,
+    BalancedStrategy,
+)
+from project.game.tournament import (
+    Tournament,
+    _play_task,
+    bradley_terry,
+    wilson_interval,
+)
+
+
+@pytest.fixture
+def strategies():
+    return [OptimalStrategy(), ConservativeStrategy(), AggressiveStrategy()]
+
+
+def run(tournament: Tournament):
+    with ThreadPoolExecutor(2) as executor:
+        return tournament.run(executor=executor)
+
+
+def test_tasks_cover_all_pairs_and_seats(strategies) -> None:
+    tournament = Tournament(strategies, n_games=101, seed=1, chunk_size=30)
+    tasks = tournament.tasks()
+    seats = {task[0] for task in tasks}
+    assert seats == {(0, 1), (1, 0), (0, 2), (2, 0), (1, 2), (2, 1)}
+    for table in [(0, 1), (0, 2), (1, 2)]:
+        games = sum(n for s, n, _ in tasks if sorted(s) == list(table))
+        assert games == 101
+    assert all(n <= 30 for _, n, _ in tasks)
+    assert len({seed for _, _, seed in tasks}) == len(tasks), "Independent streams"
+
+
+def test_results_are_reproducible(strategies) -> None:
+    first = run(Tournament(strategies, n_games=200, seed=5))
+    second = run(Tournament(strategies, n_games=200, seed=5))
+    assert (first.wins == second.wins).all()
+    state = random.getstate()
+    _play_task(strategies, 3, 8, 1500, None, "game")
+    assert random.getstate() == state, "Tasks must not use the global random"
+
+
+def test_process_pool_matches_threads(strategies) -> None:
+    tournament = Tournament(strategies, n_games=100, seed=2)
+    assert (tournament.run(max_workers=2).wins == run(tournament).wins).all()
+
+
+def test_pairwise_matrices(strategies) -> None:
+    result = run(Tournament(strategies, n_games=300, seed=3))
+    assert (result.games == 300 * (1 - np.eye(3))).all()
+    assert ((result.wins + result.wins.T)[~np.eye(3, dtype=bool)] == 300).all()
+    assert result.win_rates()[0] > 0.8
+    assert result.ratings()[0]["name"] == "OptimalStrategy"
+
+
+def test_multiplayer_tables() -> None:
+    strategies = [
+        OptimalStrategy(),
+        ConservativeStrategy(),
+        AggressiveStrategy(),
+        BalancedStrategy(),
+    ]
+    result = run(Tournament(strategies, n_games=90, table_size=3, seed=4))
+    assert len(result.tables) == 4
+    assert all(wins.sum() == 90 for wins in result.tables.values())
+    assert result.games[0, 1] == 180, "Two tables seat both strategies"
+    assert result.win_rates().sum() == pytest.approx(4 / 3)
+
+
+def test_game_engine(strategies) -> None:
+    result = run(
+        Tournament(strategies[:2], n_games=20, seed=6, engine="game", target_score=2000)
+    )
+    assert result.wins[0, 1] + result.wins[1, 0] == 20
+
+
+def test_game_engine_is_reproducible_with_threads(strategies) -> None:
+    tournament = Tournament(
+        strategies, n_games=12, seed=8, engine="game", target_score=1500, chunk_size=2
+    )
+    with ThreadPoolExecutor(4) as executor:
+        first = tournament.run(executor=executor)
+    with ThreadPoolExecutor(1) as executor:
+        second = tournament.run(executor=executor)
+    assert (first.wins == second.wins).all()
+    state = random.getstate()
+    _play_task(strategies, 3, 8, 1500, None, "game")
+    assert random.getstate() == state, "Tasks must not use the global random"
+
+
+def test_exports(strategies) -> None:
+    result = run(Tournament(strategies, n_games=100, seed=7))
+    data = json.loads(result.to_json())
+    assert data["strategies"] == [
+        "OptimalStrategy",
+        "ConservativeStrategy",
+        "AggressiveStrategy",
+    ]
+    assert len(data["pairs"]) == 3
+    rating = data["ratings"][0]
+    assert rating["ci_low"] <= rating["rating"] <= rating["ci_high"]
+
+    rows = list(csv.DictReader(io.StringIO(result.to_csv())))
+    assert len(rows) == 3
+    assert int(rows[0]["wins"]) + int(rows[0]["losses"]) == 100
+
+
+def test_default_names_are_unique() -> None:
+    tournament = Tournament([BalancedStrategy(), BalancedStrategy()], n_games=10)
+    assert tournament.names == ["BalancedStrategy#1", "BalancedStrategy#2"]
+
+
+def test_invalid_arguments(strategies) -> None:
+    with pytest.raises(ValueError):
+        Tournament(strategies, table_size=4)
+    with pytest.raises(ValueError):
+        Tournament(strategies, n_games=0)
+    with pytest.raises(ValueError):
+        Tournament(strategies, engine="fast")
+    with pytest.raises(ValueError):
+        Tournament(strategies, names=["a"])
+
+
+def test_wilson_interval() -> None:
+    low, high = wilson_interval(50, 100)
+    assert low < 0.5 < high
+    assert high - low == pytest.approx(0.19, abs=0.01)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_bradley_terry_recovers_odds() -> None:
+    wins = np.array([[0, 750], [250, 0]])
+    strengths = bradley_terry(wins)
+    assert strengths[0] / strengths[1] == pytest.approx(3, rel=0.01)
+    assert np.isfinite(bradley_terry(np.array([[0, 10], [0, 0]]))).all()
@@ -0,0 +1,185 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import random
+import pytest
+from typing import Any, Callable, List, Type
+from project.generators.aggregators import (
+    Aggregator,
+    Count,
+    Max,
+    Mean,
+    Min,
+    Quantile,
+    ReservoirSample,
+    Sum,
+    TopK,
+    reservoir_sample,
+    top_k,
+)
+from project.generators.generator import Pipeline
+
+
+@pytest.fixture
+def values() -> List[int]:
+    rng = random.Random(7)
+    return [rng.randint(-50, 50) for _ in range(500)]
+
+
+@pytest.mark.parametrize(
+    "aggregator, expected",
+    [
+        (Count, len),
+        (Sum, sum),
+        (Min, min),
+        (Max, max),
+        (Mean, lambda xs: sum(xs) / len(xs)),
+    ],
+)
+def test_aggregator_of_matches_builtin(
+    aggregator: Type[Aggregator],
+    expected: Callable[[List[int]], Any],
+    values: List[int],
+) -> None:
+    assert aggregator.of(values) == pytest.approx(expected(values))
+
+
+@pytest.mark.parametrize("aggregator", [Count, Sum, Min, Max, Mean])
+def test_aggregator_merge(aggregator: Type[Aggregator], values: List[int]) -> None:
+    left, right = aggregator(), aggregator()
+    for value in values[:200]:
+        left.add(value)
+    for value in values[200:]:
+        right.add(value)
+    left.merge(right)
+    assert left.result() == pytest.approx(aggregator.of(values))
+
+
+@pytest.mark.parametrize("aggregator, expected", [(Min, min), (Max, max)])
+def test_min_max_remove_oldest(
+    aggregator: Type[Min],
+    expected: Callable[[List[int]], Any],
+    values: List[int],
+) -> None:
+    window = 10
+    agg = aggregator()
+    for i, value in enumerate(values):
+        agg.add(value)
+        if i >= window:
+            agg.remove(values[i - window])
+        assert agg.result() == expected(values[max(0, i - window + 1) : i + 1])
+    assert isinstance(agg, Min)
+    assert len(agg.candidates) <= window
+
+
+def test_empty_aggregators() -> None:
+    assert Mean().result() is None
+    assert Min().result() is None
+    assert Quantile().result() is None
+
+
+@pytest.mark.parametrize("q", [0.0, 0.1, 0.5, 0.9, 1.0])
+def test_quantile_relative_accuracy(q: float) -> None:
+    rng = random.Random(3)
+    data: List[float] = [rng.lognormvariate(0, 2) for _ in range(5000)]
+    data += [-x for x in data[:1000]] + [0.0] * 100
+    expected = sorted(data)[int(q * (len(data) - 1))]
+
+    sketch = Quantile(q, relative_accuracy=0.01)
+    for value in data:
+        sketch.add(value)
+    assert sketch.result() == pytest.approx(expected, rel=0.011, abs=1e-12)
+    assert len(sketch.positive) + len(sketch.negative) < 2000
+
+
+def test_quantile_remove_and_merge() -> None:
+    left, right = Quantile(0.5), Quantile(0.5)
+    for value in range(1, 101):
+        left.add(value)
+    for value in range(101, 201):
+        right.add(value)
+    left.merge(right)
+    assert left.result() == pytest.approx(100, rel=0.01)
+
+    for value in range(1, 101):
+        left.remove(value)
+    assert left.result() == pytest.approx(150, rel=0.01)
+
+    with pytest.raises(ValueError):
+        left.merge(Quantile(0.5, relative_accuracy=0.1))
+    with pytest.raises(ValueError):
+        Quantile(1.5)
+
+
+def test_aggregator_with_pipeline() -> None:
+    assert Pipeline(range(1, 5)).aggregate(Mean.of) == 2.5
+    assert Pipeline(range(1, 101)).aggregate(Quantile.of, 0.5) == pytest.approx(
+        50, rel=0.01
+    )
+
+
+def word_length(word: str) -> int:
+    return len(word)
+
+
+@pytest.mark.parametrize("k", [0, 1, 10, 600])
+def test_top_k_matches_sorted(values: List[int], k: int) -> None:
+    assert top_k(values, k) == sorted(values, reverse=True)[:k]
+
+
+def test_top_k_key_ties_keep_stream_order() -> None:
+    words = ["bb", "a", "cc", "ddd", "e", "ff"]
+    assert top_k(words, 3, key=word_length) == ["ddd", "bb", "cc"]
+    assert Pipeline(words).aggregate(top_k, 4, key=word_length) == (
+        sorted(words, key=word_length, reverse=True)[:4]
+    )
+
+
+def test_top_k_merge(values: List[int]) -> None:
+    parts = [TopK(20, key=abs) for _ in range(3)]
+    for i, value in enumerate(values):
+        parts[i * 3 // len(values)].add(value)
+    merged = parts[0]
+    merged.merge(parts[1])
+    merged.merge(parts[2])
+    assert merged.result() == sorted(values, key=abs, reverse=True)[:20]
+    with pytest.raises(ValueError):
+        TopK(-1)
+
+
+def test_reservoir_sample_small_stream_and_seed() -> None:
+    assert sorted(reservoir_sample(range(5), 10, seed=1)) == [0, 1, 2, 3, 4]
+    first = reservoir_sample(range(10_000), 50, seed=3)
+    assert first == reservoir_sample(range(10_000), 50, seed=3)
+    assert len(set(first)) == 50
+    assert first == sorted(first)
+    with pytest.raises(ValueError):
+        ReservoirSample(-1)
+
+
+def test_reservoir_sample_is_uniform() -> None:
+    hits = [0] * 20
+    for seed in range(2000):
+        for value in reservoir_sample(range(20), 5, seed=seed):
+            hits[value] += 1
+    expected = 2000 * 5 / 20
+    assert all(abs(count - expected) < 0.15 * expected for count in hits)
+
+
+def test_reservoir_sample_merge_is_uniform() -> None:
+    hits = [0] * 20
+    for seed in range(2000):
+        left, right = ReservoirSample(5, seed), ReservoirSample(5, seed + 10_000)
+        for value in range(5):
+            left.add(value)
+        for value in range(5, 20):
+            right.add(value)
+        left.merge(right)
+        sample = left.result()
+        assert len(sample) == 5
+        for value in sample:
+            hits[value] += 1
+    expected = 2000 * 5 / 20
+    assert all(abs(count - expected) < 0.15 * expected for count in hits)
@@ -0,0 +1,136 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import os
+import pytest
+from functools import partial, reduce
+from operator import add
+from typing import Any, Iterator, List
+from project.generators.aggregators import Count, Sum, TopK
+from project.generators.checkpoint import as_operator
+from project.generators.external import GroupBy
+from project.generators.generator import Pipeline, Plan
+from project.generators.sequences import LazyRange
+from project.generators.windows import CountWindow
+
+
+class Crash(Exception):
+    pass
+
+
+def add_one(x: int) -> int:
+    return x + 1
+
+
+def is_odd(x: int) -> bool:
+    return x % 2 == 1
+
+
+def is_late(x: int) -> bool:
+    return x >= 50
+
+
+def last_digit(x: int) -> int:
+    return x % 10
+
+
+def crashing(data: List[int], after: int) -> Iterator[int]:
+    for i, x in enumerate(data):
+        if i == after:
+            raise Crash()
+        yield x
+
+
+def test_checkpointed_run_without_crash(tmp_path: Path) -> None:
+    path = str(tmp_path / "job.ckpt")
+    plan = Plan().pipe_step(map, add_one).pipe_step(filter, is_odd)
+    assert plan.run_checkpointed(range(1000), path, Sum, every=100) == sum(
+        x for x in range(1, 1001) if x % 2
+    )
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("crash_at", [0, 99, 250, 999])
+def test_resume_counts_every_element_once(tmp_path: Path, crash_at: int) -> None:
+    path = str(tmp_path / "job.ckpt")
+    data = list(range(1000))
+    plan = (
+        Plan()
+        .pipe_step(map, add_one)
+        .pipe_step(enumerate, start=1)
+        .pipe_step(GroupBy(lambda pair: pair[1] % 7, Count, max_keys=3))
+    )
+    expected = sorted(plan.run(data))
+
+    with pytest.raises(Crash):
+        plan.run_checkpointed(crashing(data, crash_at), path, partial(TopK, 10), 100)
+    # GroupBy spills from the fourth key on, which saves a checkpoint
+    assert os.path.exists(path) == (crash_at > 0)
+    result = plan.run_checkpointed(data, path, partial(TopK, 10), every=100)
+    assert sorted(result) == expected
+    assert not os.path.exists(path)
+
+
+def test_resume_with_window_and_reduce(tmp_path: Path) -> None:
+    path = str(tmp_path / "job.ckpt")
+    data = LazyRange(0, 5000)
+    plan = Plan().pipe_step(CountWindow(10, Sum)).pipe_step(reduce, add, 0)
+    for crash_at in (1234, 3456):
+        with pytest.raises(Crash):
+            plan.run_checkpointed(crashing(list(data), crash_at), path, Sum, 500)
+    assert plan.run_checkpointed(data, path, Sum, every=500) == sum(range(5000))
+
+
+def test_resume_reduce_without_initial_value(tmp_path: Path) -> None:
+    path = str(tmp_path / "job.ckpt")
+    # No element reaches reduce before the checkpoints of the crashed run
+    plan = Plan().pipe_step(filter, is_late).pipe_step(reduce, add)
+    with pytest.raises(Crash):
+        plan.run_checkpointed(crashing(list(range(100)), 42), path, Sum, every=10)
+    assert os.path.exists(path)
+    assert plan.run_checkpointed(range(100), path, Sum, every=10) == sum(range(50, 100))
+    with pytest.raises(TypeError):
+        plan.run_checkpointed([], path, Sum)
+
+
+def test_resume_removes_every_spilled_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "job.ckpt")
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    data = list(range(1000))
+    plan = Plan().pipe_step(
+        GroupBy(last_digit, Count, max_keys=2, spill_dir=str(spill_dir))
+    )
+    with pytest.raises(Crash):
+        plan.run_checkpointed(crashing(data, 250), path, partial(TopK, 10), 100)
+    assert os.listdir(spill_dir) != []
+    result = plan.run_checkpointed(data, path, partial(TopK, 10), every=100)
+    assert sorted(result) == [(digit, 100) for digit in range(10)]
+    assert os.listdir(spill_dir) == []
+
+
+def test_pipeline_run_checkpointed(tmp_path: Path) -> None:
+    path = str(tmp_path / "job.ckpt")
+    pipeline = Pipeline(list(range(100))).pipe_step(map, last_digit)
+    assert pipeline.run_checkpointed(path, Count, every=7) == 100
+
+
+def test_checkpoint_of_other_plan_is_rejected(tmp_path: Path) -> None:
+    path = str(tmp_path / "job.ckpt")
+    with pytest.raises(Crash):
+        Plan().pipe_step(map, add_one).run_checkpointed(
+            crashing(list(range(100)), 50), path, Sum, every=10
+        )
+    with pytest.raises(ValueError):
+        Plan().pipe_step(map, last_digit).run_checkpointed(range(100), path, Sum)
+
+
+def test_unsupported_steps() -> None:
+    with pytest.raises(ValueError):
+        as_operator((sorted, (), {}))
+    with pytest.raises(ValueError):
+        Plan().pipe_step(sorted).run_checkpointed([1], "unused", Sum)
+    with pytest.raises(ValueError):
+        Plan().run_checkpointed([1], "unused", Sum, every=0)
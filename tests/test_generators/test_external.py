@@ -0,0 +1,157 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import os
+import random
+import pytest
+from collections import defaultdict
+from typing import Any, Dict, Generator, List, Tuple
+from project.generators.aggregators import Count, Max, Mean, Sum
+from project.generators.external import (
+    ExternalSort,
+    GroupBy,
+    GroupByStats,
+    group_by,
+    read_run,
+    sort,
+    write_run,
+)
+from project.generators.generator import Pipeline
+
+
+def modulo_ten(x: int) -> int:
+    return x % 10
+
+
+def tens(x: int) -> int:
+    return x // 10
+
+
+def first(pair: Tuple[str, int]) -> str:
+    return pair[0]
+
+
+def second(pair: Tuple[str, int]) -> int:
+    return pair[1]
+
+
+@pytest.fixture
+def pairs() -> List[Tuple[str, int]]:
+    rng = random.Random(5)
+    return [(f"k{rng.randint(0, 300)}", rng.randint(0, 1000)) for _ in range(5000)]
+
+
+def test_run_file_roundtrip(tmp_path: Path) -> None:
+    path = write_run(range(3000), str(tmp_path))
+    assert list(read_run(path)) == list(range(3000))
+
+
+def test_group_by_in_memory_keeps_first_seen_order() -> None:
+    result: List[Tuple[int, Any]] = (
+        Pipeline([3, 13, 5, 23, 15]).pipe_step(group_by, modulo_ten, Count).aggregate()
+    )
+    assert result == [(3, 3), (5, 2)]
+
+
+@pytest.mark.parametrize("max_keys", [3, 50, 1000])
+def test_group_by_with_spill_matches_dict(
+    pairs: List[Tuple[str, int]], max_keys: int, tmp_path: Path
+) -> None:
+    expected: Dict[str, List[int]] = defaultdict(list)
+    for key, value in pairs:
+        expected[key].append(value)
+
+    operator = GroupBy(
+        first, Mean, value=second, max_keys=max_keys, spill_dir=str(tmp_path)
+    )
+    it, stats = operator.run(pairs)
+    result: List[Tuple[str, Any]] = list(it)
+
+    assert dict(result) == pytest.approx(
+        {key: sum(values) / len(values) for key, values in expected.items()}
+    )
+    assert len(result) == len(expected)
+    assert stats.peak_keys <= max_keys
+    if max_keys < len(expected):
+        assert [key for key, _ in result] == sorted(expected)
+        assert stats.spills > 0
+        assert stats.spilled_bytes > 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_group_by_cleans_up_when_not_finished(tmp_path: Path) -> None:
+    it: Generator[Any, None, None] = group_by(  # type: ignore[assignment]
+        iter(range(100)), modulo_ten, Max, max_keys=2, spill_dir=str(tmp_path)
+    )
+    assert next(it) == (0, 90)
+    assert os.listdir(tmp_path) != []
+    it.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_group_by_stats_dict() -> None:
+    operator = GroupBy(tens, Sum, max_keys=4)
+    it, stats = operator.run(range(100))
+    assert list(it) == [(k, 100 * k + 45) for k in range(10)]
+    assert stats.as_dict()["peak_keys"] == 4
+    assert stats.as_dict()["spills"] == 2
+
+    with pytest.raises(ValueError):
+        GroupBy(modulo_ten, Sum, max_keys=0)
+
+
+def test_group_by_step_reports_stats(tmp_path: Path) -> None:
+    stats = GroupByStats()
+    pipeline: Pipeline = Pipeline(range(100)).pipe_step(
+        group_by, tens, Sum, stats=stats, max_keys=4, spill_dir=str(tmp_path)
+    )
+    assert stats.spills == 0
+    assert pipeline.aggregate() == [(k, 100 * k + 45) for k in range(10)]
+    assert stats.peak_keys == 4
+    assert stats.spills == 2
+    assert stats.spilled_keys == 8
+
+
+@pytest.mark.parametrize("memory_limit", [7, 999, 5000])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_external_sort_matches_sorted(
+    pairs: List[Tuple[str, int]], memory_limit: int, reverse: bool, tmp_path: Path
+) -> None:
+    operator = ExternalSort(second, memory_limit, reverse, str(tmp_path))
+    it, stats = operator.run(pairs)
+
+    assert list(it) == sorted(pairs, key=second, reverse=reverse)
+    assert stats.runs == len(pairs) // memory_limit
+    assert stats.as_dict()["spilled_bytes"] > 0 or stats.runs == 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_interleaved_runs_keep_their_own_stats(tmp_path: Path) -> None:
+    operator = GroupBy(tens, Sum, max_keys=2, spill_dir=str(tmp_path))
+    small, small_stats = operator.run(range(30))
+    large, large_stats = operator.run(range(100))
+    assert next(large) == (0, 45)
+    assert list(small) == [(k, 100 * k + 45) for k in range(3)]
+    assert small_stats.spills == 1
+    assert list(large)[-1] == (9, 945)
+    assert large_stats.spills == 4
+
+
+def test_sort_step_is_lazy(tmp_path: Path) -> None:
+    data: List[int] = list(range(1000, 0, -1))
+    it = iter(
+        Pipeline(data)
+        .pipe_step(sort, memory_limit=100, spill_dir=str(tmp_path))
+        .pipe_step(enumerate)
+    )
+    assert next(it) == (0, 1)
+    assert len(os.listdir(tmp_path)) == 10
+    assert list(it)[-1] == (999, 1000)
+    assert os.listdir(tmp_path) == []
+
+
+def test_sort_validates_memory_limit() -> None:
+    with pytest.raises(ValueError):
+        ExternalSort(memory_limit=0)
@@ -0,0 +1,120 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import threading
+import pytest
+from functools import partial
+from typing import Any, Iterable, Iterator, List
+from project.generators.aggregators import Mean
+from project.generators.fanout import fan_out
+from project.generators.generator import Pipeline, Plan
+
+
+def add_one(x: int) -> int:
+    return x + 1
+
+
+def is_even(x: int) -> bool:
+    return x % 2 == 0
+
+
+def first(iterable: Iterable[int]) -> int:
+    return next(iter(iterable))
+
+
+def count(iterable: Iterable[Any]) -> int:
+    return sum(1 for _ in iterable)
+
+
+def broken(iterable: Iterable[int]) -> int:
+    for x in iterable:
+        if x == 500:
+            raise KeyError(x)
+    return 0
+
+
+def test_fan_out_results_in_order() -> None:
+    data = range(10_000)
+    assert fan_out(data, sum, max, min, count, Mean.of) == (
+        sum(data),
+        9999,
+        0,
+        10_000,
+        4999.5,
+    )
+
+
+def test_fan_out_computes_source_once() -> None:
+    calls: List[int] = []
+
+    def source() -> Iterator[int]:
+        for x in range(1000):
+            calls.append(x)
+            yield x
+
+    pipeline = Pipeline(source()).pipe_step(map, add_one)
+    evens = partial(Plan().pipe_step(filter, is_even).aggregate, aggregator=list)
+    total, even = pipeline.fan_out(sum, evens, batch_size=7, capacity=2)
+    assert total == sum(range(1, 1001))
+    assert even == list(range(2, 1001, 2))
+    assert len(calls) == 1000
+
+
+def test_fan_out_buffer_limit_while_blocked() -> None:
+    produced: List[int] = []
+    release = threading.Event()
+    seen: List[int] = []
+
+    def source() -> Iterator[int]:
+        for x in range(10_000):
+            produced.append(x)
+            yield x
+
+    def slow(iterable: Iterable[int]) -> int:
+        release.wait()
+        return count(iterable)
+
+    def worker() -> None:
+        seen.append(fan_out(source(), slow, capacity=2, batch_size=10)[0])
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join(0.3)
+    assert len(produced) <= 2 * 10 + 10
+    release.set()
+    thread.join()
+    assert seen == [10_000]
+
+
+def test_fan_out_early_stopping_branch() -> None:
+    assert fan_out(range(5000), first, sum, batch_size=16, capacity=1) == (
+        0,
+        sum(range(5000)),
+    )
+
+
+def test_fan_out_branch_error() -> None:
+    with pytest.raises(KeyError):
+        fan_out(range(100_000), sum, broken, batch_size=10, capacity=1)
+
+
+def test_fan_out_source_error() -> None:
+    def source() -> Iterator[int]:
+        yield 1
+        raise ValueError("source")
+
+    with pytest.raises(ValueError):
+        fan_out(source(), sum, count)
+
+
+def test_fan_out_as_step() -> None:
+    plan = Plan().pipe_step(map, add_one).pipe_step(fan_out, sum, max)
+    assert list(plan.run(range(10))) == [55, 10]
+    assert Plan().fan_out(range(4), list, count) == ([0, 1, 2, 3], 4)
+
+
+def test_fan_out_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        fan_out(range(3), sum, capacity=0)
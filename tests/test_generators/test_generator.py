@@ -5,8 +5,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import pytest
 from typing import Generator, List, Any, Tuple, Set, Callable, Iterable, Iterator
-from project.generators.generator import Pipeline, data_generator
+from project.generators.generator import (
+    Pipeline,
+    Plan,
+    data_generator,
+    spawn_seeds,
+    vmap,
+    vfilter,
+)
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
+from operator import add
+import numpy as np
+import pickle
 
 # Auxiliary functions with type annotations instead of lambdas
 def multiply_by_two(x: int) -> int:
@@ -83,24 +94,65 @@ def string_data() -> List[str]:
 
 # Tests for data_generator
 def test_data_generator_range() -> None:
-    gen: Generator[int, None, None] = data_generator(1, 6, 1, "range")
+    gen: Iterable[int] = data_generator(1, 6, 1, "range")
     result: List[int] = list(gen)
     assert result == [1, 2, 3, 4, 5]
 
 
 def test_data_generator_fibonacci() -> None:
-    gen: Generator[int, None, None] = data_generator(0, 20, 1, "fibonacci")
+    gen: Iterable[int] = data_generator(0, 20, 1, "fibonacci")
     result: List[int] = list(gen)
     assert result == [0, 1, 1, 2, 3, 5, 8, 13]
 
 
 def test_data_generator_random() -> None:
-    gen: Generator[int, None, None] = data_generator(1, 6, 1, "random")
+    gen: Iterable[int] = data_generator(1, 6, 1, "random")
     result: List[int] = list(gen)
     assert len(result) == 5
     assert all(1 <= x <= 5 for x in result)
 
 
+def test_data_generator_random_seeded() -> None:
+    first: List[int] = list(data_generator(0, 100, 1, "random", seed=42))
+    second: List[int] = list(data_generator(0, 100, 1, "random", seed=42))
+    assert first == second
+    assert all(0 <= x < 100 for x in first)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1000])
+def test_data_generator_random_bulk(block_size: int) -> None:
+    values: List[int] = list(
+        data_generator(10, 1010, 2, "random", seed=1, block_size=block_size)
+    )
+    assert len(values) == 500
+    assert all(type(x) is int and 10 <= x < 1010 for x in values)
+    assert values == list(data_generator(10, 1010, 2, "random", seed=1, block_size=1))
+
+
+def test_data_generator_random_chunked() -> None:
+    blocks: List[np.ndarray] = list(
+        data_generator(0, 1000, 1, "random", seed=3, block_size=300, chunked=True)
+    )
+    assert [len(block) for block in blocks] == [300, 300, 300, 100]
+    assert np.concatenate(blocks).tolist() == list(
+        data_generator(0, 1000, 1, "random", seed=3, block_size=300)
+    )
+
+
+def test_spawned_seeds_give_independent_reproducible_streams() -> None:
+    def streams() -> List[List[int]]:
+        return [
+            list(
+                data_generator(0, 10**9, 10**7, "random", seed=seed, block_size=64)
+            )
+            for seed in spawn_seeds(2024, 4)
+        ]
+
+    first = streams()
+    assert first == streams()
+    assert len({tuple(stream) for stream in first}) == 4
+
+
 # Pipeline tests with direct function calls
 def test_pipeline_single_map_step(sample_list_data: List[int]) -> None:
     pipeline: Pipeline = Pipeline(sample_list_data)
@@ -284,3 +336,298 @@ def test_pipeline_custom_function(sample_list_data: List[int]) -> None:
     pipeline: Pipeline = Pipeline(sample_list_data)
     result: List[int] = pipeline.pipe_step(custom_multiplier, 3).aggregate()
     assert result == [3, 6, 9, 12, 15]
+
+
+# Step fusion tests
+@pytest.mark.parametrize("fuse", [True, False])
+def test_pipeline_fused_matches_unfused(fuse: bool) -> None:
+    pipeline: Pipeline = Pipeline(range(20), fuse=fuse)
+    result: List[Tuple[int, int]] = (
+        pipeline.pipe_step(map, add_one)
+        .pipe_step(filter, is_even)
+        .pipe_step(map, multiply_by_three)
+        .pipe_step(filter, None)
+        .pipe_step(enumerate)
+        .pipe_step(map, sum)
+        .aggregate()
+    )
+    assert result == [i + 6 * (i + 1) for i in range(10)]
+
+
+def test_pipeline_fuses_consecutive_map_filter_steps() -> None:
+    pipeline: Pipeline = (
+        Pipeline(range(10))
+        .pipe_step(map, add_one)
+        .pipe_step(filter, is_even)
+        .pipe_step(map, multiply_by_two)
+        .pipe_step(enumerate)
+        .pipe_step(map, sum)
+    )
+    assert len(pipeline.compile()) == 3
+    assert len(Pipeline(range(10), fuse=False).pipe_step(map, add_one).compile()) == 1
+
+
+def test_pipeline_compiled_plan_is_cached() -> None:
+    pipeline: Pipeline = Pipeline([1, 2, 3]).pipe_step(map, add_one)
+    stages = pipeline.compile()
+    assert pipeline.compile() is stages
+
+    pipeline.pipe_step(filter, is_even)
+    assert pipeline.compile() is not stages
+    assert pipeline.aggregate() == [2, 4]
+
+
+def test_pipeline_map_with_several_iterables_is_not_fused() -> None:
+    pipeline: Pipeline = Pipeline([1, 2, 3]).pipe_step(map, sum_reducer, [10, 20, 30])
+    assert pipeline.aggregate() == [11, 22, 33]
+
+
+# Chunked execution tests
+def double_array(x: np.ndarray) -> np.ndarray:
+    return x * 2
+
+
+def even_mask(x: np.ndarray) -> np.ndarray:
+    return x % 2 == 0
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 3, 1024])
+def test_pipeline_chunked_matches_element_mode(chunk_size: Any) -> None:
+    pipeline: Pipeline = Pipeline(data_generator(0, 10), chunk_size=chunk_size)
+    result: List[int] = (
+        pipeline.pipe_step(vfilter, even_mask)
+        .pipe_step(vmap, double_array)
+        .pipe_step(map, add_one)
+        .pipe_step(enumerate)
+        .pipe_step(map, sum)
+        .aggregate()
+    )
+    assert result == [1, 6, 11, 16, 21]
+
+
+def test_pipeline_chunked_yields_python_objects() -> None:
+    result: List[int] = (
+        Pipeline(np.arange(5), chunk_size=2).pipe_step(vmap, double_array).aggregate()
+    )
+    assert result == [0, 2, 4, 6, 8]
+    assert all(type(x) is int for x in result)
+
+
+def test_vmap_and_vfilter_as_element_steps() -> None:
+    result: List[float] = (
+        Pipeline([1, 4, 9, 16]).pipe_step(vmap, np.sqrt).pipe_step(reduce, sum_reducer)
+    ).aggregate()
+    assert result == [10.0]
+    assert list(vfilter(even_mask, range(7), chunk_size=2)) == [0, 2, 4, 6]
+
+
+def test_pipeline_chunked_rejects_bad_chunk_size() -> None:
+    with pytest.raises(ValueError):
+        Pipeline([1, 2], chunk_size=0).pipe_step(vmap, double_array).aggregate()
+
+
+def test_pipeline_iter_chunks() -> None:
+    pipeline: Pipeline = Pipeline(range(10), chunk_size=4).pipe_step(vmap, double_array)
+    chunks: List[Any] = list(pipeline.iter_chunks())
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert sum(int(chunk.sum()) for chunk in chunks) == 90
+
+    pipeline.pipe_step(enumerate)
+    assert [len(chunk) for chunk in pipeline.iter_chunks()] == [4, 4, 2]
+
+    with pytest.raises(ValueError):
+        Pipeline(range(10)).iter_chunks()
+
+
+# Plan tests
+def test_plan_is_immutable() -> None:
+    plan: Plan = Plan().pipe_step(map, add_one)
+    extended: Plan = plan.pipe_step(filter, is_even)
+
+    assert len(plan) == 1
+    assert len(extended) == 2
+    with pytest.raises(AttributeError):
+        plan.fuse = False  # type: ignore[misc]
+
+
+def test_plan_is_hashable() -> None:
+    first: Plan = Plan().pipe_step(map, add_one).pipe_step(enumerate, start=1)
+    second: Plan = Plan().pipe_step(map, add_one).pipe_step(enumerate, start=1)
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first != second.pipe_step(filter, is_even)
+    assert len({first, second}) == 1
+
+
+def test_plan_with_unhashable_args_is_hashable() -> None:
+    first: Plan = Plan().pipe_step(reduce, add, [0])
+    second: Plan = Plan().pipe_step(reduce, add, [0])
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second, first.pipe_step(map, add_one)}) == 2
+
+
+def test_plan_with_array_args_compares() -> None:
+    weights = np.arange(3)
+    first: Plan = Plan().pipe_step(vmap, np.multiply, weights)
+    same: Plan = Plan().pipe_step(vmap, np.multiply, weights)
+    other: Plan = Plan().pipe_step(vmap, np.multiply, np.arange(3))
+
+    assert first == same
+    assert first != other
+    assert first != Plan().pipe_step(vmap, np.multiply, np.arange(4))
+    assert first != first.pipe_step(map, add_one)
+    assert len({first, same, other}) == 2
+
+
+def test_pipeline_steps_is_a_snapshot() -> None:
+    pipeline: Pipeline = Pipeline(range(3)).pipe_step(map, add_one)
+    steps = pipeline.steps
+
+    assert isinstance(steps, tuple)
+    pipeline.pipe_step(filter, is_even)
+    assert len(steps) == 1
+    assert len(pipeline.steps) == 2
+
+
+def test_plan_runs_against_many_sources() -> None:
+    plan: Plan = Plan().pipe_step(filter, is_even).pipe_step(map, multiply_by_ten)
+    stages = plan.compile()
+
+    assert list(plan.run([1, 2, 3, 4])) == [20, 40]
+    assert list(plan.run(data_generator(0, 5))) == [0, 20, 40]
+    assert plan.aggregate(range(7), sum) == 120
+    assert plan.compile() is stages
+
+
+def test_plan_shared_across_threads() -> None:
+    plan: Plan = Plan().pipe_step(map, multiply_by_two).pipe_step(filter, is_even)
+    sources: List[range] = [range(n) for n in range(50)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results: List[int] = list(pool.map(lambda r: plan.aggregate(r, sum), sources))
+
+    assert results == [n * (n - 1) for n in range(50)]
+
+
+def test_plan_pickle_roundtrip() -> None:
+    plan: Plan = Plan(chunk_size=4).pipe_step(map, abs).pipe_step(enumerate, start=1)
+    plan.compile()
+    restored: Plan = pickle.loads(pickle.dumps(plan))
+
+    assert restored == plan
+    assert list(restored.run([-1, 2, -3])) == [(1, 1), (2, 2), (3, 3)]
+
+
+def test_pipeline_refuses_to_reuse_exhausted_iterator(
+    sample_generator_data: Generator[int, None, None]
+) -> None:
+    pipeline: Pipeline = Pipeline(sample_generator_data).pipe_step(map, add_one)
+    assert pipeline.aggregate() == [2, 3, 4, 5, 6]
+    with pytest.raises(RuntimeError):
+        pipeline.aggregate()
+
+
+def test_pipeline_over_reiterable_source_can_run_twice(
+    sample_list_data: List[int],
+) -> None:
+    pipeline: Pipeline = Pipeline(sample_list_data).pipe_step(map, add_one)
+    assert pipeline.aggregate() == pipeline.aggregate() == [2, 3, 4, 5, 6]
+
+
+def counting_source(
+    pulled: List[int], closed: List[bool], n: int
+) -> Generator[int, None, None]:
+    try:
+        for x in range(n):
+            pulled.append(x)
+            yield x
+    finally:
+        closed.append(True)
+
+
+def test_take_stops_upstream_but_leaves_source_open() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    source = counting_source(pulled, closed, 1000)
+    pipeline: Pipeline = (
+        Pipeline(source).pipe_step(map, multiply_by_two).take(3).pipe_step(reduce, add)
+    )
+    assert list(pipeline) == [0 + 2 + 4]
+    assert pulled == [0, 1, 2]
+    assert closed == []
+    assert next(source) == 3
+    source.close()
+    assert closed == [True]
+
+
+def test_first_leaves_file_open(tmp_path: Path) -> None:
+    path = tmp_path / "lines.txt"
+    path.write_text("a\nb\nc\n")
+    with open(path) as file:
+        assert Pipeline(file).take(1).first() == "a\n"
+        assert not file.closed
+        assert file.readline() == "b\n"
+
+
+def test_take_closes_steps_created_by_the_plan() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+
+    def step(iterable: Iterable[int]) -> Iterator[int]:
+        return counting_source(pulled, closed, 1000)
+
+    assert list(Plan().pipe_step(step).take(2).run([])) == [0, 1]
+    assert closed == [True]
+
+
+def test_take_zero_and_negative() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    assert list(Pipeline(counting_source(pulled, closed, 10)).take(0)) == []
+    assert pulled == []
+    with pytest.raises(ValueError):
+        list(Pipeline(range(3)).take(-1))
+
+
+def test_take_while() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    plan: Plan = Plan().pipe_step(map, multiply_by_ten).take_while(lambda x: x < 50)
+    source = counting_source(pulled, closed, 100)
+    assert list(plan.run(source)) == [0, 10, 20, 30, 40]
+    assert pulled == [0, 1, 2, 3, 4, 5]
+    assert closed == []
+    assert next(source) == 6
+
+
+def test_first() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    source = counting_source(pulled, closed, 100)
+    pipeline: Pipeline = Pipeline(source).pipe_step(filter, lambda x: x > 4)
+    assert pipeline.first() == 5
+    assert pulled == [0, 1, 2, 3, 4, 5]
+    assert closed == []
+    assert Plan().first(source) == 6
+    assert closed == []
+    assert Plan().pipe_step(filter, is_even).first([1, 3], default=None) is None
+    with pytest.raises(ValueError):
+        Plan().first([])
+
+
+def test_take_leaves_staged_run_to_its_owner() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    run = (
+        Plan()
+        .pipe_step(map, add_one)
+        .run_staged(counting_source(pulled, closed, 10**6), capacity=2)
+    )
+    with run:
+        assert list(Pipeline(run).take(5)) == [1, 2, 3, 4, 5]
+        assert next(run) == 6
+    assert all(not thread.is_alive() for thread in run._threads)
+    assert len(pulled) < 100
@@ -0,0 +1,185 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import random
+import pytest
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from project.generators.external import sort
+from project.generators.generator import Pipeline, Plan
+from project.generators.joins import (
+    build_side,
+    hash_join,
+    join,
+    known_length,
+    merge_join,
+)
+from project.generators.sequences import LazyRange
+
+Row = Tuple[int, str]
+
+
+def first_field(row: Tuple[Any, ...]) -> Any:
+    return row[0]
+
+
+def itself(value: Any) -> Any:
+    return value
+
+
+def user_of(order: Dict[str, Any]) -> int:
+    return order["user"]
+
+
+def naive_join(
+    left: List[Any], right: List[Any], how: str = "inner"
+) -> List[Tuple[Any, Optional[Any]]]:
+    pairs: List[Tuple[Any, Optional[Any]]] = []
+    for row in left:
+        matches = [match for match in right if match[0] == row[0]]
+        pairs.extend((row, match) for match in matches)
+        if not matches and how == "left":
+            pairs.append((row, None))
+    return pairs
+
+
+@pytest.fixture
+def sides() -> Tuple[List[Row], List[Row]]:
+    rng = random.Random(5)
+    left = [(rng.randint(0, 30), f"l{i}") for i in range(200)]
+    right = [(rng.randint(10, 40), f"r{i}") for i in range(60)]
+    return left, right
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+def test_hash_join_build_right_keeps_left_order(
+    sides: Tuple[List[Row], List[Row]], how: str
+) -> None:
+    left, right = sides
+    result = list(hash_join(iter(left), right, first_field, first_field, how))
+    assert result == naive_join(left, right, how)
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+def test_hash_join_build_left(sides: Tuple[List[Row], List[Row]], how: str) -> None:
+    left, right = sides
+    result = list(hash_join(left, right, first_field, first_field, how, "left"))
+    assert sorted(result, key=repr) == sorted(naive_join(left, right, how), key=repr)
+    auto = list(hash_join(right, left, first_field, first_field, how))
+    assert sorted(auto, key=repr) == sorted(naive_join(right, left, how), key=repr)
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+def test_merge_join_matches_hash_join(
+    sides: Tuple[List[Row], List[Row]], how: str
+) -> None:
+    left, right = (sorted(side, key=first_field) for side in sides)
+    result = list(merge_join(iter(left), iter(right), first_field, first_field, how))
+    assert result == naive_join(left, right, how)
+
+
+def test_merge_join_duplicates_on_both_sides() -> None:
+    left = [(1, "a"), (1, "b"), (2, "c"), (4, "d")]
+    right = [(0, "x"), (1, "y"), (1, "z"), (3, "w"), (4, "v"), (4, "u")]
+    expected = [
+        ((1, "a"), (1, "y")),
+        ((1, "a"), (1, "z")),
+        ((1, "b"), (1, "y")),
+        ((1, "b"), (1, "z")),
+        ((2, "c"), None),
+        ((4, "d"), (4, "v")),
+        ((4, "d"), (4, "u")),
+    ]
+    assert list(merge_join(left, right, first_field, first_field, "left")) == expected
+
+
+def test_merge_join_streams_both_sides() -> None:
+    def numbers(n: int) -> Iterator[Tuple[int]]:
+        for i in range(n):
+            yield (i,)
+
+    result = merge_join(numbers(10**9), numbers(10**9), first_field, first_field)
+    assert [next(result) for _ in range(3)] == [
+        ((0,), (0,)),
+        ((1,), (1,)),
+        ((2,), (2,)),
+    ]
+
+
+def test_merge_join_rejects_unsorted_input() -> None:
+    with pytest.raises(ValueError):
+        list(merge_join([(2,), (1,)], [(1,)], first_field, first_field))
+    with pytest.raises(ValueError):
+        list(merge_join([(5,)], [(3,), (1,)], first_field, first_field))
+
+
+def test_pipeline_join() -> None:
+    users = Pipeline([(1, "ann"), (2, "bob"), (3, "eve")])
+    orders = [
+        {"user": 2, "total": 10},
+        {"user": 1, "total": 5},
+        {"user": 4, "total": 1},
+    ]
+    joined = Pipeline(orders).join(users, user_of, first_field, how="left")
+    assert list(joined) == [
+        (orders[0], (2, "bob")),
+        (orders[1], (1, "ann")),
+        (orders[2], None),
+    ]
+
+
+def test_plan_merge_join_after_sort() -> None:
+    right = [(i, i * i) for i in range(0, 20, 2)]
+    plan = (
+        Plan().pipe_step(sort, first_field).join(right, first_field, algorithm="merge")
+    )
+    data = [(i,) for i in (7, 2, 9, 4, 4)]
+    assert list(plan.run(data)) == [
+        ((2,), (2, 4)),
+        ((4,), (4, 16)),
+        ((4,), (4, 16)),
+    ]
+
+
+def test_join_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        join([], [], first_field, how="outer")
+    with pytest.raises(ValueError):
+        join([], [], first_field, algorithm="nested")
+    with pytest.raises(ValueError):
+        join([], [], first_field, build="middle")
+
+
+def test_pipeline_join_builds_the_shorter_side() -> None:
+    users = [(2, "bob"), (1, "ann")]
+    numbers = Pipeline(LazyRange(10**6))
+    joined = Pipeline(users).join(numbers, first_field, itself)
+    assert joined.steps[-1][1][-1] == "left"
+    # the left side is held in memory, so pairs follow the right order
+    assert list(joined.take(2)) == [((1, "ann"), 1), ((2, "bob"), 2)]
+    reversed_join = numbers.join(Pipeline(users), itself, first_field)
+    assert reversed_join.steps[-1][1][-1] == "right"
+
+
+def test_pipeline_join_unknown_length_builds_right() -> None:
+    users = [(2, "bob"), (1, "ann")]
+    filtered = Pipeline(range(10)).pipe_step(filter, None)
+    joined = Pipeline(users).join(filtered, first_field, itself)
+    assert joined.steps[-1][1][-1] == "right"
+    assert list(joined) == [((2, "bob"), 2), ((1, "ann"), 1)]
+    forced = Pipeline(users).join(
+        Pipeline(range(10)).pipe_step(filter, None),
+        first_field,
+        itself,
+        build="left",
+    )
+    assert list(forced) == [((1, "ann"), 1), ((2, "bob"), 2)]
+
+
+def test_known_length() -> None:
+    assert known_length([1, 2]) == 2
+    assert known_length(LazyRange(2**70)) == 2**70
+    assert known_length(iter([1, 2])) is None
+    assert build_side(2, 2**70) == "left"
+    assert build_side(None, 3) == "right"
@@ -0,0 +1,75 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import operator
+import pytest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from typing import Any, List
+from project.generators.generator import Pipeline, Plan
+from project.generators.parallel import tree_reduce
+
+
+def test_pipeline_parallel_reduce_sum() -> None:
+    result: List[int] = (
+        Pipeline(range(100_000))
+        .pipe_step(
+            reduce,
+            operator.add,
+            parallel=True,
+            associative=True,
+            chunk_size=5_000,
+            max_workers=2,
+        )
+        .aggregate()
+    )
+    assert result == [sum(range(100_000))]
+
+
+def test_parallel_reduce_merges_counters() -> None:
+    words: List[Counter] = [Counter(word) for word in ["abc", "bcd", "cde"] * 300]
+    plan: Plan = Plan().pipe_step(
+        reduce, operator.add, parallel=True, associative=True, chunk_size=7
+    )
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert tree_reduce(operator.add, words, chunk_size=7, executor=pool) == sum(
+            words, Counter()
+        )
+    assert list(plan.run(words)) == [sum(words, Counter())]
+
+
+@pytest.mark.parametrize("size, chunk_size", [(1, 1), (10, 3), (100, 1), (257, 16)])
+def test_tree_reduce_keeps_order_of_non_commutative_operator(
+    size: int, chunk_size: int
+) -> None:
+    letters: List[str] = [chr(ord("a") + i % 26) for i in range(size)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        result: Any = tree_reduce(
+            operator.add, letters, ">", chunk_size=chunk_size, executor=pool
+        )
+    assert result == ">" + "".join(letters)
+
+
+def test_tree_reduce_empty() -> None:
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert tree_reduce(operator.add, [], 5, executor=pool) == 5
+        with pytest.raises(TypeError):
+            tree_reduce(operator.add, [], executor=pool)
+        with pytest.raises(ValueError):
+            tree_reduce(operator.add, [1], chunk_size=0, executor=pool)
+
+
+def test_parallel_reduce_requires_associative_flag() -> None:
+    pipeline: Pipeline = Pipeline([1, 2]).pipe_step(reduce, operator.add, parallel=True)
+    with pytest.raises(ValueError):
+        pipeline.aggregate()
+
+
+def test_serial_reduce_accepts_associative_flag() -> None:
+    pipeline: Pipeline = Pipeline([1, 2, 3]).pipe_step(
+        reduce, operator.add, 10, associative=True
+    )
+    assert pipeline.aggregate() == [16]
@@ -0,0 +1,130 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import json
+import time
+import pytest
+from functools import reduce
+from typing import Any, Dict, Generator, Iterable, Iterator, List
+from project.generators.generator import Pipeline, Plan
+
+
+def add_one(x: int) -> int:
+    return x + 1
+
+
+def is_even(x: int) -> bool:
+    return x % 2 == 0
+
+
+def slow_double(x: int) -> int:
+    time.sleep(0.001)
+    return x * 2
+
+
+def sum_reducer(x: int, y: int) -> int:
+    return x + y
+
+
+def counting_source(
+    pulled: List[int], closed: List[bool], n: int
+) -> Generator[int, None, None]:
+    try:
+        for x in range(n):
+            pulled.append(x)
+            yield x
+    finally:
+        closed.append(True)
+
+
+def test_profile_counts_elements_per_step() -> None:
+    plan: Plan = (
+        Plan()
+        .pipe_step(map, add_one)
+        .pipe_step(filter, is_even)
+        .pipe_step(enumerate, start=1)
+    )
+    it, profile = plan.run_profiled(range(10))
+    assert list(it) == list(plan.run(range(10)))
+
+    report: Dict[str, Any] = profile.as_dict()
+    assert report["source_items"] == 10
+    assert [step["name"] for step in report["steps"]] == [
+        "map(add_one)",
+        "filter(is_even)",
+        "enumerate",
+    ]
+    assert [step["items_in"] for step in report["steps"]] == [10, 10, 5]
+    assert [step["items_out"] for step in report["steps"]] == [10, 5, 5]
+    assert [step["selectivity"] for step in report["steps"]] == [None, 0.5, None]
+
+
+def test_profile_attributes_time_to_the_slow_step() -> None:
+    pipeline: Pipeline = (
+        Pipeline(range(20), instrument=True)
+        .pipe_step(map, add_one)
+        .pipe_step(map, slow_double)
+        .pipe_step(filter, is_even)
+    )
+    assert pipeline.profile is None
+    assert pipeline.aggregate(sum) == sum(2 * (x + 1) for x in range(20))
+    assert pipeline.profile is not None
+
+    steps: List[Dict[str, Any]] = pipeline.profile.as_dict()["steps"]
+    assert steps[1]["wall"] >= 0.02
+    assert steps[1]["wall"] > steps[0]["wall"] + steps[2]["wall"]
+    assert all(step["cpu"] >= 0 for step in steps)
+
+
+def test_profile_with_eager_reduce() -> None:
+    it, profile = Plan().pipe_step(reduce, sum_reducer).run_profiled([1, 2, 3])
+    assert list(it) == [6]
+    assert profile.as_dict()["steps"][0]["items_in"] == 3
+    assert profile.as_dict()["steps"][0]["items_out"] == 1
+
+
+def test_profile_json_and_table() -> None:
+    it, profile = Plan().pipe_step(filter, is_even).run_profiled(range(4))
+    list(it)
+
+    assert json.loads(profile.to_json())["steps"][0]["items_out"] == 2
+    table: str = profile.table()
+    assert "filter(is_even)" in table
+    assert "50.0%" in table
+    assert str(profile) == table
+
+
+def test_instrumented_take_stops_steps_but_leaves_source_open() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    step_closed: List[bool] = []
+
+    def tracked(iterable: Iterable[int]) -> Iterator[int]:
+        try:
+            yield from iterable
+        finally:
+            step_closed.append(True)
+
+    source = counting_source(pulled, closed, 1000)
+    it, profile = Plan().pipe_step(tracked).take(3).run_profiled(source)
+    assert list(it) == [0, 1, 2]
+    assert step_closed == [True]
+    assert pulled == [0, 1, 2]
+    assert closed == []
+    assert next(source) == 3
+    assert profile.as_dict()["steps"][1]["items_out"] == 3
+
+
+def test_instrumented_first_leaves_source_open() -> None:
+    pulled: List[int] = []
+    closed: List[bool] = []
+    source = counting_source(pulled, closed, 1000)
+    pipeline: Pipeline = Pipeline(source, instrument=True)
+    assert pipeline.pipe_step(map, add_one).pipe_step(filter, is_even).first() == 2
+    assert pulled == [0, 1]
+    assert closed == []
+    assert next(source) == 2
+    assert pipeline.profile is not None
+    assert pipeline.profile.as_dict()["source_items"] == 2
@@ -0,0 +1,188 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+import pickle
+from typing import List
+from project.generators.generator import Pipeline, data_generator
+from project.generators.sequences import (
+    LazyRange,
+    fibonacci,
+    fibonacci_index,
+    fibonacci_pair,
+    fibonacci_range,
+    shard,
+)
+
+
+def naive_fibonacci(count: int) -> List[int]:
+    numbers = []
+    a, b = 0, 1
+    for _ in range(count):
+        numbers.append(a)
+        a, b = b, a + b
+    return numbers
+
+
+NAIVE = naive_fibonacci(300)
+
+
+def test_fibonacci_pair() -> None:
+    for n in range(299):
+        assert fibonacci_pair(n) == (NAIVE[n], NAIVE[n + 1])
+    with pytest.raises(ValueError):
+        fibonacci_pair(-1)
+
+
+def test_fibonacci_huge_index() -> None:
+    a, b = fibonacci_pair(10**5)
+    c, d = fibonacci_pair(10**5 + 1)
+    assert c == b
+    assert d == a + b
+    assert fibonacci(10**5) % 10 == 5
+
+
+def test_fibonacci_index() -> None:
+    assert fibonacci_index(0) == 0
+    assert fibonacci_index(1) == 1
+    assert fibonacci_index(2) == 3
+    for value in range(1, 2000):
+        n = fibonacci_index(value)
+        assert NAIVE[n] >= value
+        assert NAIVE[n - 1] < value
+    assert fibonacci_index(NAIVE[250]) == 250
+    assert fibonacci_index(NAIVE[250] + 1) == 251
+
+
+@pytest.mark.parametrize("start,stop,step", [(0, 50, 1), (7, 200, 3), (100, 299, 17)])
+def test_fibonacci_range(start: int, stop: int, step: int) -> None:
+    assert list(fibonacci_range(start, stop, step)) == NAIVE[start:stop:step]
+
+
+def test_fibonacci_range_bad_step() -> None:
+    with pytest.raises(ValueError):
+        list(fibonacci_range(0, 10, 0))
+
+
+def test_shard_covers_range() -> None:
+    indices = range(3, 100, 7)
+    parts = [shard(indices, worker, 4) for worker in range(4)]
+    assert [i for part in parts for i in part] == list(indices)
+    assert max(map(len, parts)) - min(map(len, parts)) <= 1
+    with pytest.raises(ValueError):
+        shard(indices, 4, 4)
+
+
+def test_data_generator_fibonacci_jump_ahead() -> None:
+    assert list(data_generator(10, 1000, 1, "fibonacci")) == NAIVE[10:17]
+    assert list(data_generator(0, 10**6, 5, "fibonacci")) == NAIVE[0:31:5]
+    assert list(data_generator(40, 10, 1, "fibonacci")) == []
+
+
+def test_data_generator_fibonacci_workers() -> None:
+    end = NAIVE[200]
+    shards = [
+        list(data_generator(0, end, 1, "fibonacci", worker=(i, 3))) for i in range(3)
+    ]
+    assert shards[0][0] == 0
+    assert sum(shards, []) == NAIVE[:200]
+
+
+def test_lazy_range_integral() -> None:
+    sequence = LazyRange(3, 50, 4)
+    assert list(sequence) == list(range(3, 50, 4))
+    assert len(sequence) == len(range(3, 50, 4))
+    assert sequence[2] == 11
+    assert sequence[-1] == 47
+    assert 11 in sequence
+    assert 12 not in sequence
+    assert list(sequence[2:8:2]) == list(range(3, 50, 4))[2:8:2]
+    assert list(reversed(sequence)) == list(range(47, 2, -4))
+    assert isinstance(sequence[1:3], LazyRange)
+
+
+def test_lazy_range_float_no_accumulation() -> None:
+    sequence = LazyRange(0.0, 1.0, 0.1)
+    assert len(sequence) == 10
+    assert sequence[3] == 3 * 0.1
+    big = LazyRange(0.0, 100_000.0, 0.1)
+    values = list(big)
+    assert len(values) == len(big)
+    assert values[-1] == 0.1 * (len(big) - 1)
+    assert big[-1] == values[-1]
+    assert 0.1 * 7 in big
+    with pytest.raises(IndexError):
+        sequence[10]
+
+
+def test_lazy_range_empty_and_errors() -> None:
+    assert len(LazyRange(5, 1)) == 0
+    assert list(LazyRange(5, 1)) == []
+    assert LazyRange(5, 1) == LazyRange(0, 0)
+    with pytest.raises(ValueError):
+        LazyRange(0, 10, 0)
+    assert list(LazyRange(4)) == [0, 1, 2, 3]
+
+
+def test_lazy_range_big_integers() -> None:
+    assert len(LazyRange(10**18 + 1)) == 10**18 + 1
+    assert LazyRange(10**18 + 1)[-1] == 10**18
+    stepped = LazyRange(0, 2**60 + 3, 3)
+    assert len(stepped) == len(range(0, 2**60 + 3, 3))
+    assert stepped[-1] == 2**60 + 3 - 1
+    assert list(LazyRange(-5, -(2**62) - 10, -(2**61))) == [
+        -5,
+        -5 - 2**61,
+        -5 - 2**62,
+    ]
+    huge = LazyRange(10**25)
+    assert huge.length == 10**25
+    with pytest.raises(OverflowError):
+        len(huge)
+    assert huge.stop == 10**25
+    assert huge[-1] == 10**25 - 1
+    assert 10**25 - 7 in huge
+    assert huge[:: 10**24][-1] == 9 * 10**24
+    halves = huge.split(2)
+    assert halves[1][0] == 5 * 10**24
+    assert halves[1].stop == 10**25
+    assert [half.length for half in halves] == [5 * 10**24] * 2
+    assert LazyRange(0, 2**70).length == 2**70
+    assert LazyRange(0.0, 2.0**70, 0.5).length == 2**71
+
+
+def test_lazy_range_split() -> None:
+    sequence = LazyRange(0, 103, 2)
+    parts = sequence.split(5)
+    assert len(parts) == 5
+    assert [x for part in parts for x in part] == list(sequence)
+    assert max(map(len, parts)) - min(map(len, parts)) <= 1
+    float_parts = LazyRange(0.0, 1.0, 0.25).split(3)
+    assert [list(part) for part in float_parts] == [[0.0], [0.25], [0.5, 0.75]]
+
+
+def test_lazy_range_pickle_and_numpy() -> None:
+    sequence = LazyRange(0.5, 10, 1.5)
+    assert pickle.loads(pickle.dumps(sequence)) == sequence
+    assert hash(LazyRange(0, 10, 2)) == hash(LazyRange(0, 9, 2))
+    assert sequence.to_numpy().tolist() == list(sequence)
+    assert LazyRange(1, 10, 3).to_numpy().tolist() == [1, 4, 7]
+
+
+def test_data_generator_range_is_lazy() -> None:
+    sequence = data_generator(0, 10**15, 3)
+    assert isinstance(sequence, LazyRange)
+    assert len(sequence) == -(-(10**15) // 3)
+    assert sequence[10**12] == 3 * 10**12
+    assert list(data_generator(0, 1, 0.25)) == [0.0, 0.25, 0.5, 0.75]
+    shards = [list(data_generator(0, 10, 1, worker=(i, 3))) for i in range(3)]
+    assert shards == [[0, 1, 2], [3, 4, 5], [6, 7, 8, 9]]
+    assert list(Pipeline(data_generator(0, 10), chunk_size=4)) == list(range(10))
+    assert list(data_generator(0, 10, 1, "unknown")) == []
+    half = data_generator(0, 10**25, worker=(1, 2))
+    assert isinstance(half, LazyRange)
+    assert half[0] == 5 * 10**24
+    with pytest.raises(TypeError):
+        data_generator(0, 10, 0.5, "random")
@@ -0,0 +1,112 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pickle
+import pytest
+from typing import List
+from project.generators.generator import Pipeline
+from project.generators.sketches import (
+    BloomFilter,
+    CountDistinct,
+    HyperLogLog,
+    approx_count_distinct,
+    distinct,
+)
+
+
+def modulo_1000(x: int) -> int:
+    return x % 1000
+
+
+def test_bloom_filter_no_false_negatives() -> None:
+    bloom = BloomFilter(10_000, 0.01)
+    for i in range(10_000):
+        bloom.add(i)
+    assert all(i in bloom for i in range(10_000))
+    false_positives = sum(i in bloom for i in range(10_000, 60_000))
+    assert false_positives / 50_000 < 0.02
+    assert bloom.nbytes == (bloom.bits + 7) // 8
+    assert bloom.nbytes < 13_000
+
+
+def test_bloom_filter_memory_is_fixed() -> None:
+    bloom = BloomFilter(1000, 0.001)
+    size = bloom.nbytes
+    for i in range(100_000):
+        bloom.add(str(i))
+    assert bloom.nbytes == size
+
+
+def test_bloom_filter_merge() -> None:
+    left, right = BloomFilter(1000), BloomFilter(1000)
+    for i in range(500):
+        left.add(i)
+        right.add(-i)
+    left.merge(right)
+    assert all(i in left and -i in left for i in range(500))
+    with pytest.raises(ValueError):
+        left.merge(BloomFilter(10))
+
+
+def test_bloom_filter_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(10, 1.5)
+
+
+@pytest.mark.parametrize("cardinality", [0, 10, 1000, 50_000])
+def test_hyperloglog_accuracy(cardinality: int) -> None:
+    data = [f"user-{i % max(cardinality, 1)}" for i in range(2 * cardinality)]
+    estimate = approx_count_distinct(data)
+    assert abs(estimate - cardinality) <= max(0.03 * cardinality, 1)
+
+
+def test_hyperloglog_merge_matches_single_pass() -> None:
+    parts = [range(0, 30_000), range(20_000, 60_000), range(50_000, 70_000)]
+    sketches: List[HyperLogLog] = []
+    for part in parts:
+        sketch = HyperLogLog(12)
+        for value in part:
+            sketch.add(value)
+        sketches.append(pickle.loads(pickle.dumps(sketch)))
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    assert merged.result() == HyperLogLog.of(range(70_000), 12)
+    assert abs(merged.result() - 70_000) < 0.05 * 70_000
+    assert merged.nbytes == 4096
+    with pytest.raises(ValueError):
+        merged.merge(HyperLogLog(10))
+    with pytest.raises(ValueError):
+        HyperLogLog(3)
+
+
+def test_count_distinct_exact() -> None:
+    assert CountDistinct.of([1, 2, 2, 3, 1]) == 3
+    assert Pipeline(range(5000)).pipe_step(map, modulo_1000).aggregate(
+        approx_count_distinct
+    ) == pytest.approx(1000, rel=0.03)
+
+
+def test_distinct_exact() -> None:
+    data = [3, 1, 3, 2, 1, 5]
+    assert list(distinct(data)) == [3, 1, 2, 5]
+    assert list(distinct(["a", "B", "b"], key=str.lower)) == ["a", "B"]
+
+
+def test_distinct_approx() -> None:
+    data = [i % 1000 for i in range(10_000)]
+    result = list(
+        Pipeline(data).pipe_step(distinct, approx=True, fp_rate=0.001, capacity=1000)
+    )
+    assert len(result) == len(set(result))
+    assert len(result) >= 990
+    assert result == sorted(result)
+
+
+def test_distinct_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        distinct([1], approx=True, fp_rate=0)
@@ -0,0 +1,161 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import io
+import pickle
+import struct
+import pytest
+from typing import Any, List
+from project.generators import sources
+from project.generators.generator import Pipeline
+from project.generators.sources import (
+    LineSource,
+    RecordSource,
+    partition_file,
+)
+
+
+def line_length(line: str) -> int:
+    return len(line)
+
+
+@pytest.fixture
+def text_file(tmp_path: Path) -> Path:
+    path = tmp_path / "lines.txt"
+    lines = [f"line {i} " + "x" * (i % 17) for i in range(2000)]
+    lines[5] = ""
+    lines[6] = "юникод ✓"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def expected_lines(path: Path) -> List[str]:
+    return path.read_text(encoding="utf-8").split("\n")[:-1]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_line_source_matches_split(
+    text_file: Path, read_size: int, use_mmap: bool
+) -> None:
+    source = LineSource(str(text_file), read_size=read_size, use_mmap=use_mmap)
+    assert list(source) == expected_lines(text_file)
+    assert list(source) == expected_lines(text_file)
+
+
+def test_line_source_without_final_newline(tmp_path: Path) -> None:
+    path = tmp_path / "tail.txt"
+    path.write_bytes(b"a\nbb\nccc")
+    assert list(LineSource(str(path), read_size=2)) == ["a", "bb", "ccc"]
+    assert list(LineSource(str(path), encoding=None)) == [b"a", b"bb", b"ccc"]
+
+
+def test_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(LineSource(str(path), use_mmap=True)) == []
+    assert partition_file(str(path), 3) == [(0, 0), (0, 0), (0, 0)]
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 8, 50])
+def test_partition_file_lines(text_file: Path, parts: int) -> None:
+    ranges = partition_file(str(text_file), parts)
+    assert len(ranges) == parts
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == text_file.stat().st_size
+    data = text_file.read_bytes()
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert start == 0 or data[start - 1 : start] == b"\n"
+    collected = [
+        line for part in LineSource(str(text_file)).partition(parts) for line in part
+    ]
+    assert collected == expected_lines(text_file)
+
+
+def test_unaligned_ranges_cover_each_line_once(text_file: Path) -> None:
+    size = text_file.stat().st_size
+    bounds = [0, 1, 333, 334, 5000, size - 1, size]
+    collected: List[str] = []
+    for start, end in zip(bounds, bounds[1:]):
+        collected.extend(Pipeline.from_file(str(text_file), (start, end)))
+    assert collected == expected_lines(text_file)
+
+
+def test_pipeline_file_constructors(text_file: Path) -> None:
+    expected = [len(line) for line in expected_lines(text_file)]
+    assert list(Pipeline.from_file(str(text_file)).pipe_step(map, line_length)) == (
+        expected
+    )
+    pipeline = Pipeline.from_mmap(str(text_file), read_size=100)
+    assert list(pipeline.pipe_step(map, line_length)) == expected
+    assert list(pipeline) == expected
+
+
+@pytest.fixture
+def record_file(tmp_path: Path) -> Path:
+    path = tmp_path / "records.bin"
+    record = struct.Struct("<iq")
+    path.write_bytes(b"".join(record.pack(i, i * i) for i in range(1000)) + b"\x01")
+    return path
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_binary_records(record_file: Path, use_mmap: bool) -> None:
+    pipeline = Pipeline.from_binary_records(
+        str(record_file), "<iq", read_size=100, use_mmap=use_mmap
+    )
+    assert list(pipeline) == [(i, i * i) for i in range(1000)]
+
+
+def test_binary_records_partition(record_file: Path) -> None:
+    source = RecordSource(str(record_file), "<iq", read_size=50)
+    ranges = partition_file(str(record_file), 7, source.record_size)
+    assert all(start % 12 == 0 and end % 12 == 0 for start, end in ranges)
+    assert ranges[-1][1] == 12_000
+    parts = source.partition(7)
+    assert [record for part in parts for record in part] == list(source)
+    restored = pickle.loads(pickle.dumps(parts[3]))
+    assert list(restored) == list(parts[3])
+    unaligned = Pipeline.from_binary_records(str(record_file), "<iq", (13, 40))
+    assert list(unaligned) == [(2, 4), (3, 9)]
+
+
+class ShortReads(io.RawIOBase):
+    """
+    Raw file that returns at most 5 bytes per read, like a pipe
+    """
+
+    def __init__(self, path: str, *args: Any, **kwargs: Any):
+        self.file = io.open(path, "rb", buffering=0)
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.file.seek(offset, whence)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.file.read(min(size, 5))
+
+    def close(self) -> None:
+        self.file.close()
+        super().close()
+
+
+def test_short_reads_do_not_split_records(
+    record_file: Path, text_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sources, "open", ShortReads, raising=False)
+    records = RecordSource(str(record_file), "<iq", read_size=100)
+    assert list(records) == [(i, i * i) for i in range(1000)]
+    assert list(LineSource(str(text_file), read_size=64)) == expected_lines(text_file)
+
+
+def test_bad_arguments(text_file: Path) -> None:
+    with pytest.raises(ValueError):
+        partition_file(str(text_file), 0)
+    with pytest.raises(ValueError):
+        LineSource(str(text_file), read_size=0)
@@ -0,0 +1,100 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import time
+import pytest
+from itertools import islice
+from typing import Generator, Iterable, Iterator, List
+from project.generators.generator import Pipeline, Plan
+
+
+def add_one(x: int) -> int:
+    return x + 1
+
+
+def is_even(x: int) -> bool:
+    return x % 2 == 0
+
+
+def slow_identity(x: int) -> int:
+    time.sleep(0.002)
+    return x
+
+
+def first_three(iterable: Iterable[int]) -> Iterator[int]:
+    return islice(iterable, 3)
+
+
+def broken(x: int) -> int:
+    if x == 5:
+        raise KeyError(x)
+    return x
+
+
+@pytest.mark.parametrize("batch_size, group_size", [(1, 1), (4, 1), (3, 2)])
+def test_staged_matches_sequential(batch_size: int, group_size: int) -> None:
+    plan: Plan = (
+        Plan()
+        .pipe_step(map, add_one)
+        .pipe_step(enumerate)
+        .pipe_step(filter, None)
+        .pipe_step(sorted, reverse=True)
+    )
+    source: range = range(100)
+    with plan.run_staged(source, 2, batch_size, group_size) as run:
+        assert list(run) == list(plan.run(source))
+
+
+def test_staged_bounds_buffering_with_slow_stage() -> None:
+    pulled: int = 0
+
+    def fast_source() -> Generator[int, None, None]:
+        nonlocal pulled
+        for i in range(10_000):
+            pulled += 1
+            yield i
+
+    plan: Plan = Plan().pipe_step(enumerate).pipe_step(map, slow_identity)
+    run = plan.run_staged(fast_source(), capacity=4)
+    assert next(run) == (0, 0)
+    time.sleep(0.1)
+
+    # three full queues, one item held by each of three workers, one consumed
+    assert pulled <= 3 * 4 + 3 + 1
+    assert run.metrics[0].put_stall > 0
+    assert run.metrics[0].max_depth <= 4
+    run.close()
+    assert all(not thread.is_alive() for thread in run._threads)
+
+
+def test_staged_report() -> None:
+    run = Pipeline(range(10)).pipe_step(filter, is_even).run_staged(capacity=8)
+    assert list(run) == [0, 2, 4, 6, 8]
+
+    report = run.report()
+    assert [entry["name"] for entry in report] == ["source", "stage 1"]
+    assert report[0]["items"] == 10
+    assert report[1]["items"] == 5
+    assert all(entry["max_depth"] <= entry["capacity"] for entry in report)
+
+
+def test_staged_propagates_errors() -> None:
+    run = Plan().pipe_step(map, broken).pipe_step(enumerate).run_staged(range(10))
+    with pytest.raises(KeyError):
+        list(run)
+
+
+def test_staged_early_exit_of_a_step_does_not_deadlock() -> None:
+    plan: Plan = Plan().pipe_step(enumerate).pipe_step(first_three)
+    run = plan.run_staged(iter(range(1_000_000)), capacity=2)
+    assert list(run) == [(0, 0), (1, 1), (2, 2)]
+    assert all(not thread.is_alive() for thread in run._threads)
+
+
+def test_staged_rejects_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        Plan().pipe_step(enumerate).run_staged([1], capacity=0)
+    with pytest.raises(ValueError):
+        Plan().pipe_step(enumerate).run_staged([1], group_size=0)
@@ -0,0 +1,163 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import random
+import pytest
+from functools import partial
+from typing import Any, Dict, List, Tuple
+from project.generators.aggregators import Aggregator, Max, Mean, Min, Quantile, Sum
+from project.generators.generator import Pipeline
+from project.generators.windows import CountWindow, SlidingWindow, TumblingWindow
+
+
+class NotRemovable(Sum):
+    supports_remove = False
+
+
+class Last(Aggregator):
+    def __init__(self) -> None:
+        self.value: Any = None
+
+    def add(self, value: Any) -> None:
+        self.value = value
+
+    def merge(self, other: Aggregator) -> None:
+        assert isinstance(other, Last)
+        self.value = other.value
+
+    def result(self) -> Any:
+        return self.value
+
+
+def timestamp(event: Tuple[float, int]) -> float:
+    return event[0]
+
+
+def payload(event: Tuple[float, int]) -> int:
+    return event[1]
+
+
+@pytest.fixture
+def events() -> List[Tuple[float, int]]:
+    rng = random.Random(11)
+    t = 0.0
+    result = []
+    for _ in range(300):
+        t += rng.choice([0.0, 0.3, 1.7, 4.0])
+        result.append((t, rng.randint(0, 100)))
+    return result
+
+
+def test_count_window_tumbling() -> None:
+    result: List[int] = Pipeline(range(10)).pipe_step(CountWindow(4, Sum)).aggregate()
+    assert result == [6, 22, 17]
+
+
+@pytest.mark.parametrize("size, slide", [(1, 1), (5, 1), (5, 2), (7, 7)])
+def test_count_window_sliding(size: int, slide: int) -> None:
+    data: List[int] = [random.Random(size).randint(0, 99) for _ in range(60)]
+    result: List[Any] = (
+        Pipeline(data).pipe_step(CountWindow(size, Max, slide=slide)).aggregate()
+    )
+    expected = [max(data[i : i + size]) for i in range(0, len(data) - size + 1, slide)]
+    assert result == expected
+
+
+def test_count_window_sliding_buffers_only_the_window() -> None:
+    window = CountWindow(10, Min, slide=3)
+    state = window.open()
+    for value in range(1000):
+        window.push(state, value)
+    assert len(state.items) == 10
+    assert isinstance(state.aggregator, Min)
+    assert len(state.aggregator.candidates) <= 10
+
+
+def test_tumbling_window(events: List[Tuple[float, int]]) -> None:
+    result: List[Tuple[float, Any]] = (
+        Pipeline(events)
+        .pipe_step(TumblingWindow(5, Sum, key=timestamp, value=payload))
+        .aggregate()
+    )
+    expected: Dict[float, int] = {}
+    for t, value in events:
+        start = (t // 5) * 5
+        expected[start] = expected.get(start, 0) + value
+    assert result == sorted(expected.items())
+
+
+@pytest.mark.parametrize("size, slide", [(5, 5), (6, 2), (10, 3.5)])
+def test_sliding_window(
+    events: List[Tuple[float, int]], size: float, slide: float
+) -> None:
+    result: List[Tuple[float, Any]] = (
+        Pipeline(events)
+        .pipe_step(SlidingWindow(size, slide, Mean, key=timestamp, value=payload))
+        .aggregate()
+    )
+    starts = sorted({w for w, _ in result})
+    assert [w for w, _ in result] == starts
+
+    expected = []
+    first = ((events[0][0] - size) // slide + 1) * slide
+    start = first
+    while start <= events[-1][0]:
+        inside = [v for t, v in events if start <= t < start + size]
+        if inside:
+            expected.append((start, sum(inside) / len(inside)))
+        start += slide
+    assert [w for w, _ in result] == pytest.approx([w for w, _ in expected])
+    assert [m for _, m in result] == pytest.approx([m for _, m in expected])
+
+
+def test_sliding_window_with_quantile(events: List[Tuple[float, int]]) -> None:
+    result: List[Tuple[float, Any]] = (
+        Pipeline(events)
+        .pipe_step(
+            SlidingWindow(20, 5, partial(Quantile, 1.0), key=timestamp, value=payload)
+        )
+        .aggregate()
+    )
+    for start, value in result:
+        inside = [v for t, v in events if start <= t < start + 20]
+        assert value == pytest.approx(max(inside), rel=0.011)
+
+
+def test_windows_reject_out_of_order_timestamps() -> None:
+    events = [(1.0, 1), (7.0, 2), (2.0, 3)]
+    with pytest.raises(ValueError):
+        Pipeline(events).pipe_step(
+            TumblingWindow(5, Sum, timestamp, payload)
+        ).aggregate()
+    with pytest.raises(ValueError):
+        Pipeline(events).pipe_step(
+            SlidingWindow(5, 1, Sum, timestamp, payload)
+        ).aggregate()
+
+
+def test_windows_validate_arguments() -> None:
+    with pytest.raises(ValueError):
+        CountWindow(0, Sum)
+    with pytest.raises(ValueError):
+        CountWindow(3, Sum, slide=4)
+    with pytest.raises(ValueError):
+        CountWindow(3, NotRemovable, slide=1)
+    with pytest.raises(ValueError):
+        SlidingWindow(3, 1, NotRemovable, key=timestamp)
+    with pytest.raises(ValueError):
+        TumblingWindow(0, Sum, key=timestamp)
+
+
+def test_aggregators_without_remove_are_not_slidable() -> None:
+    assert not Last.supports_remove
+    with pytest.raises(ValueError):
+        CountWindow(3, Last, slide=1)
+    assert list(CountWindow(2, Last)([1, 2, 3, 4])) == [2, 4]
+
+
+def test_window_operator_is_reusable() -> None:
+    window = CountWindow(2, Sum)
+    assert list(window([1, 2, 3])) == [3, 3]
+    assert list(window([10, 20])) == [30]